@@ -3,19 +3,60 @@ Analytics API routes for dashboard data and reporting.
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Iterator
+import csv
+import io
 import json
 
 from ..database import get_db
 from ..models.user import User
-from ..services.analytics_service import AnalyticsService
+from ..repositories.project_repository import ProjectRepository
+from ..repositories.task_repository import TaskRepository
+from ..services.analytics_service import analytics_service
 from ..api.deps import get_current_active_user
+from ..config import settings
+from ..utils.cache import cached, ANALYTICS_NAMESPACE
 
 router = APIRouter()
 
 
+def _stream_user_productivity_csv(db: Session) -> Iterator[str]:
+    """
+    Yield the user productivity report as CSV, one row at a time.
+    
+    Args:
+        db: Database session
+        
+    Yields:
+        str: CSV-encoded row
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    
+    def flush() -> str:
+        data = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+        return data
+    
+    writer.writerow(["User ID", "User Name", "Total Tasks", "Completed Tasks", "Completion Rate"])
+    yield flush()
+    
+    for user in analytics_service.iter_user_productivity(db):
+        writer.writerow([
+            user["user_id"],
+            user["user_name"],
+            user["total_tasks"],
+            user["completed_tasks"],
+            f"{user['completion_rate']:.1f}%"
+        ])
+        yield flush()
+
+
 @router.get("/dashboard/overview")
+@cached(ANALYTICS_NAMESPACE, expire=settings.analytics_cache_ttl)
 async def get_dashboard_overview(
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -30,12 +71,12 @@ async def get_dashboard_overview(
     Returns:
         Dict containing dashboard overview data
     """
-    analytics_service = AnalyticsService(db)
-    return analytics_service.get_dashboard_overview(current_user.id)
+    return await analytics_service.get_dashboard_overview(current_user.id)
 
 
 @router.get("/projects/{project_id}/analytics")
-async def get_project_analytics(
+@cached(ANALYTICS_NAMESPACE, expire=settings.chart_data_cache_ttl, per_user=False)
+def get_project_analytics(
     project_id: int,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -51,8 +92,7 @@ async def get_project_analytics(
     Returns:
         Dict containing project analytics
     """
-    analytics_service = AnalyticsService(db)
-    analytics = analytics_service.get_project_analytics(project_id)
+    analytics = analytics_service.get_project_analytics(db, project_id)
     
     if not analytics:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
@@ -61,7 +101,7 @@ async def get_project_analytics(
 
 
 @router.get("/users/{user_id}/performance")
-async def get_user_performance_analytics(
+def get_user_performance_analytics(
     user_id: int,
     date_range: Optional[str] = Query(None, description="Date range filter (e.g., '30d', '7d')"),
     current_user: User = Depends(get_current_active_user),
@@ -79,12 +119,11 @@ async def get_user_performance_analytics(
     Returns:
         Dict containing user performance analytics
     """
-    analytics_service = AnalyticsService(db)
-    return analytics_service.get_user_performance_analytics(user_id, date_range)
+    return analytics_service.get_user_performance_analytics(db, user_id, date_range)
 
 
 @router.get("/users/me/performance")
-async def get_my_performance_analytics(
+def get_my_performance_analytics(
     date_range: Optional[str] = Query(None, description="Date range filter (e.g., '30d', '7d')"),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -100,12 +139,11 @@ async def get_my_performance_analytics(
     Returns:
         Dict containing current user's performance analytics
     """
-    analytics_service = AnalyticsService(db)
-    return analytics_service.get_user_performance_analytics(current_user.id, date_range)
+    return analytics_service.get_user_performance_analytics(db, current_user.id, date_range)
 
 
 @router.post("/teams/analytics")
-async def get_team_analytics(
+def get_team_analytics(
     team_members: list[int],
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -121,12 +159,12 @@ async def get_team_analytics(
     Returns:
         Dict containing team analytics
     """
-    analytics_service = AnalyticsService(db)
-    return analytics_service.get_team_analytics(team_members)
+    return analytics_service.get_team_analytics(db, team_members)
 
 
 @router.get("/reports/{report_type}")
-async def generate_report(
+@cached(ANALYTICS_NAMESPACE, expire=settings.analytics_cache_ttl)
+def generate_report(
     report_type: str,
     filters: Optional[Dict[str, Any]] = None,
     current_user: User = Depends(get_current_active_user),
@@ -144,8 +182,7 @@ async def generate_report(
     Returns:
         Dict containing report data
     """
-    analytics_service = AnalyticsService(db)
-    report = analytics_service.generate_report(report_type, filters)
+    report = analytics_service.generate_report(db, report_type, filters)
     
     if "error" in report:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=report["error"])
@@ -154,7 +191,8 @@ async def generate_report(
 
 
 @router.get("/charts/task-status-distribution")
-async def get_task_status_distribution(
+@cached(ANALYTICS_NAMESPACE, expire=settings.analytics_cache_ttl)
+def get_task_status_distribution(
     project_id: Optional[int] = Query(None, description="Filter by project ID"),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -170,35 +208,21 @@ async def get_task_status_distribution(
     Returns:
         Dict containing task status distribution data
     """
-    analytics_service = AnalyticsService(db)
+    if project_id and not ProjectRepository(db).exists(project_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
     
-    if project_id:
-        analytics = analytics_service.get_project_analytics(project_id)
-        if not analytics:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
-        return {
-            "labels": list(analytics["task_statistics"]["status_distribution"].keys()),
-            "data": list(analytics["task_statistics"]["status_distribution"].values())
-        }
-    else:
-        # Get overall task status distribution
-        from ..repositories.task_repository import TaskRepository
-        task_repo = TaskRepository(db)
-        all_tasks = task_repo.get_all()
-        
-        status_distribution = {}
-        for task in all_tasks:
-            status = task.status
-            status_distribution[status] = status_distribution.get(status, 0) + 1
-        
-        return {
-            "labels": list(status_distribution.keys()),
-            "data": list(status_distribution.values())
-        }
+    task_repo = TaskRepository(db)
+    counts = task_repo.count_by_status(project_id)
+    
+    return {
+        "labels": [label.value for label, _ in counts],
+        "data": [count for _, count in counts]
+    }
 
 
 @router.get("/charts/task-priority-distribution")
-async def get_task_priority_distribution(
+@cached(ANALYTICS_NAMESPACE, expire=settings.analytics_cache_ttl)
+def get_task_priority_distribution(
     project_id: Optional[int] = Query(None, description="Filter by project ID"),
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -214,35 +238,21 @@ async def get_task_priority_distribution(
     Returns:
         Dict containing task priority distribution data
     """
-    analytics_service = AnalyticsService(db)
+    if project_id and not ProjectRepository(db).exists(project_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
     
-    if project_id:
-        analytics = analytics_service.get_project_analytics(project_id)
-        if not analytics:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
-        return {
-            "labels": list(analytics["task_statistics"]["priority_distribution"].keys()),
-            "data": list(analytics["task_statistics"]["priority_distribution"].values())
-        }
-    else:
-        # Get overall task priority distribution
-        from ..repositories.task_repository import TaskRepository
-        task_repo = TaskRepository(db)
-        all_tasks = task_repo.get_all()
-        
-        priority_distribution = {}
-        for task in all_tasks:
-            priority = task.priority
-            priority_distribution[priority] = priority_distribution.get(priority, 0) + 1
-        
-        return {
-            "labels": list(priority_distribution.keys()),
-            "data": list(priority_distribution.values())
-        }
+    task_repo = TaskRepository(db)
+    counts = task_repo.count_by_priority(project_id)
+    
+    return {
+        "labels": [label.value for label, _ in counts],
+        "data": [count for _, count in counts]
+    }
 
 
 @router.get("/charts/productivity-trends")
-async def get_productivity_trends(
+@cached(ANALYTICS_NAMESPACE, expire=settings.analytics_cache_ttl)
+def get_productivity_trends(
     user_id: Optional[int] = Query(None, description="User ID (defaults to current user)"),
     date_range: Optional[str] = Query("30d", description="Date range filter"),
     current_user: User = Depends(get_current_active_user),
@@ -263,8 +273,7 @@ async def get_productivity_trends(
     if user_id is None:
         user_id = current_user.id
     
-    analytics_service = AnalyticsService(db)
-    analytics = analytics_service.get_user_performance_analytics(user_id, date_range)
+    analytics = analytics_service.get_user_performance_analytics(db, user_id, date_range)
     
     return {
         "labels": [trend["date"] for trend in analytics["productivity_trends"]],
@@ -273,7 +282,8 @@ async def get_productivity_trends(
 
 
 @router.get("/charts/project-progress")
-async def get_project_progress(
+@cached(ANALYTICS_NAMESPACE, expire=settings.analytics_cache_ttl)
+def get_project_progress(
     project_id: int,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -289,22 +299,16 @@ async def get_project_progress(
     Returns:
         Dict containing project progress data
     """
-    analytics_service = AnalyticsService(db)
-    analytics = analytics_service.get_project_analytics(project_id)
+    progress = ProjectRepository(db).get_progress(project_id)
     
-    if not analytics:
+    if progress is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
     
-    return {
-        "project_name": analytics["project_info"]["name"],
-        "progress_percentage": analytics["project_info"]["progress_percentage"],
-        "total_tasks": analytics["task_statistics"]["total"],
-        "completed_tasks": analytics["task_statistics"]["completed"],
-        "active_tasks": analytics["task_statistics"]["active"]
-    }
+    return progress
 
 
 @router.get("/metrics/kpi")
+@cached(ANALYTICS_NAMESPACE, expire=settings.analytics_cache_ttl)
 async def get_kpi_metrics(
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -319,8 +323,7 @@ async def get_kpi_metrics(
     Returns:
         Dict containing KPI metrics
     """
-    analytics_service = AnalyticsService(db)
-    dashboard_data = analytics_service.get_dashboard_overview(current_user.id)
+    dashboard_data = await analytics_service.get_dashboard_overview(current_user.id)
     
     return {
         "project_completion_rate": dashboard_data["projects"]["completion_rate"],
@@ -332,7 +335,7 @@ async def get_kpi_metrics(
 
 
 @router.get("/export/{report_type}")
-async def export_report(
+def export_report(
     report_type: str,
     format: str = Query("json", description="Export format (json, csv, pdf)"),
     filters: Optional[Dict[str, Any]] = None,
@@ -352,36 +355,25 @@ async def export_report(
     Returns:
         Report data in requested format
     """
-    analytics_service = AnalyticsService(db)
-    report = analytics_service.generate_report(report_type, filters)
+    if format == "csv":
+        if report_type != "user_productivity":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="CSV export is not supported for this report type"
+            )
+        return StreamingResponse(
+            _stream_user_productivity_csv(db),
+            media_type="text/csv",
+            headers={"Content-Disposition": f'attachment; filename="{report_type}.csv"'}
+        )
+    
+    report = analytics_service.generate_report(db, report_type, filters)
     
     if "error" in report:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=report["error"])
     
     if format == "json":
         return report
-    elif format == "csv":
-        # Convert to CSV format
-        import csv
-        import io
-        
-        output = io.StringIO()
-        writer = csv.writer(output)
-        
-        # Write header
-        if report_type == "user_productivity":
-            writer.writerow(["User ID", "User Name", "Total Tasks", "Completed Tasks", "Completion Rate"])
-            for user in report["user_performance"]:
-                writer.writerow([
-                    user["user_id"],
-                    user["user_name"],
-                    user["total_tasks"],
-                    user["completed_tasks"],
-                    f"{user['completion_rate']:.1f}%"
-                ])
-        
-        output.seek(0)
-        return {"csv_data": output.getvalue()}
     elif format == "pdf":
         # For PDF export, you would typically use a library like reportlab
         # For now, return the JSON data with a note
@@ -390,4 +382,4 @@ async def export_report(
             "data": report
         }
     else:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unsupported format") 
\ No newline at end of file
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Unsupported format")
\ No newline at end of file
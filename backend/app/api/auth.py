@@ -3,24 +3,30 @@ Authentication API routes.
 """
 
 from datetime import timedelta
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.security import HTTPBearer
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 
 from ..database import get_db
 from ..models.user import User
 from ..schemas.user import UserCreate, UserLogin, UserToken, UserResponse
 from ..repositories.user_repository import UserRepository
-from ..utils.security import verify_password, get_password_hash, create_access_token
-from ..utils.validators import validate_email, validate_password, validate_username
-from .deps import get_current_user
+from ..utils.security import (
+    verify_password,
+    create_access_token,
+    failed_login_cache,
+    login_attempt_key
+)
+from .deps import get_current_user, invalidate_user_cache, invalidate_token_cache
 
 router = APIRouter()
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 
 @router.post("/signup", response_model=UserToken, status_code=status.HTTP_201_CREATED)
-async def signup(
+def signup(
     user_data: UserCreate,
     db: Session = Depends(get_db)
 ):
@@ -35,42 +41,22 @@ async def signup(
         UserToken: User token with access token and user info
         
     Raises:
-        HTTPException: If validation fails or user already exists
+        HTTPException: If the email or username is already registered
     """
-    # Validate input data
-    email_valid, email_error = validate_email(user_data.email)
-    if not email_valid:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=email_error
-        )
-    
-    password_valid, password_error = validate_password(user_data.password)
-    if not password_valid:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=password_error
-        )
-    
-    username_valid, username_error = validate_username(user_data.username)
-    if not username_valid:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=username_error
-        )
-    
     # Check if user already exists
     user_repo = UserRepository(db)
     
-    existing_user = user_repo.get_by_email(user_data.email)
-    if existing_user:
+    email_taken, username_taken = user_repo.email_or_username_taken(
+        user_data.email,
+        user_data.username
+    )
+    if email_taken:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
-    existing_username = user_repo.get_by_username(user_data.username)
-    if existing_username:
+    if username_taken:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already taken"
@@ -90,12 +76,12 @@ async def signup(
         access_token=access_token,
         token_type="bearer",
         expires_in=30 * 60,  # 30 minutes in seconds
-        user=UserResponse.from_orm(user)
+        user=UserResponse.model_validate(user)
     )
 
 
 @router.post("/login", response_model=UserToken)
-async def login(
+def login(
     user_credentials: UserLogin,
     db: Session = Depends(get_db)
 ):
@@ -123,8 +109,12 @@ async def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Verify password
-    if not verify_password(user_credentials.password, user.password_hash):
+    # Verify password, skipping recently failed attempts
+    attempt_key = login_attempt_key(user_credentials.email, user_credentials.password)
+    if failed_login_cache.get(attempt_key) or not verify_password(
+        user_credentials.password, user.password_hash
+    ):
+        failed_login_cache.set(attempt_key, True)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -149,12 +139,12 @@ async def login(
         access_token=access_token,
         token_type="bearer",
         expires_in=30 * 60,  # 30 minutes in seconds
-        user=UserResponse.from_orm(user)
+        user=UserResponse.model_validate(user)
     )
 
 
 @router.post("/refresh", response_model=UserToken)
-async def refresh_token(
+def refresh_token(
     current_token: str = Depends(security),
     db: Session = Depends(get_db)
 ):
@@ -173,8 +163,6 @@ async def refresh_token(
     """
     # This would typically validate the refresh token
     # For now, we'll just create a new token if the current one is valid
-    from ..api.deps import get_current_user
-    
     try:
         current_user = get_current_user(current_token, db)
     except HTTPException:
@@ -195,25 +183,32 @@ async def refresh_token(
         access_token=access_token,
         token_type="bearer",
         expires_in=30 * 60,  # 30 minutes in seconds
-        user=UserResponse.from_orm(current_user)
+        user=UserResponse.model_validate(current_user)
     )
 
 
 @router.post("/logout")
-async def logout():
+def logout(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(optional_security)
+):
     """
     Logout user (client should discard token).
     
+    Args:
+        credentials: Optional HTTP Bearer token
+        
     Returns:
         dict: Success message
     """
     # In a real application, you might want to blacklist the token
-    # For now, we'll just return a success message
+    # For now, we only drop any cached auth state for it
+    if credentials:
+        invalidate_token_cache(credentials.credentials)
     return {"message": "Successfully logged out"}
 
 
 @router.get("/me", response_model=UserResponse)
-async def get_current_user_info(
+def get_current_user_info(
     current_user: User = Depends(get_current_user)
 ):
     """
@@ -225,11 +220,11 @@ async def get_current_user_info(
     Returns:
         UserResponse: Current user information
     """
-    return UserResponse.from_orm(current_user)
+    return UserResponse.model_validate(current_user)
 
 
 @router.post("/reset-password")
-async def reset_user_password(
+def reset_user_password(
     email: str,
     new_password: str,
     db: Session = Depends(get_db)
@@ -254,11 +249,11 @@ async def reset_user_password(
             detail="User not found"
         )
     
-    # Hash the new password
-    hashed_password = get_password_hash(new_password)
-    
-    # Update the user's password
-    success = user_repo.update_user_password(user.id, hashed_password)
+    # Update the user's password; the repository hashes it
+    success = user_repo.update_user_password(user, new_password)
+    invalidate_user_cache(user.id)
+    # A failed attempt with the new password must not outlive the reset
+    failed_login_cache.delete(login_attempt_key(email, new_password))
     
     if success:
         return {"message": f"Password updated successfully for user {email}"}
@@ -3,19 +3,74 @@ Dependency injection utilities for FastAPI.
 """
 
 from typing import Generator, Optional
-from fastapi import Depends, HTTPException, status
+import time
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
 from jose import JWTError, jwt
 
 from ..database import get_db
 from ..config import settings
 from ..models.user import User
 from ..repositories.user_repository import UserRepository
+from ..utils.cache import TTLCache
 
 # Security scheme
 security = HTTPBearer()
 
+# Short-lived caches for decoded tokens and authenticated user rows
+_token_cache = TTLCache(ttl=settings.auth_cache_ttl)
+_user_cache = TTLCache(ttl=settings.auth_cache_ttl)
+
+
+def _decode_token(token: str) -> dict:
+    """Decode a JWT, reusing the payload of recently verified tokens."""
+    payload = _token_cache.get(token)
+    if payload is not None and payload.get("exp", 0) > time.time():
+        return payload
+    
+    payload = jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+    _token_cache.set(token, payload)
+    return payload
+
+
+def _load_user(db: Session, user_id: int) -> Optional[User]:
+    """Load a user, attaching a cached snapshot to the session when available."""
+    values = _user_cache.get(user_id)
+    if values is not None:
+        user = User(**values)
+        make_transient_to_detached(user)
+        return db.merge(user, load=False)
+    
+    user = UserRepository(db).get(user_id)
+    if user is not None:
+        _user_cache.set(
+            user_id,
+            {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+        )
+    return user
+
+
+def invalidate_user_cache(user_id: int) -> None:
+    """
+    Drop a cached user so the next request reloads it from the database.
+    
+    Args:
+        user_id: User ID
+    """
+    _user_cache.delete(user_id)
+
+
+def invalidate_token_cache(token: str) -> None:
+    """
+    Drop a cached token payload.
+    
+    Args:
+        token: JWT access token
+    """
+    _token_cache.delete(token)
+
 
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
@@ -42,20 +97,13 @@ def get_current_user(
     
     try:
         # Decode JWT token
-        payload = jwt.decode(
-            credentials.credentials,
-            settings.secret_key,
-            algorithms=[settings.algorithm]
-        )
-        user_id: int = payload.get("sub")
-        if user_id is None:
-            raise credentials_exception
-    except JWTError:
+        payload = _decode_token(credentials.credentials)
+        user_id = int(payload["sub"])
+    except (JWTError, KeyError, TypeError, ValueError):
         raise credentials_exception
     
-    # Get user from database
-    user_repo = UserRepository(db)
-    user = user_repo.get(user_id)
+    # Get user from cache or database
+    user = _load_user(db, user_id)
     if user is None:
         raise credentials_exception
     
@@ -63,12 +111,16 @@ def get_current_user(
 
 
 def get_current_active_user(
+    request: Request,
     current_user: User = Depends(get_current_user)
 ) -> User:
     """
     Get current active user.
     
+    The user is also stored on request.state.user for the rest of the request.
+    
     Args:
+        request: Incoming request
         current_user: Current authenticated user
         
     Returns:
@@ -82,6 +134,7 @@ def get_current_active_user(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Inactive user"
         )
+    request.state.user = current_user
     return current_user
 
 
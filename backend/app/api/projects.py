@@ -4,7 +4,8 @@ Projects API routes.
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from pydantic import TypeAdapter
 
 from ..database import get_db
 from ..models.user import User
@@ -12,14 +13,20 @@ from ..models.project import Project
 from ..schemas.project import ProjectCreate, ProjectUpdate, ProjectResponse, ProjectList
 from ..repositories.project_repository import ProjectRepository
 from ..api.deps import get_current_active_user
+from ..utils.cache import invalidate_cache, ANALYTICS_NAMESPACE
+from ..utils.responses import model_json_response
 
 router = APIRouter()
 
+# Validates a whole page of ORM rows in one pydantic-core call
+_project_list_adapter = TypeAdapter(List[ProjectResponse])
+
 
 @router.get("/", response_model=ProjectList)
-async def get_projects(
+def get_projects(
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
@@ -29,31 +36,43 @@ async def get_projects(
     Args:
         skip: Number of records to skip
         limit: Maximum number of records to return
+        cursor: Keyset cursor from a previous page's next_cursor
         current_user: Current authenticated user
         db: Database session
         
     Returns:
         ProjectList: Paginated list of projects
+        
+    Raises:
+        HTTPException: If the cursor is invalid
     """
     project_repo = ProjectRepository(db)
-    projects = project_repo.get_user_projects(
-        user_id=current_user.id,
-        skip=skip,
-        limit=limit
-    )
-    total = project_repo.count_user_projects(current_user.id)
+    try:
+        projects, total = project_repo.get_user_project_rows_with_total(
+            user_id=current_user.id,
+            skip=skip,
+            limit=limit,
+            cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     
-    return ProjectList(
-        items=[ProjectResponse.from_orm(project) for project in projects],
+    result = ProjectList(
+        items=_project_list_adapter.validate_python(projects),
         total=total,
         page=skip // limit + 1,
         size=limit,
-        pages=(total + limit - 1) // limit
+        pages=(total + limit - 1) // limit,
+        next_cursor=project_repo.next_cursor(projects, limit)
     )
+    return model_json_response(result)
 
 
 @router.post("/", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
-async def create_project(
+def create_project(
     project_data: ProjectCreate,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -76,11 +95,36 @@ async def create_project(
     
     # Create project with current user as owner
     project = project_repo.create_project(project_data, current_user.id)
-    return ProjectResponse.from_orm(project)
+    invalidate_cache(ANALYTICS_NAMESPACE)
+    return ProjectResponse.model_validate(project)
+
+
+@router.post("/bulk", response_model=List[int], status_code=status.HTTP_201_CREATED)
+def bulk_create_projects(
+    projects_data: List[ProjectCreate],
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Create several projects in one request.
+    
+    Args:
+        projects_data: Project creation data for each project
+        current_user: Current authenticated user
+        db: Database session
+        
+    Returns:
+        List[int]: IDs of the created projects, in request order
+    """
+    project_repo = ProjectRepository(db)
+    
+    project_ids = project_repo.bulk_create(projects_data, current_user.id)
+    invalidate_cache(ANALYTICS_NAMESPACE)
+    return project_ids
 
 
 @router.get("/{project_id}", response_model=ProjectResponse)
-async def get_project(
+def get_project(
     project_id: int,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -97,10 +141,10 @@ async def get_project(
         ProjectResponse: Project information
         
     Raises:
-        HTTPException: If project not found or access denied
+        HTTPException: If project not found or not owned by the user
     """
     project_repo = ProjectRepository(db)
-    project = project_repo.get(project_id)
+    project = project_repo.get_for_owner(project_id, current_user.id)
     
     if not project:
         raise HTTPException(
@@ -108,18 +152,11 @@ async def get_project(
             detail="Project not found"
         )
     
-    # Check if user has access to this project
-    if project.owner_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions"
-        )
-    
-    return ProjectResponse.from_orm(project)
+    return ProjectResponse.model_validate(project)
 
 
 @router.put("/{project_id}", response_model=ProjectResponse)
-async def update_project(
+def update_project(
     project_id: int,
     project_update: ProjectUpdate,
     current_user: User = Depends(get_current_active_user),
@@ -138,10 +175,10 @@ async def update_project(
         ProjectResponse: Updated project information
         
     Raises:
-        HTTPException: If project not found, access denied, or validation fails
+        HTTPException: If project not found, not owned by the user, or validation fails
     """
     project_repo = ProjectRepository(db)
-    project = project_repo.get(project_id)
+    project = project_repo.get_for_owner(project_id, current_user.id)
     
     if not project:
         raise HTTPException(
@@ -149,20 +186,14 @@ async def update_project(
             detail="Project not found"
         )
     
-    # Check if user has access to this project
-    if project.owner_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions"
-        )
-    
     # Update project
     updated_project = project_repo.update_project(project, project_update)
-    return ProjectResponse.from_orm(updated_project)
+    invalidate_cache(ANALYTICS_NAMESPACE)
+    return ProjectResponse.model_validate(updated_project)
 
 
 @router.delete("/{project_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_project(
+def delete_project(
     project_id: int,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -176,10 +207,10 @@ async def delete_project(
         db: Database session
         
     Raises:
-        HTTPException: If project not found or access denied
+        HTTPException: If project not found or not owned by the user
     """
     project_repo = ProjectRepository(db)
-    project = project_repo.get(project_id)
+    project = project_repo.get_for_owner(project_id, current_user.id)
     
     if not project:
         raise HTTPException(
@@ -187,12 +218,6 @@ async def delete_project(
             detail="Project not found"
         )
     
-    # Check if user has access to this project
-    if project.owner_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions"
-        )
-    
     # Delete project
-    project_repo.delete(project_id) 
\ No newline at end of file
+    project_repo.delete(project_id)
+    invalidate_cache(ANALYTICS_NAMESPACE) 
\ No newline at end of file
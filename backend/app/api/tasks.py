@@ -4,23 +4,32 @@ Tasks API routes.
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from pydantic import TypeAdapter
 
 from ..database import get_db
 from ..models.user import User
 from ..models.task import Task
 from ..schemas.task import TaskCreate, TaskUpdate, TaskResponse, TaskList
 from ..repositories.task_repository import TaskRepository
+from ..repositories.project_repository import ProjectRepository
+from ..repositories.user_repository import UserRepository
 from ..api.deps import get_current_active_user
+from ..utils.cache import invalidate_cache, ANALYTICS_NAMESPACE
+from ..utils.responses import model_json_response
 
 
 router = APIRouter()
 
+# Validates a whole page of ORM rows in one pydantic-core call
+_task_list_adapter = TypeAdapter(List[TaskResponse])
+
 
 @router.get("/", response_model=TaskList)
-async def get_tasks(
+def get_tasks(
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
@@ -30,33 +39,46 @@ async def get_tasks(
     Args:
         skip: Number of records to skip
         limit: Maximum number of records to return
+        cursor: Keyset cursor from a previous page's next_cursor
         current_user: Current authenticated user
         db: Database session
         
     Returns:
         TaskList: Paginated list of tasks
+        
+    Raises:
+        HTTPException: If the cursor is invalid
     """
     task_repo = TaskRepository(db)
-    tasks = task_repo.get_user_tasks(
-        user_id=current_user.id,
-        skip=skip,
-        limit=limit
-    )
-    total = task_repo.count_user_tasks(current_user.id)
+    try:
+        tasks, total = task_repo.get_user_tasks_with_total(
+            user_id=current_user.id,
+            skip=skip,
+            limit=limit,
+            cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     
-    return TaskList(
-        items=[TaskResponse.from_orm(task) for task in tasks],
+    result = TaskList(
+        items=_task_list_adapter.validate_python(tasks),
         total=total,
         page=skip // limit + 1,
         size=limit,
-        pages=(total + limit - 1) // limit
+        pages=(total + limit - 1) // limit,
+        next_cursor=task_repo.next_cursor(tasks, limit)
     )
+    return model_json_response(result)
 
 
 @router.get("/my-tasks", response_model=TaskList)
-async def get_my_tasks(
+def get_my_tasks(
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
@@ -66,31 +88,43 @@ async def get_my_tasks(
     Args:
         skip: Number of records to skip
         limit: Maximum number of records to return
+        cursor: Keyset cursor from a previous page's next_cursor
         current_user: Current authenticated user
         db: Database session
         
     Returns:
         TaskList: Paginated list of assigned tasks
+        
+    Raises:
+        HTTPException: If the cursor is invalid
     """
     task_repo = TaskRepository(db)
-    tasks = task_repo.get_assigned_tasks(
-        assignee_id=current_user.id,
-        skip=skip,
-        limit=limit
-    )
-    total = task_repo.count_assigned_tasks(current_user.id)
+    try:
+        tasks, total = task_repo.get_assigned_tasks_with_total(
+            assignee_id=current_user.id,
+            skip=skip,
+            limit=limit,
+            cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     
-    return TaskList(
-        items=[TaskResponse.from_orm(task) for task in tasks],
+    result = TaskList(
+        items=_task_list_adapter.validate_python(tasks),
         total=total,
         page=skip // limit + 1,
         size=limit,
-        pages=(total + limit - 1) // limit
+        pages=(total + limit - 1) // limit,
+        next_cursor=task_repo.next_cursor(tasks, limit)
     )
+    return model_json_response(result)
 
 
 @router.post("/", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
-async def create_task(
+def create_task(
     task_data: TaskCreate,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -109,31 +143,22 @@ async def create_task(
     Raises:
         HTTPException: If validation fails or project not found
     """
-    from ..repositories.project_repository import ProjectRepository
-    
     task_repo = TaskRepository(db)
     project_repo = ProjectRepository(db)
     
-    # Validate that the project exists and user has access to it
-    project = project_repo.get(task_data.project_id)
+    # Validate that the project exists and belongs to the user
+    project = project_repo.get_for_owner(task_data.project_id, current_user.id)
     if not project:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found"
         )
     
-    if project.owner_id != current_user.id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Not enough permissions to create tasks in this project"
-        )
-    
     # Validate assignee_id if provided
-    if task_data.assignee_id is not None:
-        from ..repositories.user_repository import UserRepository
+    # Self-assignment needs no lookup; the current user is already loaded
+    if task_data.assignee_id is not None and task_data.assignee_id != current_user.id:
         user_repo = UserRepository(db)
-        assignee = user_repo.get(task_data.assignee_id)
-        if not assignee:
+        if not user_repo.exists(task_data.assignee_id):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Assignee not found"
@@ -141,11 +166,59 @@ async def create_task(
     
     # Create the task
     task = task_repo.create_task(task_data, current_user.id)
-    return TaskResponse.from_orm(task)
+    invalidate_cache(ANALYTICS_NAMESPACE)
+    return TaskResponse.model_validate(task)
+
+
+@router.post("/bulk", response_model=List[int], status_code=status.HTTP_201_CREATED)
+def bulk_create_tasks(
+    tasks_data: List[TaskCreate],
+    current_user: User = Depends(get_current_active_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Create several tasks in one request.
+    
+    Args:
+        tasks_data: Task creation data for each task
+        current_user: Current authenticated user
+        db: Database session
+        
+    Returns:
+        List[int]: IDs of the created tasks, in request order
+        
+    Raises:
+        HTTPException: If a project is not found or an assignee does not exist
+    """
+    task_repo = TaskRepository(db)
+    project_repo = ProjectRepository(db)
+    
+    # Validate every referenced project belongs to the user in one query
+    project_ids = list({task_data.project_id for task_data in tasks_data})
+    if project_ids and project_repo.count_owned(project_ids, current_user.id) != len(project_ids):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+    
+    # Validate assignees other than the current user in one query
+    assignee_ids = list({
+        task_data.assignee_id for task_data in tasks_data
+        if task_data.assignee_id is not None and task_data.assignee_id != current_user.id
+    })
+    if assignee_ids and UserRepository(db).count({"id": assignee_ids}) != len(assignee_ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Assignee not found"
+        )
+    
+    task_ids = task_repo.bulk_create(tasks_data)
+    invalidate_cache(ANALYTICS_NAMESPACE)
+    return task_ids
 
 
 @router.get("/{task_id}", response_model=TaskResponse)
-async def get_task(
+def get_task(
     task_id: int,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -174,11 +247,11 @@ async def get_task(
         )
     
 
-    return TaskResponse.from_orm(task)
+    return TaskResponse.model_validate(task)
 
 
 @router.put("/{task_id}", response_model=TaskResponse)
-async def update_task(
+def update_task(
     task_id: int,
     task_update: TaskUpdate,
     current_user: User = Depends(get_current_active_user),
@@ -200,32 +273,32 @@ async def update_task(
         HTTPException: If task not found, access denied, or validation fails
     """
     task_repo = TaskRepository(db)
-    task = task_repo.get(task_id)
-    
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Task not found"
-        )
     
     # Validate assignee_id if provided
-    if task_update.assignee_id is not None:
-        from ..repositories.user_repository import UserRepository
+    # Self-assignment needs no lookup; the current user is already loaded
+    if task_update.assignee_id is not None and task_update.assignee_id != current_user.id:
         user_repo = UserRepository(db)
-        assignee = user_repo.get(task_update.assignee_id)
-        if not assignee:
+        if not user_repo.exists(task_update.assignee_id):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Assignee not found"
             )
     
     # Update task
-    updated_task = task_repo.update(task, task_update)
-    return TaskResponse.from_orm(updated_task)
+    updated_task = task_repo.update_by_id(task_id, task_update)
+    
+    if not updated_task:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found"
+        )
+    
+    invalidate_cache(ANALYTICS_NAMESPACE)
+    return TaskResponse.model_validate(updated_task)
 
 
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_task(
+def delete_task(
     task_id: int,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -242,15 +315,12 @@ async def delete_task(
         HTTPException: If task not found or access denied
     """
     task_repo = TaskRepository(db)
-    task = task_repo.get(task_id)
     
-    if not task:
+    # Delete task
+    if not task_repo.delete_by_id(task_id):
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Task not found"
         )
     
-
-    
-    # Delete task
-    task_repo.delete(task_id) 
\ No newline at end of file
+    invalidate_cache(ANALYTICS_NAMESPACE) 
\ No newline at end of file
@@ -5,18 +5,23 @@ Users API routes.
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from typing import List
+from pydantic import TypeAdapter
 
 from ..database import get_db
 from ..models.user import User
 from ..schemas.user import UserResponse, UserList
 from ..repositories.user_repository import UserRepository
 from ..api.deps import get_current_active_user
+from ..utils.responses import model_json_response
 
 router = APIRouter()
 
+# Validates a whole page of ORM rows in one pydantic-core call
+_user_list_adapter = TypeAdapter(List[UserResponse])
+
 
 @router.get("/", response_model=UserList)
-async def get_users(
+def get_users(
     skip: int = 0,
     limit: int = 100,
     current_user: User = Depends(get_current_active_user),
@@ -35,20 +40,20 @@ async def get_users(
         UserList: Paginated list of users
     """
     user_repo = UserRepository(db)
-    users = user_repo.get_all(skip=skip, limit=limit)
-    total = len(users)  # For simplicity, we'll count the returned users
+    users, total = user_repo.get_all_with_total(skip=skip, limit=limit)
     
-    return UserList(
-        items=[UserResponse.from_orm(user) for user in users],
+    result = UserList(
+        items=_user_list_adapter.validate_python(users),
         total=total,
         page=skip // limit + 1,
         size=limit,
         pages=(total + limit - 1) // limit
     )
+    return model_json_response(result)
 
 
 @router.get("/search", response_model=UserList)
-async def search_users(
+def search_users(
     search_term: str = Query(..., description="Search term for username, email, or full name"),
     skip: int = 0,
     limit: int = 100,
@@ -69,20 +74,20 @@ async def search_users(
         UserList: Paginated list of matching users
     """
     user_repo = UserRepository(db)
-    users = user_repo.search_users(search_term=search_term, skip=skip, limit=limit)
-    total = len(users)  # For simplicity, we'll count the returned users
+    users, total = user_repo.search_users_with_total(search_term=search_term, skip=skip, limit=limit)
     
-    return UserList(
-        items=[UserResponse.from_orm(user) for user in users],
+    result = UserList(
+        items=_user_list_adapter.validate_python(users),
         total=total,
         page=skip // limit + 1,
         size=limit,
         pages=(total + limit - 1) // limit
     )
+    return model_json_response(result)
 
 
 @router.get("/{user_id}", response_model=UserResponse)
-async def get_user(
+def get_user(
     user_id: int,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -110,4 +115,4 @@ async def get_user(
             detail="User not found"
         )
     
-    return UserResponse.from_orm(user) 
\ No newline at end of file
+    return UserResponse.model_validate(user) 
\ No newline at end of file
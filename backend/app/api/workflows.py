@@ -2,14 +2,14 @@
 Workflows API routes for business logic and automation.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from typing import List, Dict, Any
 import json
 
 from ..database import get_db
 from ..models.user import User
-from ..models.workflow import Workflow, WorkflowInstance, BusinessRule
+from ..models.workflow import Workflow, WorkflowInstance, BusinessRule, WorkflowType
 from ..schemas.workflow import (
     WorkflowCreate, WorkflowUpdate, WorkflowResponse, WorkflowList,
     WorkflowInstanceCreate, WorkflowInstanceUpdate, WorkflowInstanceResponse, WorkflowInstanceList,
@@ -17,14 +17,20 @@ from ..schemas.workflow import (
     WorkflowStatistics, WorkflowStageTransition
 )
 from ..repositories.workflow_repository import WorkflowRepository, WorkflowInstanceRepository, BusinessRuleRepository
+from ..repositories.project_repository import ProjectRepository
 from ..api.deps import get_current_active_user
+from ..services.workflow_service import workflow_service
+from ..config import settings
+from ..utils.cache import cached, invalidate_cache, WORKFLOWS_NAMESPACE
+from ..utils.responses import model_json_response
 
 router = APIRouter()
 
 
 # Workflow endpoints
 @router.get("/", response_model=WorkflowList)
-async def get_workflows(
+@cached(WORKFLOWS_NAMESPACE, expire=settings.chart_data_cache_ttl, per_user=False)
+def get_workflows(
     skip: int = 0,
     limit: int = 100,
     workflow_type: str = None,
@@ -47,20 +53,16 @@ async def get_workflows(
     workflow_repo = WorkflowRepository(db)
     
     if workflow_type:
-        from ..models.workflow import WorkflowType
         try:
             workflow_type_enum = WorkflowType(workflow_type)
-            workflows = workflow_repo.get_by_type(workflow_type_enum)
         except ValueError:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid workflow type")
+        workflows, total = workflow_repo.get_by_type_with_total(workflow_type_enum, skip, limit)
     else:
-        workflows = workflow_repo.get_active_workflows()
-    
-    total = len(workflows)
-    paginated_workflows = workflows[skip:skip + limit]
+        workflows, total = workflow_repo.get_active_workflows_with_total(skip, limit)
     
     return WorkflowList(
-        items=[WorkflowResponse.from_orm(workflow) for workflow in paginated_workflows],
+        items=[WorkflowResponse.from_orm_trusted(workflow) for workflow in workflows],
         total=total,
         page=skip // limit + 1,
         size=limit,
@@ -69,7 +71,7 @@ async def get_workflows(
 
 
 @router.post("/", response_model=WorkflowResponse, status_code=status.HTTP_201_CREATED)
-async def create_workflow(
+def create_workflow(
     workflow_data: WorkflowCreate,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -87,11 +89,12 @@ async def create_workflow(
     """
     workflow_repo = WorkflowRepository(db)
     workflow = workflow_repo.create_workflow(workflow_data)
-    return WorkflowResponse.from_orm(workflow)
+    invalidate_cache(WORKFLOWS_NAMESPACE)
+    return WorkflowResponse.model_validate(workflow)
 
 
 @router.get("/{workflow_id}", response_model=WorkflowResponse)
-async def get_workflow(
+def get_workflow(
     workflow_id: int,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -113,11 +116,11 @@ async def get_workflow(
     if not workflow:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Workflow not found")
     
-    return WorkflowResponse.from_orm(workflow)
+    return WorkflowResponse.model_validate(workflow)
 
 
 @router.put("/{workflow_id}", response_model=WorkflowResponse)
-async def update_workflow(
+def update_workflow(
     workflow_id: int,
     workflow_update: WorkflowUpdate,
     current_user: User = Depends(get_current_active_user),
@@ -136,17 +139,17 @@ async def update_workflow(
         WorkflowResponse: Updated workflow information
     """
     workflow_repo = WorkflowRepository(db)
-    workflow = workflow_repo.get(workflow_id)
+    updated_workflow = workflow_repo.update_by_id(workflow_id, workflow_update)
     
-    if not workflow:
+    if not updated_workflow:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Workflow not found")
     
-    updated_workflow = workflow_repo.update_workflow(workflow, workflow_update)
-    return WorkflowResponse.from_orm(updated_workflow)
+    invalidate_cache(WORKFLOWS_NAMESPACE)
+    return WorkflowResponse.model_validate(updated_workflow)
 
 
 @router.delete("/{workflow_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_workflow(
+def delete_workflow(
     workflow_id: int,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -160,16 +163,17 @@ async def delete_workflow(
         db: Database session
     """
     workflow_repo = WorkflowRepository(db)
-    workflow = workflow_repo.get(workflow_id)
     
-    if not workflow:
+    # Loads the workflow so the ORM detaches its projects before deleting
+    if not workflow_repo.delete(workflow_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Workflow not found")
     
-    workflow_repo.delete(workflow_id)
+    invalidate_cache(WORKFLOWS_NAMESPACE)
 
 
 @router.get("/statistics/overview", response_model=WorkflowStatistics)
-async def get_workflow_statistics(
+@cached(WORKFLOWS_NAMESPACE, expire=settings.chart_data_cache_ttl, per_user=False)
+def get_workflow_statistics(
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
@@ -189,16 +193,16 @@ async def get_workflow_statistics(
     return WorkflowStatistics(
         total_workflows=stats["total_workflows"],
         active_workflows=stats["active_workflows"],
-        completed_workflows=0,  # This would need to be calculated based on completed instances
+        completed_workflows=stats["completed_workflows"],
         workflows_by_type=stats["workflows_by_type"],
         workflows_by_stage={},  # This would need to be calculated from instances
-        recent_workflows=[WorkflowResponse.from_orm(wf) for wf in stats["recent_workflows"]]
+        recent_workflows=[WorkflowResponse.from_orm_trusted(row) for row in stats["recent_workflows"]]
     )
 
 
 # Workflow Instance endpoints
 @router.get("/instances/", response_model=WorkflowInstanceList)
-async def get_workflow_instances(
+def get_workflow_instances(
     skip: int = 0,
     limit: int = 100,
     project_id: int = None,
@@ -224,29 +228,26 @@ async def get_workflow_instances(
     """
     instance_repo = WorkflowInstanceRepository(db)
     
-    if project_id:
-        instances = instance_repo.get_by_project(project_id)
-    elif workflow_id:
-        instances = instance_repo.get_by_workflow(workflow_id)
-    elif stage:
-        instances = instance_repo.get_by_stage(stage)
-    else:
-        instances = instance_repo.get_all(skip=skip, limit=limit)
-    
-    total = len(instances)
-    paginated_instances = instances[skip:skip + limit]
+    instances, total = instance_repo.get_page(
+        skip=skip,
+        limit=limit,
+        project_id=project_id,
+        workflow_id=workflow_id,
+        stage=stage
+    )
     
-    return WorkflowInstanceList(
-        items=[WorkflowInstanceResponse.from_orm(instance) for instance in paginated_instances],
+    result = WorkflowInstanceList(
+        items=[WorkflowInstanceResponse.from_orm_trusted(instance) for instance in instances],
         total=total,
         page=skip // limit + 1,
         size=limit,
         pages=(total + limit - 1) // limit
     )
+    return model_json_response(result)
 
 
 @router.post("/instances/", response_model=WorkflowInstanceResponse, status_code=status.HTTP_201_CREATED)
-async def create_workflow_instance(
+def create_workflow_instance(
     instance_data: WorkflowInstanceCreate,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -266,23 +267,21 @@ async def create_workflow_instance(
     
     # Validate that the workflow exists
     workflow_repo = WorkflowRepository(db)
-    workflow = workflow_repo.get(instance_data.workflow_id)
-    if not workflow:
+    if not workflow_repo.exists(instance_data.workflow_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Workflow not found")
     
     # Validate that the project exists
-    from ..repositories.project_repository import ProjectRepository
     project_repo = ProjectRepository(db)
-    project = project_repo.get(instance_data.project_id)
-    if not project:
+    if not project_repo.exists(instance_data.project_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Project not found")
     
     instance = instance_repo.create_workflow_instance(instance_data)
-    return WorkflowInstanceResponse.from_orm(instance)
+    invalidate_cache(WORKFLOWS_NAMESPACE)
+    return WorkflowInstanceResponse.model_validate(instance)
 
 
 @router.get("/instances/{instance_id}", response_model=WorkflowInstanceResponse)
-async def get_workflow_instance(
+def get_workflow_instance(
     instance_id: int,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -304,11 +303,11 @@ async def get_workflow_instance(
     if not instance:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Workflow instance not found")
     
-    return WorkflowInstanceResponse.from_orm(instance)
+    return WorkflowInstanceResponse.model_validate(instance)
 
 
 @router.put("/instances/{instance_id}", response_model=WorkflowInstanceResponse)
-async def update_workflow_instance(
+def update_workflow_instance(
     instance_id: int,
     instance_update: WorkflowInstanceUpdate,
     current_user: User = Depends(get_current_active_user),
@@ -327,28 +326,32 @@ async def update_workflow_instance(
         WorkflowInstanceResponse: Updated workflow instance information
     """
     instance_repo = WorkflowInstanceRepository(db)
-    instance = instance_repo.get(instance_id)
+    updated_instance = instance_repo.update_by_id(instance_id, instance_update)
     
-    if not instance:
+    if not updated_instance:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Workflow instance not found")
     
-    updated_instance = instance_repo.update_workflow_instance(instance, instance_update)
-    return WorkflowInstanceResponse.from_orm(updated_instance)
+    invalidate_cache(WORKFLOWS_NAMESPACE)
+    return WorkflowInstanceResponse.model_validate(updated_instance)
 
 
 @router.post("/instances/{instance_id}/transition", response_model=WorkflowInstanceResponse)
-async def transition_workflow_stage(
+def transition_workflow_stage(
     instance_id: int,
     transition_data: WorkflowStageTransition,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
 ):
     """
     Transition workflow instance to a new stage.
     
+    Rule evaluation for the transition runs after the response is sent.
+    
     Args:
         instance_id: Workflow instance ID
         transition_data: Stage transition data
+        background_tasks: Background task queue for transition effects
         current_user: Current authenticated user
         db: Database session
         
@@ -357,25 +360,35 @@ async def transition_workflow_stage(
     """
     instance_repo = WorkflowInstanceRepository(db)
     
-    # Validate that the instance exists
-    instance = instance_repo.get(instance_id)
-    if not instance:
+    # Transition to new stage; the repository reports a missing instance
+    try:
+        updated_instance = instance_repo.transition_stage(
+            instance_id=instance_id,
+            new_stage=transition_data.to_stage,
+            transition_data=transition_data.transition_data,
+            triggered_by=current_user.id
+        )
+    except ValueError:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Workflow instance not found")
+    from_stage = updated_instance.history[-1]["from_stage"]
+    invalidate_cache(WORKFLOWS_NAMESPACE)
     
-    # Transition to new stage
-    updated_instance = instance_repo.transition_stage(
+    background_tasks.add_task(
+        workflow_service.apply_transition_effects,
         instance_id=instance_id,
-        new_stage=transition_data.to_stage,
-        transition_data=transition_data.transition_data,
+        project_id=updated_instance.project_id,
+        from_stage=from_stage,
+        to_stage=updated_instance.current_stage,
         triggered_by=current_user.id
     )
     
-    return WorkflowInstanceResponse.from_orm(updated_instance)
+    return WorkflowInstanceResponse.model_validate(updated_instance)
 
 
 # Business Rule endpoints
 @router.get("/rules/", response_model=BusinessRuleList)
-async def get_business_rules(
+@cached(WORKFLOWS_NAMESPACE, expire=settings.chart_data_cache_ttl, per_user=False)
+def get_business_rules(
     skip: int = 0,
     limit: int = 100,
     rule_type: str = None,
@@ -398,15 +411,12 @@ async def get_business_rules(
     rule_repo = BusinessRuleRepository(db)
     
     if rule_type:
-        rules = rule_repo.get_by_type(rule_type)
+        rules, total = rule_repo.get_by_type_with_total(rule_type, skip, limit)
     else:
-        rules = rule_repo.get_active_rules()
-    
-    total = len(rules)
-    paginated_rules = rules[skip:skip + limit]
+        rules, total = rule_repo.get_active_rules_with_total(skip, limit)
     
     return BusinessRuleList(
-        items=[BusinessRuleResponse.from_orm(rule) for rule in paginated_rules],
+        items=[BusinessRuleResponse.from_orm_trusted(rule) for rule in rules],
         total=total,
         page=skip // limit + 1,
         size=limit,
@@ -415,7 +425,7 @@ async def get_business_rules(
 
 
 @router.post("/rules/", response_model=BusinessRuleResponse, status_code=status.HTTP_201_CREATED)
-async def create_business_rule(
+def create_business_rule(
     rule_data: BusinessRuleCreate,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -433,11 +443,12 @@ async def create_business_rule(
     """
     rule_repo = BusinessRuleRepository(db)
     rule = rule_repo.create_business_rule(rule_data)
-    return BusinessRuleResponse.from_orm(rule)
+    invalidate_cache(WORKFLOWS_NAMESPACE)
+    return BusinessRuleResponse.model_validate(rule)
 
 
 @router.get("/rules/{rule_id}", response_model=BusinessRuleResponse)
-async def get_business_rule(
+def get_business_rule(
     rule_id: int,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -459,11 +470,11 @@ async def get_business_rule(
     if not rule:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Business rule not found")
     
-    return BusinessRuleResponse.from_orm(rule)
+    return BusinessRuleResponse.model_validate(rule)
 
 
 @router.put("/rules/{rule_id}", response_model=BusinessRuleResponse)
-async def update_business_rule(
+def update_business_rule(
     rule_id: int,
     rule_update: BusinessRuleUpdate,
     current_user: User = Depends(get_current_active_user),
@@ -482,17 +493,17 @@ async def update_business_rule(
         BusinessRuleResponse: Updated business rule information
     """
     rule_repo = BusinessRuleRepository(db)
-    rule = rule_repo.get(rule_id)
+    updated_rule = rule_repo.update_by_id(rule_id, rule_update)
     
-    if not rule:
+    if not updated_rule:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Business rule not found")
     
-    updated_rule = rule_repo.update_business_rule(rule, rule_update)
-    return BusinessRuleResponse.from_orm(updated_rule)
+    invalidate_cache(WORKFLOWS_NAMESPACE)
+    return BusinessRuleResponse.model_validate(updated_rule)
 
 
 @router.delete("/rules/{rule_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_business_rule(
+def delete_business_rule(
     rule_id: int,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -506,16 +517,15 @@ async def delete_business_rule(
         db: Database session
     """
     rule_repo = BusinessRuleRepository(db)
-    rule = rule_repo.get(rule_id)
     
-    if not rule:
+    if not rule_repo.delete_by_id(rule_id):
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Business rule not found")
     
-    rule_repo.delete(rule_id)
+    invalidate_cache(WORKFLOWS_NAMESPACE)
 
 
 @router.post("/rules/evaluate")
-async def evaluate_business_rules(
+def evaluate_business_rules(
     context: Dict[str, Any],
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -3,7 +3,7 @@ Database configuration and session management.
 Implements Singleton pattern for database connection.
 """
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, text, DDL, Table
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
@@ -15,23 +15,85 @@ from .config import settings
 logger = logging.getLogger(__name__)
 
 # Create SQLAlchemy engine
+if settings.environment == "test":
+    pool_options = {"poolclass": StaticPool}
+else:
+    # Size the QueuePool for concurrent workers so requests reuse connections
+    pool_options = {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+    }
+
+if settings.database_url.startswith("sqlite"):
+    # Sync endpoints run in a threadpool, so the connection crosses threads
+    pool_options["connect_args"] = {"check_same_thread": False}
+
 engine = create_engine(
     settings.database_url,
     pool_pre_ping=True,
-    pool_recycle=300,
-    echo=settings.debug,
-    poolclass=StaticPool if settings.environment == "test" else None
+    query_cache_size=settings.db_query_cache_size,
+    # SQL echo formats every statement, so keep it to local development
+    echo=settings.debug and settings.environment == "development",
+    **pool_options
+)
+
+# Create SessionLocal class; objects stay loaded after commit so freshly
+# inserted rows are not re-selected when the response is built
+SessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    expire_on_commit=False,
+    bind=engine
 )
 
-# Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Key in Session.info holding per-session memoized read aggregates
+STATS_CACHE_KEY = "stats_cache"
+
+
+@event.listens_for(SessionLocal, "after_commit")
+@event.listens_for(SessionLocal, "after_rollback")
+def _clear_stats_cache(session) -> None:
+    """Drop memoized aggregates once the session writes or rolls back."""
+    session.info.pop(STATS_CACHE_KEY, None)
 
 # Create Base class for models
 Base = declarative_base()
 
+
+def add_trigram_index(table: Table, column: str, index_name: str) -> None:
+    """
+    Create a pg_trgm GIN index on a column together with its table.
+    
+    The index lets ilike('%term%') searches use an index scan. It is skipped
+    with a notice when the pg_trgm extension cannot be installed.
+    
+    Args:
+        table: Table to index
+        column: Text column searched with ilike
+        index_name: Name of the index
+    """
+    ddl = DDL(f"""
+DO $$
+BEGIN
+    CREATE EXTENSION IF NOT EXISTS pg_trgm;
+    CREATE INDEX IF NOT EXISTS {index_name} ON %(table)s USING gin ({column} gin_trgm_ops);
+EXCEPTION WHEN OTHERS THEN
+    RAISE NOTICE 'pg_trgm unavailable, skipping index {index_name}: %%', SQLERRM;
+END
+$$
+""")
+    event.listen(table, "after_create", ddl.execute_if(dialect="postgresql"))
+
+
 # Import all models to ensure they are registered with SQLAlchemy
 from .models import user, project, task, workflow
 
+# Single-column foreign key indexes left behind by older schemas; the
+# composite indexes leading with the same column cover their lookups
+_SUPERSEDED_INDEXES = ("ix_tasks_project_id", "ix_tasks_assignee_id", "ix_projects_owner_id")
+
 
 class DatabaseManager:
     """
@@ -87,6 +149,11 @@ class DatabaseManager:
         """Create all tables in the database."""
         try:
             Base.metadata.create_all(bind=self._engine)
+            # create_all leaves existing tables alone, so upgrade them here
+            with self._engine.begin() as connection:
+                task.ensure_project_counters(connection)
+                for index_name in _SUPERSEDED_INDEXES:
+                    connection.execute(text(f"DROP INDEX IF EXISTS {index_name}"))
             logger.info("Database tables created successfully")
         except Exception as e:
             logger.error(f"Error creating database tables: {e}")
@@ -111,14 +178,16 @@ def get_db():
     Dependency function to get database session.
     Yields a database session and ensures it's closed.
     
+    Uses SessionLocal directly since this runs on every request.
+    
     Yields:
         Session: SQLAlchemy database session
     """
-    db = db_manager.get_session()
+    db = SessionLocal()
     try:
         yield db
     finally:
-        db_manager.close_session(db)
+        db.close()
 
 
 def init_db():
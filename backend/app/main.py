@@ -4,13 +4,14 @@ Main FastAPI application entry point.
 
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 import logging
 import os
 
 from .config import settings
 from .database import init_db
 from .api import auth, users, projects, tasks, workflows, analytics
+from .services.notification_service import notification_service
 
 # Configure logging
 logging.basicConfig(level=getattr(logging, settings.log_level))
@@ -23,12 +24,14 @@ app = FastAPI(
     description="A comprehensive project management API with advanced features",
     docs_url="/docs" if settings.debug else None,
     redoc_url="/redoc" if settings.debug else None,
+    default_response_class=ORJSONResponse,
 )
 
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.backend_cors_origins,
+    allow_origins=settings.cors_allow_origins,
+    allow_origin_regex=settings.cors_origin_regex,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -61,6 +64,11 @@ async def startup_event():
         logger.error(f"Failed to initialize database: {e}")
         raise
 
+@app.on_event("shutdown")
+def shutdown_event():
+    """Close the pooled SMTP connection on shutdown."""
+    notification_service.close()
+
 @app.get("/")
 async def root():
     """Root endpoint with API information."""
@@ -2,13 +2,15 @@
 Project model for project management.
 """
 
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, Index, case
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
 from datetime import datetime
 
-from ..database import Base
+from ..database import Base, add_trigram_index
+from ..utils.dates import format_datetime
 
 
 class ProjectStatus(str, enum.Enum):
@@ -20,6 +22,12 @@ class ProjectStatus(str, enum.Enum):
     CANCELLED = "cancelled"
 
 
+# Enum-to-string map so to_dict avoids a .value lookup per row
+_PROJECT_STATUS_VALUES = {member: member.value for member in ProjectStatus}
+# Statuses in which a project is no longer worked on
+_CLOSED_STATUSES = frozenset({ProjectStatus.COMPLETED, ProjectStatus.CANCELLED})
+
+
 class Project(Base):
     """
     Project model representing projects in the system.
@@ -32,6 +40,9 @@ class Project(Base):
         status: Current project status
         start_date: Project start date
         end_date: Project end date
+        tasks_total: Number of tasks (maintained by a database trigger)
+        tasks_completed: Number of completed tasks (maintained by a database trigger)
+        tasks_active: Number of open tasks (maintained by a database trigger)
         created_at: Project creation timestamp
         updated_at: Last update timestamp
     """
@@ -41,11 +52,14 @@ class Project(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False, index=True)
     description = Column(Text, nullable=True)
-    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    owner_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     workflow_id = Column(Integer, ForeignKey("workflows.id"), nullable=True, index=True)
     status = Column(Enum(ProjectStatus), default=ProjectStatus.PLANNING, nullable=False)
     start_date = Column(DateTime(timezone=True), nullable=True)
     end_date = Column(DateTime(timezone=True), nullable=True)
+    tasks_total = Column(Integer, default=0, server_default="0", nullable=False)
+    tasks_completed = Column(Integer, default=0, server_default="0", nullable=False)
+    tasks_active = Column(Integer, default=0, server_default="0", nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
     
@@ -53,6 +67,19 @@ class Project(Base):
     owner = relationship("User", back_populates="projects")
     workflow = relationship("Workflow", back_populates="projects")
     tasks = relationship("Task", back_populates="project", cascade="all, delete-orphan")
+    
+    __table_args__ = (
+        # Owner project listings are ordered newest first, id breaking ties for keyset paging
+        Index("ix_projects_owner_created", "owner_id", "created_at", "id"),
+        # Per-owner status counts and filters
+        Index("ix_projects_owner_status", "owner_id", "status"),
+        # Only open projects are indexed by status; finished ones are rarely filtered on
+        Index(
+            "ix_projects_active",
+            "status",
+            postgresql_where=status.notin_([ProjectStatus.COMPLETED, ProjectStatus.CANCELLED])
+        ),
+    )
 
     
     def __repr__(self):
@@ -61,28 +88,38 @@ class Project(Base):
     @property
     def is_active(self) -> bool:
         """Check if project is active (not completed or cancelled)."""
-        return self.status not in [ProjectStatus.COMPLETED, ProjectStatus.CANCELLED]
+        return self.status not in _CLOSED_STATUSES
     
-    @property
+    @hybrid_property
     def task_count(self) -> int:
         """Get total number of tasks in the project."""
-        return len(self.tasks) if self.tasks else 0
+        return self.tasks_total or 0
     
-    @property
+    @task_count.expression
+    def task_count(cls):
+        return cls.tasks_total
+    
+    @hybrid_property
     def completed_task_count(self) -> int:
         """Get number of completed tasks in the project."""
-        if not self.tasks:
-            return 0
-        return len([task for task in self.tasks if task.status == "completed"])
+        return self.tasks_completed or 0
     
-    @property
+    @completed_task_count.expression
+    def completed_task_count(cls):
+        return cls.tasks_completed
+    
+    @hybrid_property
     def progress_percentage(self) -> float:
         """Calculate project progress percentage."""
-        if not self.tasks:
-            return 0.0
-        total_tasks = len(self.tasks)
-        completed_tasks = self.completed_task_count
-        return (completed_tasks / total_tasks) * 100 if total_tasks > 0 else 0.0
+        total_tasks = self.task_count
+        return (self.completed_task_count / total_tasks) * 100 if total_tasks > 0 else 0.0
+    
+    @progress_percentage.expression
+    def progress_percentage(cls):
+        return case(
+            (cls.tasks_total > 0, cls.tasks_completed * 100.0 / cls.tasks_total),
+            else_=0.0
+        )
     
     def to_dict(self):
         """Convert project to dictionary representation."""
@@ -94,13 +131,17 @@ class Project(Base):
             "owner_name": self.owner.full_name if self.owner else None,
             "workflow_id": self.workflow_id,
             "workflow_name": self.workflow.name if self.workflow else None,
-            "status": self.status.value if self.status else None,
-            "start_date": self.start_date.isoformat() if self.start_date else None,
-            "end_date": self.end_date.isoformat() if self.end_date else None,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "status": _PROJECT_STATUS_VALUES.get(self.status),
+            "start_date": format_datetime(self.start_date),
+            "end_date": format_datetime(self.end_date),
+            "created_at": format_datetime(self.created_at),
+            "updated_at": format_datetime(self.updated_at),
             "task_count": self.task_count,
             "completed_task_count": self.completed_task_count,
             "progress_percentage": round(self.progress_percentage, 2),
             "is_active": self.is_active
-        } 
\ No newline at end of file
+        }
+
+
+# Name searches use ilike('%term%')
+add_trigram_index(Project.__table__, "name", "ix_projects_name_trgm")
@@ -3,13 +3,18 @@ Task model for task management within projects.
 """
 
 from typing import Optional
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, Enum, Index, DDL, event, inspect, text
+from sqlalchemy.engine import Connection
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
+import logging
 from datetime import datetime, timezone
 
-from ..database import Base
+from ..database import Base, add_trigram_index
+from ..utils.dates import format_datetime
+
+logger = logging.getLogger(__name__)
 
 
 class TaskStatus(str, enum.Enum):
@@ -29,6 +34,13 @@ class TaskPriority(str, enum.Enum):
     URGENT = "urgent"
 
 
+# Enum-to-string maps so to_dict avoids a .value lookup per row
+_TASK_STATUS_VALUES = {member: member.value for member in TaskStatus}
+_TASK_PRIORITY_VALUES = {member: member.value for member in TaskPriority}
+# Statuses in which a task is no longer worked on
+_CLOSED_STATUSES = frozenset({TaskStatus.COMPLETED, TaskStatus.CANCELLED})
+
+
 class Task(Base):
     """
     Task model representing tasks within projects.
@@ -51,8 +63,8 @@ class Task(Base):
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False, index=True)
     description = Column(Text, nullable=True)
-    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False, index=True)
-    assignee_id = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
+    assignee_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     status = Column(Enum(TaskStatus), default=TaskStatus.TODO, nullable=False)
     priority = Column(Enum(TaskPriority), default=TaskPriority.MEDIUM, nullable=False)
     due_date = Column(DateTime(timezone=True), nullable=True)
@@ -62,6 +74,32 @@ class Task(Base):
     # Relationships
     project = relationship("Project", back_populates="tasks")
     assignee = relationship("User", back_populates="assigned_tasks", foreign_keys=[assignee_id])
+    
+    __table_args__ = (
+        # Per-project status counts and filters
+        Index("ix_tasks_project_status", "project_id", "status"),
+        # "My tasks" lookups filtered by status
+        Index("ix_tasks_assignee_status", "assignee_id", "status"),
+        # Task-wide listings are ordered newest first, id breaking ties for keyset paging
+        Index("ix_tasks_created", "created_at", "id"),
+        # "My tasks" listings are ordered newest first, id breaking ties for keyset paging
+        Index("ix_tasks_assignee_created", "assignee_id", "created_at", "id"),
+        # Overdue and upcoming-deadline scans only care about open tasks
+        Index(
+            "ix_tasks_open_due_date",
+            "due_date",
+            postgresql_where=status.notin_([TaskStatus.COMPLETED, TaskStatus.CANCELLED])
+        ),
+        # Per-owner overdue counts reach tasks through project_id
+        Index(
+            "ix_tasks_open_project_due_date",
+            "project_id",
+            "due_date",
+            postgresql_where=status.notin_([TaskStatus.COMPLETED, TaskStatus.CANCELLED])
+        ),
+        # Task-wide status counts are answered from the index alone
+        Index("ix_tasks_status", "status", postgresql_include=["project_id", "id"]),
+    )
 
     
     def __repr__(self):
@@ -70,7 +108,7 @@ class Task(Base):
     @property
     def is_overdue(self) -> bool:
         """Check if task is overdue."""
-        if not self.due_date or self.status in [TaskStatus.COMPLETED, TaskStatus.CANCELLED]:
+        if not self.due_date or self.status in _CLOSED_STATUSES:
             return False
         # Use timezone-aware datetime for comparison
         now = datetime.now(timezone.utc)
@@ -86,7 +124,7 @@ class Task(Base):
     @property
     def is_active(self) -> bool:
         """Check if task is active (not completed or cancelled)."""
-        return self.status not in [TaskStatus.COMPLETED, TaskStatus.CANCELLED]
+        return self.status not in _CLOSED_STATUSES
     
     @property
     def project_name(self) -> Optional[str]:
@@ -107,15 +145,145 @@ class Task(Base):
             "title": self.title,
             "description": self.description,
             "project_id": self.project_id,
-            "project_name": self.project.name if self.project else None,
+            "project_name": self.project_name,
             "assignee_id": self.assignee_id,
-            "assignee_name": self.assignee.full_name if self.assignee else None,
-            "status": self.status.value if self.status else None,
-            "priority": self.priority.value if self.priority else None,
-            "due_date": self.due_date.isoformat() if self.due_date else None,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+            "assignee_name": self.assignee_name,
+            "status": _TASK_STATUS_VALUES.get(self.status),
+            "priority": _TASK_PRIORITY_VALUES.get(self.priority),
+            "due_date": format_datetime(self.due_date),
+            "created_at": format_datetime(self.created_at),
+            "updated_at": format_datetime(self.updated_at),
             "is_overdue": self.is_overdue,
             "is_completed": self.is_completed,
             "is_active": self.is_active
-        } 
\ No newline at end of file
+        }
+
+
+# Keep the denormalized task counters on projects in sync with a database
+# trigger (PostgreSQL and SQLite). Enum columns store member names, hence
+# TaskStatus.X.name in the SQL.
+_COMPLETED = f"'{TaskStatus.COMPLETED.name}'"
+_ACTIVE = ", ".join(
+    f"'{status.name}'" for status in (TaskStatus.TODO, TaskStatus.IN_PROGRESS, TaskStatus.REVIEW)
+)
+_PROJECT_COUNTER_COLUMNS = ("tasks_total", "tasks_completed", "tasks_active")
+
+_project_counters_function = DDL(f"""
+CREATE OR REPLACE FUNCTION tasks_update_project_counters() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        UPDATE projects SET
+            tasks_total = tasks_total - 1,
+            tasks_completed = tasks_completed - (OLD.status = {_COMPLETED})::int,
+            tasks_active = tasks_active - (OLD.status IN ({_ACTIVE}))::int
+        WHERE id = OLD.project_id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        UPDATE projects SET
+            tasks_total = tasks_total + 1,
+            tasks_completed = tasks_completed + (NEW.status = {_COMPLETED})::int,
+            tasks_active = tasks_active + (NEW.status IN ({_ACTIVE}))::int
+        WHERE id = NEW.project_id;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql
+""")
+
+_project_counters_trigger = DDL("""
+DROP TRIGGER IF EXISTS tasks_project_counters ON tasks;
+CREATE TRIGGER tasks_project_counters
+AFTER INSERT OR DELETE OR UPDATE OF status, project_id ON tasks
+FOR EACH ROW EXECUTE FUNCTION tasks_update_project_counters()
+""")
+
+# SQLite has no trigger functions, so each event gets its own trigger
+_SQLITE_DECREMENT = f"""
+    UPDATE projects SET
+        tasks_total = tasks_total - 1,
+        tasks_completed = tasks_completed - (OLD.status = {_COMPLETED}),
+        tasks_active = tasks_active - (OLD.status IN ({_ACTIVE}))
+    WHERE id = OLD.project_id;"""
+_SQLITE_INCREMENT = f"""
+    UPDATE projects SET
+        tasks_total = tasks_total + 1,
+        tasks_completed = tasks_completed + (NEW.status = {_COMPLETED}),
+        tasks_active = tasks_active + (NEW.status IN ({_ACTIVE}))
+    WHERE id = NEW.project_id;"""
+
+_sqlite_project_counters_triggers = [
+    DDL(f"""
+CREATE TRIGGER IF NOT EXISTS tasks_project_counters_{name}
+AFTER {event_clause} ON tasks
+BEGIN{body}
+END
+""")
+    for name, event_clause, body in (
+        ("insert", "INSERT", _SQLITE_INCREMENT),
+        ("delete", "DELETE", _SQLITE_DECREMENT),
+        ("update", "UPDATE OF status, project_id", _SQLITE_DECREMENT + _SQLITE_INCREMENT),
+    )
+]
+
+_project_counters_backfill = text(f"""
+UPDATE projects SET
+    tasks_total = (SELECT count(*) FROM tasks WHERE tasks.project_id = projects.id),
+    tasks_completed = (
+        SELECT count(*) FROM tasks WHERE tasks.project_id = projects.id AND tasks.status = {_COMPLETED}
+    ),
+    tasks_active = (
+        SELECT count(*) FROM tasks WHERE tasks.project_id = projects.id AND tasks.status IN ({_ACTIVE})
+    )
+""")
+
+_project_counters_installed = {
+    "postgresql": text("SELECT 1 FROM pg_trigger WHERE tgname = 'tasks_project_counters'"),
+    "sqlite": text("SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'tasks_project_counters_update'"),
+}
+
+event.listen(Task.__table__, "after_create", _project_counters_function.execute_if(dialect="postgresql"))
+event.listen(Task.__table__, "after_create", _project_counters_trigger.execute_if(dialect="postgresql"))
+for _ddl in _sqlite_project_counters_triggers:
+    event.listen(Task.__table__, "after_create", _ddl.execute_if(dialect="sqlite"))
+
+
+def ensure_project_counters(connection: Connection) -> None:
+    """
+    Bring an existing database up to date with the project task counters.
+    
+    Tables created by create_all get the counter columns and trigger from
+    the start. Databases created before them are upgraded here: missing
+    columns are added, the trigger is installed and the counters are
+    backfilled from tasks. Safe to run on every startup; once the trigger
+    exists nothing is rewritten.
+    
+    Args:
+        connection: Connection inside a transaction
+    """
+    installed = _project_counters_installed.get(connection.dialect.name)
+    if installed is None:
+        logger.warning(
+            "Project task counters are not maintained on %s", connection.dialect.name
+        )
+        return
+    
+    existing = {column["name"] for column in inspect(connection).get_columns("projects")}
+    missing = [name for name in _PROJECT_COUNTER_COLUMNS if name not in existing]
+    for name in missing:
+        connection.execute(text(f"ALTER TABLE projects ADD COLUMN {name} INTEGER NOT NULL DEFAULT 0"))
+    
+    if not missing and connection.execute(installed).first():
+        return
+    
+    if connection.dialect.name == "postgresql":
+        connection.execute(_project_counters_function)
+        connection.execute(_project_counters_trigger)
+    else:
+        for ddl in _sqlite_project_counters_triggers:
+            connection.execute(ddl)
+    connection.execute(_project_counters_backfill)
+    logger.info("Installed project task counters and backfilled them from tasks")
+
+
+# Title searches use ilike('%term%')
+add_trigram_index(Task.__table__, "title", "ix_tasks_title_trgm")
@@ -9,6 +9,7 @@ from datetime import datetime
 
 
 from ..database import Base
+from ..utils.dates import format_datetime
 
 
 
@@ -66,6 +67,6 @@ class User(Base):
             "full_name": self.full_name,
 
             "is_active": self.is_active,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None
+            "created_at": format_datetime(self.created_at),
+            "updated_at": format_datetime(self.updated_at)
         } 
\ No newline at end of file
@@ -9,6 +9,7 @@ from datetime import datetime
 import enum
 
 from ..database import Base
+from ..utils.dates import format_datetime
 
 
 class WorkflowStage(str, enum.Enum):
@@ -34,6 +35,10 @@ class WorkflowType(str, enum.Enum):
     OPERATIONS = "operations"
 
 
+# Enum-to-string map so to_dict avoids a .value lookup per row
+_WORKFLOW_TYPE_VALUES = {member: member.value for member in WorkflowType}
+
+
 class Workflow(Base):
     """
     Workflow model for business process management.
@@ -75,12 +80,12 @@ class Workflow(Base):
             "id": self.id,
             "name": self.name,
             "description": self.description,
-            "type": self.type.value,
+            "type": _WORKFLOW_TYPE_VALUES[self.type],
             "stages": self.stages,
             "rules": self.rules,
             "is_active": self.is_active,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None
+            "created_at": format_datetime(self.created_at),
+            "updated_at": format_datetime(self.updated_at)
         }
 
 
@@ -129,8 +134,8 @@ class WorkflowInstance(Base):
             "stage_data": self.stage_data,
             "history": self.history,
             "is_completed": self.is_completed,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None
+            "created_at": format_datetime(self.created_at),
+            "updated_at": format_datetime(self.updated_at)
         }
 
 
@@ -175,6 +180,6 @@ class BusinessRule(Base):
             "conditions": self.conditions,
             "actions": self.actions,
             "is_active": self.is_active,
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None
+            "created_at": format_datetime(self.created_at),
+            "updated_at": format_datetime(self.updated_at)
         } 
\ No newline at end of file
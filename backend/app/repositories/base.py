@@ -3,18 +3,53 @@ Base repository class with common CRUD operations.
 Implements the Repository pattern for data access abstraction.
 """
 
-from typing import Generic, TypeVar, Type, Optional, List, Any, Dict
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from typing import Generic, TypeVar, Type, Optional, List, Any, Dict, Tuple, Callable, Hashable, Union
+from datetime import datetime
+import base64
+from sqlalchemy.orm import Session, Query
+from sqlalchemy import and_, or_, func, select, insert, update, delete, tuple_, Select
 from pydantic import BaseModel
 
-from ..database import Base
+from ..database import Base, STATS_CACHE_KEY
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 
+def _encode_cursor(created_at: datetime, id: int) -> str:
+    """Encode a (created_at, id) keyset position as an opaque cursor."""
+    return base64.urlsafe_b64encode(f"{created_at.isoformat()}|{id}".encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor produced by _encode_cursor, raising ValueError if malformed."""
+    try:
+        created_at, id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(id)
+    except ValueError as e:
+        raise ValueError("Invalid pagination cursor") from e
+
+
+def schema_values(obj_in: BaseModel, exclude_unset: bool = False) -> Dict[str, Any]:
+    """
+    Get a flat schema's field values without model_dump's deep copy.
+    
+    Values are returned as held by the model, so large JSON fields (stages,
+    conditions, ...) reach SQLAlchemy without being rebuilt. Only use this
+    for schemas whose fields are not themselves models.
+    
+    Args:
+        obj_in: Pydantic model instance
+        exclude_unset: Only include fields explicitly set on the model
+        
+    Returns:
+        Dict[str, Any]: Field values by name
+    """
+    fields = obj_in.model_fields_set if exclude_unset else type(obj_in).model_fields
+    return {name: getattr(obj_in, name) for name in fields}
+
+
 class BaseRepository(Generic[ModelType]):
     """
     Base repository class with common CRUD operations.
@@ -35,17 +70,40 @@ class BaseRepository(Generic[ModelType]):
         self.db = db
         self.model = model
     
+    def memoize(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Return a value computed at most once per session.
+        
+        Sessions are request-scoped, so repeated aggregate reads within one
+        request share a single result. Entries are dropped on commit or
+        rollback, so writes are never masked by a stale value.
+        
+        Args:
+            key: Cache key, unique per method and arguments
+            compute: Callable producing the value on a miss
+            
+        Returns:
+            Any: Cached or freshly computed value
+        """
+        cache = self.db.info.setdefault(STATS_CACHE_KEY, {})
+        if key not in cache:
+            cache[key] = compute()
+        return cache[key]
+    
     def get(self, id: int) -> Optional[ModelType]:
         """
         Get a single record by ID.
         
+        Records already loaded in this session are returned from the
+        identity map without emitting SQL.
+        
         Args:
             id: Record ID
             
         Returns:
             Optional[ModelType]: Record if found, None otherwise
         """
-        return self.db.query(self.model).filter(self.model.id == id).first()
+        return self.db.get(self.model, id)
     
     def get_multi(
         self,
@@ -76,6 +134,88 @@ class BaseRepository(Generic[ModelType]):
         
         return query.offset(skip).limit(limit).all()
     
+    def paginate(
+        self,
+        query: Query,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[ModelType], int]:
+        """
+        Fetch a page of records together with the total count.
+        
+        The total is computed with a COUNT(*) OVER() window in the same
+        query; a separate count is only issued for an empty page past the end.
+        
+        With a cursor the page is fetched by keyset instead: rows after the
+        cursor's (created_at, id) position, newest first, so deep pages do
+        not read and discard the skipped rows. skip is ignored in that case.
+        
+        The query may select the model entity or plain columns; column
+        queries return their rows as-is, with an extra trailing total column.
+        
+        Args:
+            query: Query selecting the model or a set of its columns
+            skip: Number of records to skip
+            limit: Maximum number of records to return
+            cursor: Cursor from next_cursor() for keyset pagination
+            
+        Returns:
+            Tuple[List[ModelType], int]: Page of records and total count
+            
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        if cursor is not None:
+            items = self.seek(query, cursor).limit(limit).all()
+            return items, query.order_by(None).count()
+        
+        rows = (
+            query.add_columns(func.count().over().label("total"))
+            .offset(skip)
+            .limit(limit)
+            .all()
+        )
+        if rows:
+            if len(query.column_descriptions) > 1:
+                return rows, rows[0].total
+            return [row[0] for row in rows], rows[0].total
+        return [], query.order_by(None).count() if skip else 0
+    
+    def seek(self, query: Union[Query, Select], cursor: Optional[str] = None) -> Union[Query, Select]:
+        """
+        Order a query newest first and start it after a keyset cursor.
+        
+        Args:
+            query: Query or select() statement selecting the model
+            cursor: Cursor from next_cursor(), or None to start at the newest
+            
+        Returns:
+            Union[Query, Select]: Query ordered by (created_at, id) descending
+            
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        if cursor is not None:
+            created_at, id = _decode_cursor(cursor)
+            query = query.filter(tuple_(self.model.created_at, self.model.id) < (created_at, id))
+        return query.order_by(None).order_by(self.model.created_at.desc(), self.model.id.desc())
+    
+    def next_cursor(self, items: List[ModelType], limit: int) -> Optional[str]:
+        """
+        Build the keyset cursor for the page after a full page of records.
+        
+        Args:
+            items: Page of records ordered by (created_at, id) descending
+            limit: Page size that was requested
+            
+        Returns:
+            Optional[str]: Cursor for the next page, None on the last page
+        """
+        if not items or len(items) < limit:
+            return None
+        return _encode_cursor(items[-1].created_at, items[-1].id)
+    
     def create(self, obj_in: CreateSchemaType) -> ModelType:
         """
         Create a new record.
@@ -86,13 +226,53 @@ class BaseRepository(Generic[ModelType]):
         Returns:
             ModelType: Created record
         """
-        obj_data = obj_in.dict()
-        db_obj = self.model(**obj_data)
-        self.db.add(db_obj)
+        return self.insert_returning(schema_values(obj_in))
+    
+    def insert_returning(self, values: Dict[str, Any]) -> ModelType:
+        """
+        Insert a record and load it, server defaults included, in one statement.
+        
+        Uses INSERT ... RETURNING instead of add/commit/refresh, which needs
+        a second SELECT to read back server-generated columns.
+        
+        Args:
+            values: Column values for the new record
+            
+        Returns:
+            ModelType: Created record
+        """
+        db_obj = self.db.scalars(
+            insert(self.model).values(**values).returning(self.model)
+        ).one()
         self.db.commit()
-        self.db.refresh(db_obj)
         return db_obj
     
+    def bulk_insert(self, rows: List[Dict[str, Any]], batch_size: int = 500) -> List[int]:
+        """
+        Insert many records with a single executemany INSERT ... RETURNING.
+        
+        Rows are sent as multi-row INSERT statements of up to batch_size
+        rows each, all committed together.
+        
+        Args:
+            rows: Column values for each new record
+            batch_size: Maximum number of rows per INSERT statement
+            
+        Returns:
+            List[int]: IDs of the created records, in input order
+        """
+        if not rows:
+            return []
+        
+        ids = self.db.scalars(
+            insert(self.model)
+            .returning(self.model.id, sort_by_parameter_order=True)
+            .execution_options(insertmanyvalues_page_size=batch_size),
+            rows
+        ).all()
+        self.db.commit()
+        return list(ids)
+    
     def update(
         self,
         db_obj: ModelType,
@@ -108,13 +288,72 @@ class BaseRepository(Generic[ModelType]):
         Returns:
             ModelType: Updated record
         """
-        obj_data = obj_in.dict(exclude_unset=True)
-        for field, value in obj_data.items():
-            setattr(db_obj, field, value)
+        return self.update_returning(db_obj, schema_values(obj_in, exclude_unset=True))
+    
+    def update_returning(self, db_obj: ModelType, values: Dict[str, Any]) -> ModelType:
+        """
+        Apply column updates to a loaded record with one UPDATE ... RETURNING.
+        
+        The returned row refreshes db_obj in place, server-side onupdate
+        values included, so no follow-up SELECT is needed.
+        
+        Args:
+            db_obj: Existing database object
+            values: Column values to update
+            
+        Returns:
+            ModelType: Updated record
+        """
+        if not values:
+            return db_obj
+        
+        db_obj = self.db.execute(
+            update(self.model)
+            .where(self.model.id == db_obj.id)
+            .values(**values)
+            .returning(self.model)
+            .execution_options(populate_existing=True)
+        ).scalar_one()
+        self.db.commit()
+        return db_obj
+    
+    def _update_values(self, obj_in: UpdateSchemaType) -> Dict[str, Any]:
+        """
+        Build the column values for an update from the fields set on obj_in.
+        
+        Repositories whose update schemas carry values that need converting
+        (string dates, ...) override this.
+        
+        Args:
+            obj_in: Pydantic model with update data
+            
+        Returns:
+            Dict[str, Any]: Column values by name
+        """
+        return schema_values(obj_in, exclude_unset=True)
+    
+    def update_by_id(self, id: int, obj_in: UpdateSchemaType) -> Optional[ModelType]:
+        """
+        Update a record by ID with a single UPDATE ... RETURNING statement.
+        
+        Args:
+            id: Record ID
+            obj_in: Pydantic model with update data
+            
+        Returns:
+            Optional[ModelType]: Updated record, None if not found
+        """
+        obj_data = self._update_values(obj_in)
+        if not obj_data:
+            return self.get(id)
         
-        self.db.add(db_obj)
+        db_obj = self.db.execute(
+            update(self.model)
+            .where(self.model.id == id)
+            .values(**obj_data)
+            .returning(self.model)
+        ).scalar_one_or_none()
         self.db.commit()
-        self.db.refresh(db_obj)
         return db_obj
     
     def delete(self, id: int) -> bool:
@@ -134,6 +373,23 @@ class BaseRepository(Generic[ModelType]):
             return True
         return False
     
+    def delete_by_id(self, id: int) -> bool:
+        """
+        Delete a record by ID with a single DELETE statement.
+        
+        The row is not loaded, so ORM cascades do not run; only use this
+        for models without ORM-managed dependents.
+        
+        Args:
+            id: Record ID
+            
+        Returns:
+            bool: True if deleted, False if not found
+        """
+        result = self.db.execute(delete(self.model).where(self.model.id == id))
+        self.db.commit()
+        return result.rowcount > 0
+    
     def count(self, filters: Optional[Dict[str, Any]] = None) -> int:
         """
         Count records with optional filtering.
@@ -144,17 +400,17 @@ class BaseRepository(Generic[ModelType]):
         Returns:
             int: Number of records
         """
-        query = self.db.query(self.model)
+        stmt = select(func.count()).select_from(self.model)
         
         if filters:
             for key, value in filters.items():
                 if hasattr(self.model, key) and value is not None:
                     if isinstance(value, list):
-                        query = query.filter(getattr(self.model, key).in_(value))
+                        stmt = stmt.where(getattr(self.model, key).in_(value))
                     else:
-                        query = query.filter(getattr(self.model, key) == value)
+                        stmt = stmt.where(getattr(self.model, key) == value)
         
-        return query.count()
+        return self.db.scalar(stmt)
     
     def exists(self, id: int) -> bool:
         """
@@ -166,7 +422,7 @@ class BaseRepository(Generic[ModelType]):
         Returns:
             bool: True if exists, False otherwise
         """
-        return self.db.query(self.model).filter(self.model.id == id).first() is not None
+        return self.db.scalar(select(self.model.id).where(self.model.id == id)) is not None
     
     def search(
         self,
@@ -2,14 +2,50 @@
 Project repository for project-related data access operations.
 """
 
-from typing import Optional, List
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_
+from typing import Optional, List, Tuple, Dict
+from sqlalchemy.orm import Session
+from sqlalchemy.engine import Row
+from sqlalchemy import and_, select, bindparam, func, cast, literal, union_all, String
 
 from .base import BaseRepository
-from ..models.project import Project
+from ..models.project import Project, ProjectStatus
+from ..models.task import Task, TaskStatus
 from ..schemas.project import ProjectCreate, ProjectUpdate
+from ..utils.dates import parse_flexible_date
 
+# Statuses counted as active; both fall inside the ix_projects_active partial index
+_ACTIVE_STATUSES = [ProjectStatus.PLANNING, ProjectStatus.IN_PROGRESS]
+
+# Columns needed to render a ProjectResponse, selected without building entities
+_PROJECT_LIST_COLUMNS = (
+    Project.id,
+    Project.name,
+    Project.description,
+    Project.owner_id,
+    Project.workflow_id,
+    Project.status,
+    Project.start_date,
+    Project.end_date,
+    Project.created_at,
+    Project.updated_at,
+    Project.task_count.label("task_count"),
+    Project.completed_task_count.label("completed_task_count"),
+    Project.progress_percentage.label("progress_percentage"),
+    Project.status.notin_([ProjectStatus.COMPLETED, ProjectStatus.CANCELLED]).label("is_active"),
+)
+
+# Task and project statuses are different enum types, so the activity union
+# reads them as their stored member names and maps those back to values
+_ACTIVITY_STATUS_VALUES = {
+    "task": {member.name: member.value for member in TaskStatus},
+    "project": {member.name: member.value for member in ProjectStatus},
+}
+
+# Ownership-checked lookup used by most project and task routes
+_STMT_GET_FOR_OWNER = select(Project).where(
+    Project.id == bindparam("id"),
+    Project.owner_id == bindparam("owner_id")
+)
 
 class ProjectRepository(BaseRepository[Project]):
     """
@@ -19,22 +55,104 @@ class ProjectRepository(BaseRepository[Project]):
     def __init__(self, db: Session):
         super().__init__(db, Project)
     
-    def get(self, id: int) -> Optional[Project]:
+    def get_for_owner(self, id: int, owner_id: int) -> Optional[Project]:
         """
-        Get project by ID with tasks loaded.
+        Get project by ID only if it belongs to the given owner.
         
         Args:
             id: Project ID
+            owner_id: Owner user ID
             
         Returns:
-            Optional[Project]: Project if found, None otherwise
+            Optional[Project]: Project if found and owned, None otherwise
         """
-        return (
-            self.db.query(Project)
-            .options(joinedload(Project.tasks))
+        return self.db.scalars(
+            _STMT_GET_FOR_OWNER,
+            {"id": id, "owner_id": owner_id}
+        ).first()
+    
+    def get_progress(self, id: int) -> Optional[dict]:
+        """
+        Get a project's task counters without loading its tasks.
+        
+        Args:
+            id: Project ID
+            
+        Returns:
+            Optional[dict]: Project name and task counters, None if not found
+        """
+        row = (
+            self.db.query(
+                Project.name,
+                Project.progress_percentage.label("progress"),
+                Project.tasks_total,
+                Project.tasks_completed,
+                Project.tasks_active
+            )
             .filter(Project.id == id)
             .first()
         )
+        if row is None:
+            return None
+        
+        return {
+            "project_name": row.name,
+            "progress_percentage": round(float(row.progress), 1),
+            "total_tasks": row.tasks_total,
+            "completed_tasks": row.tasks_completed,
+            "active_tasks": row.tasks_active
+        }
+    
+    def get_recent_activity(self, user_id: int, limit: int = 10) -> List[dict]:
+        """
+        Get the most recently updated tasks and projects of a user's projects.
+        
+        Both sources are merged, ordered and limited in one query.
+        
+        Args:
+            user_id: Owner user ID
+            limit: Maximum number of entries to return
+            
+        Returns:
+            List[dict]: Entries with type, id, title, status and updated_at,
+            newest first
+        """
+        tasks = (
+            select(
+                literal("task").label("type"),
+                Task.id,
+                Task.title,
+                cast(Task.status, String).label("status"),
+                Task.updated_at
+            )
+            .join(Task.project)
+            .where(Project.owner_id == user_id)
+        )
+        projects = (
+            select(
+                literal("project").label("type"),
+                Project.id,
+                Project.name.label("title"),
+                cast(Project.status, String).label("status"),
+                Project.updated_at
+            )
+            .where(Project.owner_id == user_id)
+        )
+        activity = union_all(tasks, projects).subquery()
+        rows = self.db.execute(
+            select(activity).order_by(activity.c.updated_at.desc()).limit(limit)
+        ).all()
+        
+        return [
+            {
+                "type": row.type,
+                "id": row.id,
+                "title": row.title,
+                "status": _ACTIVITY_STATUS_VALUES[row.type][row.status],
+                "updated_at": row.updated_at
+            }
+            for row in rows
+        ]
     
     def get_user_projects(
         self,
@@ -55,7 +173,6 @@ class ProjectRepository(BaseRepository[Project]):
         """
         return (
             self.db.query(Project)
-            .options(joinedload(Project.tasks))
             .filter(Project.owner_id == user_id)
             .order_by(Project.created_at.desc())
             .offset(skip)
@@ -63,6 +180,61 @@ class ProjectRepository(BaseRepository[Project]):
             .all()
         )
     
+    def get_user_projects_with_total(
+        self,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Project], int]:
+        """
+        Get a page of projects owned by a user with the total count.
+        
+        Args:
+            user_id: User ID
+            skip: Number of records to skip
+            limit: Maximum number of records to return
+            cursor: Keyset cursor; when given, skip is ignored
+            
+        Returns:
+            Tuple[List[Project], int]: Page of projects and total count
+        """
+        query = (
+            self.db.query(Project)
+            .filter(Project.owner_id == user_id)
+            .order_by(Project.created_at.desc(), Project.id.desc())
+        )
+        return self.paginate(query, skip, limit, cursor)
+    
+    def get_user_project_rows_with_total(
+        self,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Row], int]:
+        """
+        Get a page of a user's projects as plain column rows with the total count.
+        
+        Read-only listings use this instead of get_user_projects_with_total
+        to skip ORM entity construction and identity-map bookkeeping.
+        
+        Args:
+            user_id: User ID
+            skip: Number of records to skip
+            limit: Maximum number of records to return
+            cursor: Keyset cursor; when given, skip is ignored
+            
+        Returns:
+            Tuple[List[Row], int]: Page of project rows and total count
+        """
+        query = (
+            self.db.query(*_PROJECT_LIST_COLUMNS)
+            .filter(Project.owner_id == user_id)
+            .order_by(Project.created_at.desc(), Project.id.desc())
+        )
+        return self.paginate(query, skip, limit, cursor)
+    
     def count_user_projects(self, user_id: int) -> int:
         """
         Count projects owned by a specific user.
@@ -73,10 +245,42 @@ class ProjectRepository(BaseRepository[Project]):
         Returns:
             int: Number of user's projects
         """
-        return (
-            self.db.query(Project)
+        return self.db.scalar(
+            select(func.count()).select_from(Project).where(Project.owner_id == user_id)
+        )
+    
+    def count_by_status(self, user_id: int) -> Dict[ProjectStatus, int]:
+        """
+        Count a user's projects per status in a single grouped query.
+        
+        Args:
+            user_id: User ID
+            
+        Returns:
+            Dict[ProjectStatus, int]: Number of projects for each status present
+        """
+        return dict(
+            self.db.query(Project.status, func.count(Project.id))
             .filter(Project.owner_id == user_id)
-            .count()
+            .group_by(Project.status)
+            .all()
+        )
+    
+    def count_owned(self, ids: List[int], owner_id: int) -> int:
+        """
+        Count how many of the given projects belong to an owner.
+        
+        Args:
+            ids: Project IDs
+            owner_id: Owner user ID
+            
+        Returns:
+            int: Number of the projects owned by the user
+        """
+        return self.db.scalar(
+            select(func.count())
+            .select_from(Project)
+            .where(Project.id.in_(ids), Project.owner_id == owner_id)
         )
     
     def get_active_projects(self, user_id: int) -> List[Project]:
@@ -91,11 +295,10 @@ class ProjectRepository(BaseRepository[Project]):
         """
         return (
             self.db.query(Project)
-            .options(joinedload(Project.tasks))
             .filter(
                 and_(
                     Project.owner_id == user_id,
-                    Project.status.in_(["planning", "in_progress"])
+                    Project.status.in_(_ACTIVE_STATUSES)
                 )
             )
             .order_by(Project.created_at.desc())
@@ -119,7 +322,6 @@ class ProjectRepository(BaseRepository[Project]):
         """
         return (
             self.db.query(Project)
-            .options(joinedload(Project.tasks))
             .filter(
                 and_(
                     Project.owner_id == user_id,
@@ -151,7 +353,6 @@ class ProjectRepository(BaseRepository[Project]):
         """
         return (
             self.db.query(Project)
-            .options(joinedload(Project.tasks))
             .filter(
                 and_(
                     Project.owner_id == user_id,
@@ -179,39 +380,36 @@ class ProjectRepository(BaseRepository[Project]):
         Returns:
             Project: Created project
         """
-        from datetime import datetime
+        return self.insert_returning(self._project_values(project_data, owner_id))
+    
+    def bulk_create(self, projects_data: List[ProjectCreate], owner_id: int) -> List[int]:
+        """
+        Create many projects for an owner in one round trip.
         
-        project_dict = project_data.dict()
+        Args:
+            projects_data: Project creation data for each project
+            owner_id: Owner user ID
+            
+        Returns:
+            List[int]: IDs of the created projects, in input order
+        """
+        return self.bulk_insert([
+            self._project_values(project_data, owner_id) for project_data in projects_data
+        ])
+    
+    def _project_values(self, project_data: ProjectCreate, owner_id: int) -> dict:
+        """Build the column values for a new project."""
+        project_dict = project_data.model_dump()
         project_dict["owner_id"] = owner_id
         
         # Convert string dates to datetime objects
         if project_dict.get("start_date") and isinstance(project_dict["start_date"], str):
-            try:
-                # Handle both YYYY-MM-DD and ISO format
-                date_str = project_dict["start_date"]
-                if len(date_str) == 10:  # YYYY-MM-DD format
-                    project_dict["start_date"] = datetime.strptime(date_str, "%Y-%m-%d")
-                else:  # ISO format
-                    project_dict["start_date"] = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-            except ValueError:
-                project_dict["start_date"] = None
+            project_dict["start_date"] = parse_flexible_date(project_dict["start_date"])
         
         if project_dict.get("end_date") and isinstance(project_dict["end_date"], str):
-            try:
-                # Handle both YYYY-MM-DD and ISO format
-                date_str = project_dict["end_date"]
-                if len(date_str) == 10:  # YYYY-MM-DD format
-                    project_dict["end_date"] = datetime.strptime(date_str, "%Y-%m-%d")
-                else:  # ISO format
-                    project_dict["end_date"] = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-            except ValueError:
-                project_dict["end_date"] = None
+            project_dict["end_date"] = parse_flexible_date(project_dict["end_date"])
         
-        db_project = Project(**project_dict)
-        self.db.add(db_project)
-        self.db.commit()
-        self.db.refresh(db_project)
-        return db_project
+        return project_dict
     
     def get_project_statistics(self, user_id: int) -> dict:
         """
@@ -223,44 +421,14 @@ class ProjectRepository(BaseRepository[Project]):
         Returns:
             dict: Project statistics
         """
-        total_projects = self.count_user_projects(user_id)
-        
-        active_projects = (
-            self.db.query(Project)
-            .filter(
-                and_(
-                    Project.owner_id == user_id,
-                    Project.status.in_(["planning", "in_progress"])
-                )
-            )
-            .count()
-        )
-        
-        completed_projects = (
-            self.db.query(Project)
-            .filter(
-                and_(
-                    Project.owner_id == user_id,
-                    Project.status == "completed"
-                )
-            )
-            .count()
-        )
-        
-        projects_by_status = {}
-        status_counts = (
-            self.db.query(Project.status, self.db.func.count(Project.id))
-            .filter(Project.owner_id == user_id)
-            .group_by(Project.status)
-            .all()
-        )
-        
-        for status, count in status_counts:
-            projects_by_status[status] = count
+        # Totals are derived from one grouped query rather than separate COUNTs
+        projects_by_status = self.count_by_status(user_id)
+        total_projects = sum(projects_by_status.values())
+        active_projects = sum(projects_by_status.get(status, 0) for status in _ACTIVE_STATUSES)
+        completed_projects = projects_by_status.get(ProjectStatus.COMPLETED, 0)
         
         recent_projects = (
             self.db.query(Project)
-            .options(joinedload(Project.tasks))
             .filter(Project.owner_id == user_id)
             .order_by(Project.created_at.desc())
             .limit(5)
@@ -286,14 +454,12 @@ class ProjectRepository(BaseRepository[Project]):
         Returns:
             List[Project]: List of all projects
         """
-        return (
-            self.db.query(Project)
-            .options(joinedload(Project.tasks))
+        return self.db.scalars(
+            select(Project)
             .order_by(Project.created_at.desc())
             .offset(skip)
             .limit(limit)
-            .all()
-        )
+        ).all()
     
     def count(self) -> int:
         """
@@ -302,7 +468,7 @@ class ProjectRepository(BaseRepository[Project]):
         Returns:
             int: Total number of projects
         """
-        return self.db.query(Project).count()
+        return self.db.scalar(select(func.count()).select_from(Project))
     
     def count_active(self) -> int:
         """
@@ -311,10 +477,10 @@ class ProjectRepository(BaseRepository[Project]):
         Returns:
             int: Number of active projects
         """
-        return (
-            self.db.query(Project)
-            .filter(Project.status.in_(["planning", "in_progress"]))
-            .count()
+        return self.db.scalar(
+            select(func.count())
+            .select_from(Project)
+            .where(Project.status.in_(_ACTIVE_STATUSES))
         )
     
     def update_project(
@@ -332,37 +498,13 @@ class ProjectRepository(BaseRepository[Project]):
         Returns:
             Project: Updated project
         """
-        from datetime import datetime
-        
-        update_dict = project_update.dict(exclude_unset=True)
+        update_dict = project_update.model_dump(exclude_unset=True)
         
         # Convert string dates to datetime objects
         if update_dict.get("start_date") and isinstance(update_dict["start_date"], str):
-            try:
-                # Handle both YYYY-MM-DD and ISO format
-                date_str = update_dict["start_date"]
-                if len(date_str) == 10:  # YYYY-MM-DD format
-                    update_dict["start_date"] = datetime.strptime(date_str, "%Y-%m-%d")
-                else:  # ISO format
-                    update_dict["start_date"] = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-            except ValueError:
-                update_dict["start_date"] = None
+            update_dict["start_date"] = parse_flexible_date(update_dict["start_date"])
         
         if update_dict.get("end_date") and isinstance(update_dict["end_date"], str):
-            try:
-                # Handle both YYYY-MM-DD and ISO format
-                date_str = update_dict["end_date"]
-                if len(date_str) == 10:  # YYYY-MM-DD format
-                    update_dict["end_date"] = datetime.strptime(date_str, "%Y-%m-%d")
-                else:  # ISO format
-                    update_dict["end_date"] = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-            except ValueError:
-                update_dict["end_date"] = None
-        
-        # Update project attributes
-        for key, value in update_dict.items():
-            setattr(project, key, value)
+            update_dict["end_date"] = parse_flexible_date(update_dict["end_date"])
         
-        self.db.commit()
-        self.db.refresh(project)
-        return project 
\ No newline at end of file
+        return self.update_returning(project, update_dict) 
\ No newline at end of file
@@ -2,13 +2,33 @@
 Task repository for task-related data access operations.
 """
 
-from typing import Optional, List
+from typing import Optional, List, Tuple, Iterator
+from datetime import datetime, timezone
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_
+from sqlalchemy import and_, func, select, tuple_
 
 from .base import BaseRepository
-from ..models.task import Task
+from ..models.project import Project
+from ..models.task import Task, TaskStatus
+from ..models.user import User
 from ..schemas.task import TaskCreate, TaskUpdate
+from ..utils.dates import parse_flexible_date
+
+_OPEN_STATUSES = [TaskStatus.TODO, TaskStatus.IN_PROGRESS, TaskStatus.REVIEW]
+
+# Columns for the recent-tasks slice of the statistics, read as plain rows
+_RECENT_TASK_COLUMNS = (
+    Task.id,
+    Task.title,
+    Task.project_id,
+    Task.assignee_id,
+    Task.status,
+    Task.priority,
+    Task.due_date,
+    Task.created_at,
+    Project.name.label("project_name"),
+    User.full_name.label("assignee_name"),
+)
 
 
 class TaskRepository(BaseRepository[Task]):
@@ -40,7 +60,8 @@ class TaskRepository(BaseRepository[Task]):
         self,
         user_id: int,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        created_since: Optional[datetime] = None
     ) -> List[Task]:
         """
         Get tasks from projects owned by a specific user.
@@ -49,21 +70,55 @@ class TaskRepository(BaseRepository[Task]):
             user_id: User ID
             skip: Number of records to skip
             limit: Maximum number of records to return
+            created_since: Only include tasks created at or after this time
             
         Returns:
             List[Task]: List of user's tasks
         """
-        return (
+        query = (
             self.db.query(Task)
             .options(joinedload(Task.project), joinedload(Task.assignee))
             .join(Task.project)
-            .filter(Task.project.has(owner_id=user_id))
+            .filter(Project.owner_id == user_id)
+        )
+        if created_since is not None:
+            query = query.filter(Task.created_at >= created_since)
+        return (
+            query
             .order_by(Task.created_at.desc())
             .offset(skip)
             .limit(limit)
             .all()
         )
     
+    def get_user_tasks_with_total(
+        self,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Task], int]:
+        """
+        Get a page of tasks from a user's projects with the total count.
+        
+        Args:
+            user_id: User ID
+            skip: Number of records to skip
+            limit: Maximum number of records to return
+            cursor: Keyset cursor; when given, skip is ignored
+            
+        Returns:
+            Tuple[List[Task], int]: Page of tasks and total count
+        """
+        query = (
+            self.db.query(Task)
+            .options(joinedload(Task.project), joinedload(Task.assignee))
+            .join(Task.project)
+            .filter(Project.owner_id == user_id)
+            .order_by(Task.created_at.desc(), Task.id.desc())
+        )
+        return self.paginate(query, skip, limit, cursor)
+    
     def count_user_tasks(self, user_id: int) -> int:
         """
         Count tasks from projects owned by a specific user.
@@ -74,11 +129,11 @@ class TaskRepository(BaseRepository[Task]):
         Returns:
             int: Number of user's tasks
         """
-        return (
-            self.db.query(Task)
+        return self.db.scalar(
+            select(func.count())
+            .select_from(Task)
             .join(Task.project)
-            .filter(Task.project.has(owner_id=user_id))
-            .count()
+            .where(Project.owner_id == user_id)
         )
     
     def get_assigned_tasks(
@@ -108,6 +163,33 @@ class TaskRepository(BaseRepository[Task]):
             .all()
         )
     
+    def get_assigned_tasks_with_total(
+        self,
+        assignee_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Task], int]:
+        """
+        Get a page of tasks assigned to a user with the total count.
+        
+        Args:
+            assignee_id: Assignee user ID
+            skip: Number of records to skip
+            limit: Maximum number of records to return
+            cursor: Keyset cursor; when given, skip is ignored
+            
+        Returns:
+            Tuple[List[Task], int]: Page of tasks and total count
+        """
+        query = (
+            self.db.query(Task)
+            .options(joinedload(Task.project), joinedload(Task.assignee))
+            .filter(Task.assignee_id == assignee_id)
+            .order_by(Task.created_at.desc(), Task.id.desc())
+        )
+        return self.paginate(query, skip, limit, cursor)
+    
     def count_assigned_tasks(self, assignee_id: int) -> int:
         """
         Count tasks assigned to a specific user.
@@ -118,10 +200,8 @@ class TaskRepository(BaseRepository[Task]):
         Returns:
             int: Number of assigned tasks
         """
-        return (
-            self.db.query(Task)
-            .filter(Task.assignee_id == assignee_id)
-            .count()
+        return self.db.scalar(
+            select(func.count()).select_from(Task).where(Task.assignee_id == assignee_id)
         )
     
     def get_project_tasks(
@@ -172,7 +252,7 @@ class TaskRepository(BaseRepository[Task]):
             .join(Task.project)
             .filter(
                 and_(
-                    Task.project.has(owner_id=user_id),
+                    Project.owner_id == user_id,
                     Task.status == status
                 )
             )
@@ -190,8 +270,6 @@ class TaskRepository(BaseRepository[Task]):
         Returns:
             List[Task]: List of overdue tasks
         """
-        from datetime import datetime, timezone
-        
         # Use timezone-aware datetime for comparison
         now = datetime.now(timezone.utc)
         
@@ -201,7 +279,7 @@ class TaskRepository(BaseRepository[Task]):
             .join(Task.project)
             .filter(
                 and_(
-                    Task.project.has(owner_id=user_id),
+                    Project.owner_id == user_id,
                     Task.due_date < now,
                     Task.status.in_(["todo", "in_progress", "review"])
                 )
@@ -210,6 +288,38 @@ class TaskRepository(BaseRepository[Task]):
             .all()
         )
     
+    def get_upcoming_deadlines(
+        self,
+        user_id: int,
+        start: datetime,
+        end: datetime,
+        limit: int = 5
+    ) -> list:
+        """
+        Get the soonest-due incomplete tasks due in a window for a specific user.
+        
+        Args:
+            user_id: User ID
+            start: Earliest due date to include
+            end: Due dates must be before this time
+            limit: Maximum number of tasks to return
+            
+        Returns:
+            list: Rows of task id, title, due date and project name
+        """
+        return self.db.execute(
+            select(Task.id, Task.title, Task.due_date, Project.name.label("project_name"))
+            .join(Task.project)
+            .where(
+                Project.owner_id == user_id,
+                Task.status != TaskStatus.COMPLETED,
+                Task.due_date >= start,
+                Task.due_date < end
+            )
+            .order_by(Task.due_date.asc())
+            .limit(limit)
+        ).all()
+    
     def search_tasks(
         self,
         user_id: int,
@@ -235,7 +345,7 @@ class TaskRepository(BaseRepository[Task]):
             .join(Task.project)
             .filter(
                 and_(
-                    Task.project.has(owner_id=user_id),
+                    Project.owner_id == user_id,
                     Task.title.ilike(f"%{search_term}%")
                 )
             )
@@ -260,34 +370,50 @@ class TaskRepository(BaseRepository[Task]):
         Returns:
             Task: Created task
         """
-        from datetime import datetime
+        db_task = self.insert_returning(self._task_values(task_data))
+        
+        # Return task with relationships loaded
+        return self.get(db_task.id)
+    
+    def bulk_create(self, tasks_data: List[TaskCreate]) -> List[int]:
+        """
+        Create many tasks in one round trip.
         
-        task_dict = task_data.dict()
+        Args:
+            tasks_data: Task creation data for each task
+            
+        Returns:
+            List[int]: IDs of the created tasks, in input order
+        """
+        return self.bulk_insert([self._task_values(task_data) for task_data in tasks_data])
+    
+    def _task_values(self, task_data: TaskCreate) -> dict:
+        """Build the column values for a new task."""
+        task_dict = task_data.model_dump()
         
         # Convert string dates to datetime objects
         if task_dict.get("due_date") and isinstance(task_dict["due_date"], str):
-            try:
-                # Handle both YYYY-MM-DD and ISO format
-                date_str = task_dict["due_date"]
-                if len(date_str) == 10:  # YYYY-MM-DD format
-                    task_dict["due_date"] = datetime.strptime(date_str, "%Y-%m-%d")
-                else:  # ISO format
-                    task_dict["due_date"] = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-            except ValueError:
-                task_dict["due_date"] = None
-        
-        db_task = Task(**task_dict)
-        self.db.add(db_task)
-        self.db.commit()
-        self.db.refresh(db_task)
+            task_dict["due_date"] = parse_flexible_date(task_dict["due_date"])
         
-        # Return task with relationships loaded
-        return self.get(db_task.id)
+        return task_dict
+    
+    def _update_values(self, task_update: TaskUpdate) -> dict:
+        """Build the column values for a task update, parsing the due date."""
+        update_dict = task_update.model_dump(exclude_unset=True)
+        
+        # Convert string dates to datetime objects; an empty string clears the date
+        if isinstance(update_dict.get("due_date"), str):
+            update_dict["due_date"] = parse_flexible_date(update_dict["due_date"])
+        
+        return update_dict
     
     def update(self, task: Task, task_update: TaskUpdate) -> Task:
         """
         Update a task with relationships loaded.
         
+        Relationships loaded with the task stay loaded; only those whose
+        foreign key changed are expired and lazily reloaded on access.
+        
         Args:
             task: Task to update
             task_update: Update data
@@ -295,51 +421,55 @@ class TaskRepository(BaseRepository[Task]):
         Returns:
             Task: Updated task with relationships loaded
         """
-        from datetime import datetime
-        
-        update_dict = task_update.dict(exclude_unset=True)
-        
-        # Convert string dates to datetime objects
-        if update_dict.get("due_date") and isinstance(update_dict["due_date"], str):
-            try:
-                # Handle both YYYY-MM-DD and ISO format
-                date_str = update_dict["due_date"]
-                if len(date_str) == 10:  # YYYY-MM-DD format
-                    update_dict["due_date"] = datetime.strptime(date_str, "%Y-%m-%d")
-                else:  # ISO format
-                    update_dict["due_date"] = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-            except ValueError:
-                update_dict["due_date"] = None
-        
-        # Update task attributes
-        for key, value in update_dict.items():
-            setattr(task, key, value)
-        
-        self.db.commit()
-        self.db.refresh(task)
-        
-        # Reload with relationships
-        return self.get(task.id)
+        update_dict = self._update_values(task_update)
+        task = self.update_returning(task, update_dict)
+        
+        stale = [
+            relationship
+            for key, relationship in (("project_id", "project"), ("assignee_id", "assignee"))
+            if key in update_dict
+        ]
+        if stale:
+            self.db.expire(task, stale)
+        return task
     
-    def get_all(self, skip: int = 0, limit: int = 100) -> List[Task]:
+    def get_all(self, skip: int = 0, limit: int = 100, cursor: Optional[str] = None) -> List[Task]:
         """
-        Get all tasks.
+        Get all tasks, newest first.
+        
+        Pass the cursor from next_cursor() to fetch the following page by
+        keyset instead of offset; skip is ignored in that case.
         
         Args:
             skip: Number of records to skip
             limit: Maximum number of records to return
+            cursor: Cursor from next_cursor() for keyset pagination
             
         Returns:
             List[Task]: List of all tasks
+            
+        Raises:
+            ValueError: If the cursor is malformed
         """
-        return (
-            self.db.query(Task)
-            .options(joinedload(Task.project), joinedload(Task.assignee))
-            .order_by(Task.created_at.desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
+        stmt = self.seek(
+            select(Task).options(joinedload(Task.project), joinedload(Task.assignee)),
+            cursor
         )
+        if cursor is None:
+            stmt = stmt.offset(skip)
+        return self.db.scalars(stmt.limit(limit)).all()
+    
+    def counts(self) -> Tuple[int, int]:
+        """
+        Count total and completed tasks in one query, memoized for the session.
+        
+        Returns:
+            Tuple[int, int]: Total number of tasks and number of completed tasks
+        """
+        return self.memoize("task_counts", lambda: tuple(self.db.execute(
+            select(func.count(), func.count().filter(Task.status == TaskStatus.COMPLETED))
+            .select_from(Task)
+        ).one()))
     
     def count(self) -> int:
         """
@@ -348,7 +478,7 @@ class TaskRepository(BaseRepository[Task]):
         Returns:
             int: Total number of tasks
         """
-        return self.db.query(Task).count()
+        return self.counts()[0]
     
     def count_completed(self) -> int:
         """
@@ -357,76 +487,200 @@ class TaskRepository(BaseRepository[Task]):
         Returns:
             int: Number of completed tasks
         """
-        return (
-            self.db.query(Task)
-            .filter(Task.status == "completed")
-            .count()
-        )
+        return self.counts()[1]
     
-    def get_task_statistics(self, user_id: int) -> dict:
+    def count_by_status(self, project_id: Optional[int] = None) -> List[Tuple[str, int]]:
         """
-        Get task statistics for a user.
+        Count tasks grouped by status.
         
         Args:
-            user_id: User ID
+            project_id: Optional project ID filter
             
         Returns:
-            dict: Task statistics
+            List[Tuple[str, int]]: (status, count) pairs, one per distinct status
+        """
+        query = self.db.query(Task.status, func.count(Task.id))
+        if project_id is not None:
+            query = query.filter(Task.project_id == project_id)
+        return query.group_by(Task.status).all()
+    
+    def count_by_priority(self, project_id: Optional[int] = None) -> List[Tuple[str, int]]:
         """
-        total_tasks = self.count_user_tasks(user_id)
+        Count tasks grouped by priority.
         
-        completed_tasks = (
-            self.db.query(Task)
+        Args:
+            project_id: Optional project ID filter
+            
+        Returns:
+            List[Tuple[str, int]]: (priority, count) pairs, one per distinct priority
+        """
+        query = self.db.query(Task.priority, func.count(Task.id))
+        if project_id is not None:
+            query = query.filter(Task.project_id == project_id)
+        return query.group_by(Task.priority).all()
+    
+    def count_completed_by_day(self, owner_id: int, since: datetime) -> List[Tuple[str, int]]:
+        """
+        Count completed tasks per day in a user's projects.
+        
+        Tasks have no completion timestamp, so the last update of a
+        completed task is used as its completion date.
+        
+        Args:
+            owner_id: Project owner ID
+            since: Only count tasks updated at or after this time
+            
+        Returns:
+            List[Tuple[str, int]]: (date, count) pairs for days with completions
+        """
+        day = func.date(Task.updated_at)
+        return (
+            self.db.query(day, func.count(Task.id))
             .join(Task.project)
             .filter(
                 and_(
-                    Task.project.has(owner_id=user_id),
-                    Task.status == "completed"
+                    Project.owner_id == owner_id,
+                    Task.status == TaskStatus.COMPLETED,
+                    Task.updated_at >= since
                 )
             )
-            .count()
+            .group_by(day)
+            .all()
         )
+    
+    def count_by_owner(self, owner_ids: List[int]) -> List[Tuple[int, str, int, int]]:
+        """
+        Count total and completed tasks per project owner in one query.
         
-        overdue_tasks = len(self.get_overdue_tasks(user_id))
+        Users without projects or tasks are included with zero counts.
         
-        tasks_by_status = {}
-        status_counts = (
-            self.db.query(Task.status, self.db.func.count(Task.id))
-            .join(Task.project)
-            .filter(Task.project.has(owner_id=user_id))
-            .group_by(Task.status)
-            .all()
-        )
+        Args:
+            owner_ids: Project owner user IDs
+            
+        Returns:
+            List[Tuple[int, str, int, int]]: (user_id, full_name, total, completed)
+            rows, one per existing user
+        """
+        if not owner_ids:
+            return []
+        return self.db.execute(
+            select(
+                User.id,
+                User.full_name,
+                func.count(Task.id),
+                func.count(Task.id).filter(Task.status == TaskStatus.COMPLETED)
+            )
+            .outerjoin(Project, Project.owner_id == User.id)
+            .outerjoin(Task, Task.project_id == Project.id)
+            .where(User.id.in_(owner_ids))
+            .group_by(User.id)
+        ).all()
+    
+    def iter_counts_per_owner(self, batch_size: int = 500) -> Iterator[Tuple[int, str, int, int]]:
+        """
+        Count total and completed tasks for every active user's projects.
         
-        for status, count in status_counts:
-            tasks_by_status[status] = count
+        One grouped query covers all users; rows are streamed in batches,
+        newest users first.
         
-        tasks_by_priority = {}
-        priority_counts = (
-            self.db.query(Task.priority, self.db.func.count(Task.id))
-            .join(Task.project)
-            .filter(Task.project.has(owner_id=user_id))
-            .group_by(Task.priority)
-            .all()
+        Args:
+            batch_size: Number of rows fetched per round-trip
+            
+        Returns:
+            Iterator[Tuple[int, str, int, int]]: (user_id, full_name, total,
+            completed) rows
+        """
+        return self.db.execute(
+            select(
+                User.id,
+                User.full_name,
+                func.count(Task.id),
+                func.count(Task.id).filter(Task.status == TaskStatus.COMPLETED)
+            )
+            .outerjoin(Project, Project.owner_id == User.id)
+            .outerjoin(Task, Task.project_id == Project.id)
+            .where(User.is_active == True)
+            .group_by(User.id)
+            .order_by(User.created_at.desc(), User.id.desc())
+            .execution_options(yield_per=batch_size)
         )
+    
+    def get_task_statistics(self, user_id: int) -> dict:
+        """
+        Get task statistics for a user, memoized for the session.
+        
+        Args:
+            user_id: User ID
+            
+        Returns:
+            dict: Task statistics
+        """
+        return self.memoize(("task_stats", user_id), lambda: self._compute_task_statistics(user_id))
+    
+    def get_task_counts(self, user_id: Optional[int] = None) -> dict:
+        """
+        Count a user's tasks overall and by status and priority, memoized for the session.
         
-        for priority, count in priority_counts:
-            tasks_by_priority[priority] = count
+        Overdue tasks are open tasks past their due date, counted in the
+        same aggregate rather than by loading them.
         
-        recent_tasks = (
-            self.db.query(Task)
-            .join(Task.project)
-            .filter(Task.project.has(owner_id=user_id))
-            .order_by(Task.created_at.desc())
-            .limit(5)
-            .all()
+        Args:
+            user_id: Owner of the tasks' projects, or None for all tasks
+            
+        Returns:
+            dict: Total, completed and overdue counts and per-status and
+            per-priority counts
+        """
+        return self.memoize(("task_counts", user_id), lambda: self._compute_task_counts(user_id))
+    
+    def _compute_task_counts(self, user_id: Optional[int]) -> dict:
+        """Run the task count aggregate for a user, or for all tasks."""
+        # One pass over the tasks: GROUPING SETS yields a row per status, a
+        # row per priority and a grand-total row. status and priority are
+        # NOT NULL, so a NULL marks the set a row belongs to.
+        now = datetime.now(timezone.utc)
+        query = select(
+            Task.status,
+            Task.priority,
+            func.count(),
+            func.count().filter(Task.status == TaskStatus.COMPLETED),
+            func.count().filter(and_(Task.due_date < now, Task.status.in_(_OPEN_STATUSES)))
         )
+        if user_id is not None:
+            query = query.join(Task.project).where(Project.owner_id == user_id)
+        rows = self.db.execute(
+            query.group_by(func.grouping_sets(tuple_(Task.status), tuple_(Task.priority), tuple_()))
+        ).all()
+        
+        total_tasks = completed_tasks = overdue_tasks = 0
+        tasks_by_status = {}
+        tasks_by_priority = {}
+        for status, priority, count, completed, overdue in rows:
+            if status is not None:
+                tasks_by_status[status] = count
+            elif priority is not None:
+                tasks_by_priority[priority] = count
+            else:
+                total_tasks, completed_tasks, overdue_tasks = count, completed, overdue
         
         return {
             "total_tasks": total_tasks,
             "completed_tasks": completed_tasks,
             "overdue_tasks": overdue_tasks,
             "tasks_by_status": tasks_by_status,
-            "tasks_by_priority": tasks_by_priority,
-            "recent_tasks": recent_tasks
-        } 
\ No newline at end of file
+            "tasks_by_priority": tasks_by_priority
+        }
+    
+    def _compute_task_statistics(self, user_id: int) -> dict:
+        """Run the task statistics queries for a user."""
+        # Rows with just the listed fields; no entities are built for them
+        recent_tasks = self.db.execute(
+            select(*_RECENT_TASK_COLUMNS)
+            .join(Task.project)
+            .outerjoin(Task.assignee)
+            .where(Project.owner_id == user_id)
+            .order_by(Task.created_at.desc())
+            .limit(5)
+        ).all()
+        
+        return {**self.get_task_counts(user_id), "recent_tasks": recent_tasks} 
\ No newline at end of file
@@ -2,14 +2,18 @@
 User repository for user-related data access operations.
 """
 
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, or_, select, bindparam
 
 from .base import BaseRepository
 from ..models.user import User
 from ..schemas.user import UserCreate, UserUpdate
+from ..utils.security import get_password_hash
 
+# Login and signup lookups, built once and bound per call
+_STMT_GET_BY_EMAIL = select(User).where(User.email == bindparam("email"))
+_STMT_GET_BY_USERNAME = select(User).where(User.username == bindparam("username"))
 
 class UserRepository(BaseRepository[User]):
     """
@@ -29,7 +33,7 @@ class UserRepository(BaseRepository[User]):
         Returns:
             Optional[User]: User if found, None otherwise
         """
-        return self.db.query(User).filter(User.email == email).first()
+        return self.db.scalars(_STMT_GET_BY_EMAIL, {"email": email}).first()
     
     def get_by_username(self, username: str) -> Optional[User]:
         """
@@ -41,7 +45,30 @@ class UserRepository(BaseRepository[User]):
         Returns:
             Optional[User]: User if found, None otherwise
         """
-        return self.db.query(User).filter(User.username == username).first()
+        return self.db.scalars(_STMT_GET_BY_USERNAME, {"username": username}).first()
+    
+    def email_or_username_taken(self, email: str, username: str) -> Tuple[bool, bool]:
+        """
+        Check whether an email or username is already registered.
+        
+        Both checks run in a single query without loading User rows.
+        
+        Args:
+            email: User email
+            username: User username
+            
+        Returns:
+            Tuple[bool, bool]: (email taken, username taken)
+        """
+        rows = self.db.execute(
+            select(User.email, User.username)
+            .where(or_(User.email == email, User.username == username))
+            .limit(2)
+        ).all()
+        
+        email_taken = any(row.email == email for row in rows)
+        username_taken = any(row.username == username for row in rows)
+        return email_taken, username_taken
     
     def create_user(self, user_data: UserCreate, hashed_password: str = None) -> User:
         """
@@ -54,9 +81,7 @@ class UserRepository(BaseRepository[User]):
         Returns:
             User: Created user
         """
-        from ..utils.security import get_password_hash
-        
-        user_dict = user_data.dict()
+        user_dict = user_data.model_dump()
         
         # Remove password field from user_dict as User model doesn't have it
         password = user_dict.pop("password", None)
@@ -69,13 +94,7 @@ class UserRepository(BaseRepository[User]):
         else:
             raise ValueError("Password is required")
         
-
-        
-        db_user = User(**user_dict)
-        self.db.add(db_user)
-        self.db.commit()
-        self.db.refresh(db_user)
-        return db_user
+        return self.insert_returning(user_dict)
     
     def update_user_password(self, user: User, new_password: str) -> User:
         """
@@ -88,12 +107,7 @@ class UserRepository(BaseRepository[User]):
         Returns:
             User: Updated user
         """
-        from ..utils.security import get_password_hash
-        
-        user.password_hash = get_password_hash(new_password)
-        self.db.commit()
-        self.db.refresh(user)
-        return user
+        return self.update_returning(user, {"password_hash": get_password_hash(new_password)})
     
     def get_all(self, skip: int = 0, limit: int = 100) -> List[User]:
         """
@@ -106,14 +120,31 @@ class UserRepository(BaseRepository[User]):
         Returns:
             List[User]: List of users
         """
-        return (
-            self.db.query(User)
-            .filter(User.is_active == True)
+        return self.db.scalars(
+            select(User)
+            .where(User.is_active == True)
             .order_by(User.created_at.desc())
             .offset(skip)
             .limit(limit)
-            .all()
+        ).all()
+    
+    def get_all_with_total(self, skip: int = 0, limit: int = 100) -> Tuple[List[User], int]:
+        """
+        Get a page of active users with the total count.
+        
+        Args:
+            skip: Number of records to skip
+            limit: Maximum number of records to return
+            
+        Returns:
+            Tuple[List[User], int]: Page of users and total count
+        """
+        query = (
+            self.db.query(User)
+            .filter(User.is_active == True)
+            .order_by(User.created_at.desc())
         )
+        return self.paginate(query, skip, limit)
     
     def search_users(self, search_term: str, skip: int = 0, limit: int = 100) -> List[User]:
         """
@@ -143,4 +174,35 @@ class UserRepository(BaseRepository[User]):
             .all()
         )
     
+    def search_users_with_total(
+        self,
+        search_term: str,
+        skip: int = 0,
+        limit: int = 100
+    ) -> Tuple[List[User], int]:
+        """
+        Search a page of users by name or email with the total match count.
+        
+        Args:
+            search_term: Search term
+            skip: Number of records to skip
+            limit: Maximum number of records to return
+            
+        Returns:
+            Tuple[List[User], int]: Page of matching users and total count
+        """
+        query = (
+            self.db.query(User)
+            .filter(
+                and_(
+                    User.is_active == True,
+                    (User.full_name.ilike(f"%{search_term}%") | 
+                     User.email.ilike(f"%{search_term}%") |
+                     User.username.ilike(f"%{search_term}%"))
+                )
+            )
+            .order_by(User.full_name.asc())
+        )
+        return self.paginate(query, skip, limit)
+    
  
\ No newline at end of file
@@ -2,18 +2,54 @@
 Workflow repository for workflow-related data access operations.
 """
 
-from typing import Optional, List, Dict, Any
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, func, desc
+from typing import Optional, List, Dict, Any, Tuple, Callable
+from sqlalchemy.orm import Session, joinedload, raiseload, defer
+from sqlalchemy import and_, func, desc, select, case, cast, literal, JSON
+from sqlalchemy.dialects.postgresql import JSONB
 import json
 from datetime import datetime
 
-from .base import BaseRepository
+from .base import BaseRepository, schema_values
+from ..config import settings
 from ..models.workflow import Workflow, WorkflowInstance, BusinessRule, WorkflowType, WorkflowStage
 from ..schemas.workflow import (
     WorkflowCreate, WorkflowUpdate, WorkflowInstanceCreate, WorkflowInstanceUpdate,
     BusinessRuleCreate, BusinessRuleUpdate
 )
+from ..utils.cache import TTLCache, register_local_cache, WORKFLOWS_NAMESPACE
+
+
+# Active business rules with pre-extracted conditions, shared across requests.
+# Cleared on rule writes and with the workflows cache namespace.
+_compiled_rules_cache = register_local_cache(
+    WORKFLOWS_NAMESPACE, TTLCache(ttl=settings.business_rules_cache_ttl, max_size=1)
+)
+_COMPILED_RULES_KEY = "active"
+
+# Sentinel for context keys a rule condition expects but the context lacks
+_MISSING = object()
+
+
+def _jsonb_concat(column, value: Any, json_type: str, empty: str):
+    """
+    Build a SQL expression appending to or merging into a JSON column.
+    
+    The column is concatenated with value as jsonb on the server, so the
+    stored document is never read into Python. Values that are NULL or not
+    of json_type (e.g. a stored JSON null) are treated as empty.
+    
+    Args:
+        column: JSON column to extend
+        value: Array items to append or object keys to merge
+        json_type: Expected jsonb_typeof of the column ("array" or "object")
+        empty: JSON literal used in place of a missing value
+        
+    Returns:
+        SQL expression producing the combined JSON value
+    """
+    current = cast(column, JSONB)
+    base = case((func.jsonb_typeof(current) == json_type, current), else_=cast(literal(empty), JSONB))
+    return cast(base.op("||")(literal(value, JSONB)), JSON)
 
 
 class WorkflowRepository(BaseRepository[Workflow]):
@@ -24,34 +60,46 @@ class WorkflowRepository(BaseRepository[Workflow]):
     def __init__(self, db: Session):
         super().__init__(db, Workflow)
     
-    def get(self, id: int) -> Optional[Workflow]:
+    def get_by_type(self, workflow_type: WorkflowType) -> List[Workflow]:
         """
-        Get workflow by ID.
+        Get workflows by type.
         
         Args:
-            id: Workflow ID
+            workflow_type: Workflow type
             
         Returns:
-            Optional[Workflow]: Workflow if found, None otherwise
+            List[Workflow]: List of workflows of the specified type
         """
-        return self.db.query(Workflow).filter(Workflow.id == id).first()
+        return (
+            self.db.query(Workflow)
+            .filter(and_(Workflow.type == workflow_type, Workflow.is_active == True))
+            .order_by(desc(Workflow.created_at))
+            .all()
+        )
     
-    def get_by_type(self, workflow_type: WorkflowType) -> List[Workflow]:
+    def get_by_type_with_total(
+        self,
+        workflow_type: WorkflowType,
+        skip: int = 0,
+        limit: int = 100
+    ) -> Tuple[List[Workflow], int]:
         """
-        Get workflows by type.
+        Get a page of active workflows of a type with the total count.
         
         Args:
             workflow_type: Workflow type
+            skip: Number of records to skip
+            limit: Maximum number of records to return
             
         Returns:
-            List[Workflow]: List of workflows of the specified type
+            Tuple[List[Workflow], int]: Page of workflows and total count
         """
-        return (
+        query = (
             self.db.query(Workflow)
             .filter(and_(Workflow.type == workflow_type, Workflow.is_active == True))
             .order_by(desc(Workflow.created_at))
-            .all()
         )
+        return self.paginate(query, skip, limit)
     
     def get_active_workflows(self) -> List[Workflow]:
         """
@@ -67,6 +115,24 @@ class WorkflowRepository(BaseRepository[Workflow]):
             .all()
         )
     
+    def get_active_workflows_with_total(self, skip: int = 0, limit: int = 100) -> Tuple[List[Workflow], int]:
+        """
+        Get a page of active workflows with the total count.
+        
+        Args:
+            skip: Number of records to skip
+            limit: Maximum number of records to return
+            
+        Returns:
+            Tuple[List[Workflow], int]: Page of workflows and total count
+        """
+        query = (
+            self.db.query(Workflow)
+            .filter(Workflow.is_active == True)
+            .order_by(desc(Workflow.created_at))
+        )
+        return self.paginate(query, skip, limit)
+    
     def create_workflow(self, workflow_data: WorkflowCreate) -> Workflow:
         """
         Create a new workflow.
@@ -77,12 +143,20 @@ class WorkflowRepository(BaseRepository[Workflow]):
         Returns:
             Workflow: Created workflow
         """
-        workflow_dict = workflow_data.dict()
-        db_workflow = Workflow(**workflow_dict)
-        self.db.add(db_workflow)
-        self.db.commit()
-        self.db.refresh(db_workflow)
-        return db_workflow
+        return self.insert_returning(schema_values(workflow_data))
+    
+    def bulk_create(self, workflows_data: List[WorkflowCreate], batch_size: int = 500) -> List[int]:
+        """
+        Create many workflows with batched INSERT ... RETURNING statements.
+        
+        Args:
+            workflows_data: Workflow creation data for each workflow
+            batch_size: Maximum number of rows per INSERT statement
+            
+        Returns:
+            List[int]: IDs of the created workflows, in input order
+        """
+        return self.bulk_insert([schema_values(workflow_data) for workflow_data in workflows_data], batch_size)
     
     def update_workflow(self, workflow: Workflow, workflow_update: WorkflowUpdate) -> Workflow:
         """
@@ -95,43 +169,59 @@ class WorkflowRepository(BaseRepository[Workflow]):
         Returns:
             Workflow: Updated workflow
         """
-        update_dict = workflow_update.dict(exclude_unset=True)
-        
-        for field, value in update_dict.items():
-            setattr(workflow, field, value)
-        
-        self.db.commit()
-        self.db.refresh(workflow)
-        return workflow
+        return self.update_returning(workflow, schema_values(workflow_update, exclude_unset=True))
     
     def get_workflow_statistics(self) -> Dict[str, Any]:
         """
-        Get workflow statistics.
+        Get workflow statistics, memoized for the session.
         
         Returns:
             Dict[str, Any]: Workflow statistics
         """
-        total_workflows = self.db.query(Workflow).count()
-        active_workflows = self.db.query(Workflow).filter(Workflow.is_active == True).count()
+        return self.memoize("wf_stats", self._compute_workflow_statistics)
+    
+    def _compute_workflow_statistics(self) -> Dict[str, Any]:
+        """Run the workflow statistics queries."""
+        completed_instances = (
+            select(func.count(WorkflowInstance.id))
+            .where(WorkflowInstance.is_completed == True)
+            .scalar_subquery()
+        )
         
-        # Get workflows by type
-        workflows_by_type = {}
-        for workflow_type in WorkflowType:
-            count = self.db.query(Workflow).filter(Workflow.type == workflow_type).count()
+        # Total and active counts per type in a single scan of workflows
+        rows = self.db.execute(
+            select(
+                Workflow.type,
+                func.count(),
+                func.count().filter(Workflow.is_active == True),
+                completed_instances
+            )
+            .group_by(Workflow.type)
+        ).all()
+        
+        total_workflows = 0
+        active_workflows = 0
+        workflows_by_type = {workflow_type.value: 0 for workflow_type in WorkflowType}
+        # Instances require a workflow, so no rows means no completed instances
+        completed_workflows = rows[0][3] if rows else 0
+        for workflow_type, count, active, _ in rows:
+            total_workflows += count
+            active_workflows += active
             workflows_by_type[workflow_type.value] = count
         
         # Get recent workflows
-        recent_workflows = (
-            self.db.query(Workflow)
-            .filter(Workflow.is_active == True)
+        # Column rows rather than entities; they validate into WorkflowResponse as-is
+        recent_workflows = self.db.execute(
+            select(*Workflow.__table__.columns)
+            .where(Workflow.is_active == True)
             .order_by(desc(Workflow.created_at))
             .limit(5)
-            .all()
-        )
+        ).all()
         
         return {
             "total_workflows": total_workflows,
             "active_workflows": active_workflows,
+            "completed_workflows": completed_workflows,
             "workflows_by_type": workflows_by_type,
             "recent_workflows": recent_workflows
         }
@@ -157,7 +247,11 @@ class WorkflowInstanceRepository(BaseRepository[WorkflowInstance]):
         """
         return (
             self.db.query(WorkflowInstance)
-            .options(joinedload(WorkflowInstance.workflow), joinedload(WorkflowInstance.project))
+            .options(
+                joinedload(WorkflowInstance.workflow),
+                joinedload(WorkflowInstance.project),
+                raiseload("*")
+            )
             .filter(WorkflowInstance.id == id)
             .first()
         )
@@ -172,13 +266,16 @@ class WorkflowInstanceRepository(BaseRepository[WorkflowInstance]):
         Returns:
             List[WorkflowInstance]: List of workflow instances for the project
         """
-        return (
-            self.db.query(WorkflowInstance)
-            .options(joinedload(WorkflowInstance.workflow), joinedload(WorkflowInstance.project))
-            .filter(WorkflowInstance.project_id == project_id)
+        return self.db.scalars(
+            select(WorkflowInstance)
+            .options(
+                joinedload(WorkflowInstance.workflow),
+                joinedload(WorkflowInstance.project),
+                raiseload("*")
+            )
+            .where(WorkflowInstance.project_id == project_id)
             .order_by(desc(WorkflowInstance.created_at))
-            .all()
-        )
+        ).all()
     
     def get_by_workflow(self, workflow_id: int) -> List[WorkflowInstance]:
         """
@@ -190,13 +287,16 @@ class WorkflowInstanceRepository(BaseRepository[WorkflowInstance]):
         Returns:
             List[WorkflowInstance]: List of workflow instances for the workflow
         """
-        return (
-            self.db.query(WorkflowInstance)
-            .options(joinedload(WorkflowInstance.workflow), joinedload(WorkflowInstance.project))
-            .filter(WorkflowInstance.workflow_id == workflow_id)
+        return self.db.scalars(
+            select(WorkflowInstance)
+            .options(
+                joinedload(WorkflowInstance.workflow),
+                joinedload(WorkflowInstance.project),
+                raiseload("*")
+            )
+            .where(WorkflowInstance.workflow_id == workflow_id)
             .order_by(desc(WorkflowInstance.created_at))
-            .all()
-        )
+        ).all()
     
     def get_by_stage(self, stage: str) -> List[WorkflowInstance]:
         """
@@ -208,13 +308,75 @@ class WorkflowInstanceRepository(BaseRepository[WorkflowInstance]):
         Returns:
             List[WorkflowInstance]: List of workflow instances in the specified stage
         """
-        return (
-            self.db.query(WorkflowInstance)
-            .options(joinedload(WorkflowInstance.workflow), joinedload(WorkflowInstance.project))
-            .filter(WorkflowInstance.current_stage == stage)
+        return self.db.scalars(
+            select(WorkflowInstance)
+            .options(
+                joinedload(WorkflowInstance.workflow),
+                joinedload(WorkflowInstance.project),
+                raiseload("*")
+            )
+            .where(WorkflowInstance.current_stage == stage)
             .order_by(desc(WorkflowInstance.created_at))
-            .all()
+        ).all()
+    
+    def get_page(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        project_id: Optional[int] = None,
+        workflow_id: Optional[int] = None,
+        stage: Optional[str] = None
+    ) -> Tuple[List[WorkflowInstance], int]:
+        """
+        Get a page of workflow instances with the total count.
+        
+        Only the first given filter is applied, checked in the order
+        project, workflow, stage.
+        
+        The page of IDs is selected first and only those instances are then
+        loaded with their workflow and project, so the joins never run over
+        rows outside the page.
+        
+        Args:
+            skip: Number of records to skip
+            limit: Maximum number of records to return
+            project_id: Optional project ID filter
+            workflow_id: Optional workflow ID filter
+            stage: Optional current stage filter
+            
+        Returns:
+            Tuple[List[WorkflowInstance], int]: Page of workflow instances and total count
+        """
+        id_query = self.db.query(WorkflowInstance.id)
+        
+        if project_id:
+            id_query = id_query.filter(WorkflowInstance.project_id == project_id)
+        elif workflow_id:
+            id_query = id_query.filter(WorkflowInstance.workflow_id == workflow_id)
+        elif stage:
+            id_query = id_query.filter(WorkflowInstance.current_stage == stage)
+        
+        ids, total = self.paginate(
+            id_query.order_by(desc(WorkflowInstance.created_at), desc(WorkflowInstance.id)),
+            skip,
+            limit
         )
+        if not ids:
+            return [], total
+        
+        instances = {
+            instance.id: instance
+            for instance in (
+                self.db.query(WorkflowInstance)
+                .options(
+                    joinedload(WorkflowInstance.workflow),
+                    joinedload(WorkflowInstance.project),
+                    raiseload("*")
+                )
+                .filter(WorkflowInstance.id.in_(ids))
+            )
+        }
+        return [instances[id] for id in ids], total
     
     def create_workflow_instance(self, instance_data: WorkflowInstanceCreate) -> WorkflowInstance:
         """
@@ -226,15 +388,24 @@ class WorkflowInstanceRepository(BaseRepository[WorkflowInstance]):
         Returns:
             WorkflowInstance: Created workflow instance
         """
-        instance_dict = instance_data.dict()
-        db_instance = WorkflowInstance(**instance_dict)
-        self.db.add(db_instance)
-        self.db.commit()
-        self.db.refresh(db_instance)
+        db_instance = self.insert_returning(schema_values(instance_data))
         
         # Return instance with relationships loaded
         return self.get(db_instance.id)
     
+    def bulk_create(self, instances_data: List[WorkflowInstanceCreate], batch_size: int = 500) -> List[int]:
+        """
+        Create many workflow instances with batched INSERT ... RETURNING statements.
+        
+        Args:
+            instances_data: Workflow instance creation data for each instance
+            batch_size: Maximum number of rows per INSERT statement
+            
+        Returns:
+            List[int]: IDs of the created workflow instances, in input order
+        """
+        return self.bulk_insert([schema_values(instance_data) for instance_data in instances_data], batch_size)
+    
     def update_workflow_instance(self, instance: WorkflowInstance, instance_update: WorkflowInstanceUpdate) -> WorkflowInstance:
         """
         Update a workflow instance.
@@ -246,21 +417,20 @@ class WorkflowInstanceRepository(BaseRepository[WorkflowInstance]):
         Returns:
             WorkflowInstance: Updated workflow instance
         """
-        update_dict = instance_update.dict(exclude_unset=True)
-        
-        for field, value in update_dict.items():
-            setattr(instance, field, value)
-        
-        self.db.commit()
-        self.db.refresh(instance)
-        
-        # Return instance with relationships loaded
-        return self.get(instance.id)
+        # Workflow and project cannot change here, so loaded relationships stay valid
+        return self.update_returning(instance, schema_values(instance_update, exclude_unset=True))
     
     def transition_stage(self, instance_id: int, new_stage: str, transition_data: Optional[Dict[str, Any]] = None, triggered_by: Optional[int] = None) -> WorkflowInstance:
         """
         Transition workflow instance to a new stage.
         
+        The instance is read with its relationships under a row lock, so
+        concurrent transitions see each other's stage changes, and written
+        back with a single UPDATE ... RETURNING. On PostgreSQL history and
+        stage data are extended with jsonb concatenation on the server rather
+        than read and rewritten, so a transition's cost does not grow with
+        history; other databases read and rewrite them under the same lock.
+        
         Args:
             instance_id: Workflow instance ID
             new_stage: New stage
@@ -269,8 +439,24 @@ class WorkflowInstanceRepository(BaseRepository[WorkflowInstance]):
             
         Returns:
             WorkflowInstance: Updated workflow instance
+            
+        Raises:
+            ValueError: If the workflow instance does not exist
         """
-        instance = self.get(instance_id)
+        instance = (
+            self.db.query(WorkflowInstance)
+            .options(
+                joinedload(WorkflowInstance.workflow),
+                joinedload(WorkflowInstance.project),
+                defer(WorkflowInstance.history),
+                defer(WorkflowInstance.stage_data),
+                raiseload("*")
+            )
+            .filter(WorkflowInstance.id == instance_id)
+            .with_for_update(of=WorkflowInstance)
+            .populate_existing()
+            .first()
+        )
         if not instance:
             raise ValueError("Workflow instance not found")
         
@@ -283,22 +469,65 @@ class WorkflowInstanceRepository(BaseRepository[WorkflowInstance]):
             "data": transition_data or {}
         }
         
-        # Update history
-        history = instance.history or []
-        history.append(transition_record)
-        instance.history = history
+        if self.db.get_bind().dialect.name == "postgresql":
+            values = {
+                "history": _jsonb_concat(WorkflowInstance.history, [transition_record], "array", "[]")
+            }
+            # Update stage data if provided
+            if transition_data:
+                values["stage_data"] = _jsonb_concat(WorkflowInstance.stage_data, transition_data, "object", "{}")
+        else:
+            values = self._extend_documents(instance.id, transition_record, transition_data)
+        values["current_stage"] = new_stage
+        
+        return self.update_returning(instance, values)
+    
+    def _extend_documents(
+        self,
+        instance_id: int,
+        transition_record: Dict[str, Any],
+        transition_data: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        """
+        Append a transition to history and merge stage data in Python.
         
-        # Update stage data if provided
-        if transition_data:
-            current_data = instance.stage_data or {}
-            current_data.update(transition_data)
-            instance.stage_data = current_data
+        Used on databases without jsonb, where the stored documents are read
+        and written back whole.
+        
+        Args:
+            instance_id: Workflow instance ID
+            transition_record: History entry for the transition
+            transition_data: Stage data keys to merge, if any
+            
+        Returns:
+            Dict[str, Any]: New history and, if data was given, stage_data values
+        """
+        history, stage_data = self.db.execute(
+            select(WorkflowInstance.history, WorkflowInstance.stage_data)
+            .where(WorkflowInstance.id == instance_id)
+        ).one()
         
-        instance.current_stage = new_stage
-        self.db.commit()
-        self.db.refresh(instance)
+        values = {"history": (history if isinstance(history, list) else []) + [transition_record]}
+        if transition_data:
+            values["stage_data"] = {**(stage_data if isinstance(stage_data, dict) else {}), **transition_data}
+        return values
+    
+    def count_by_stage(self) -> List[Tuple[str, int, int]]:
+        """
+        Count total and completed instances per current stage in one query.
         
-        return self.get(instance.id)
+        Returns:
+            List[Tuple[str, int, int]]: (stage, total, completed) rows, one per
+            distinct stage
+        """
+        return self.db.execute(
+            select(
+                WorkflowInstance.current_stage,
+                func.count(),
+                func.count().filter(WorkflowInstance.is_completed == True)
+            )
+            .group_by(WorkflowInstance.current_stage)
+        ).all()
     
     def get_workflow_instance_statistics(self) -> Dict[str, Any]:
         """
@@ -307,14 +536,18 @@ class WorkflowInstanceRepository(BaseRepository[WorkflowInstance]):
         Returns:
             Dict[str, Any]: Workflow instance statistics
         """
-        total_instances = self.db.query(WorkflowInstance).count()
-        completed_instances = self.db.query(WorkflowInstance).filter(WorkflowInstance.is_completed == True).count()
+        # Total and completed counts per stage in a single scan of instances
+        rows = self.count_by_stage()
         
-        # Get instances by stage
-        instances_by_stage = {}
-        for stage in WorkflowStage:
-            count = self.db.query(WorkflowInstance).filter(WorkflowInstance.current_stage == stage.value).count()
-            instances_by_stage[stage.value] = count
+        total_instances = 0
+        completed_instances = 0
+        # Stages are free-form strings; only the standard ones are broken out
+        instances_by_stage = {stage.value: 0 for stage in WorkflowStage}
+        for stage, count, completed in rows:
+            total_instances += count
+            completed_instances += completed
+            if stage in instances_by_stage:
+                instances_by_stage[stage] = count
         
         return {
             "total_instances": total_instances,
@@ -331,48 +564,77 @@ class BusinessRuleRepository(BaseRepository[BusinessRule]):
     def __init__(self, db: Session):
         super().__init__(db, BusinessRule)
     
-    def get(self, id: int) -> Optional[BusinessRule]:
+    def get_by_type(self, rule_type: str) -> List[BusinessRule]:
         """
-        Get business rule by ID.
+        Get business rules by type.
         
         Args:
-            id: Business rule ID
+            rule_type: Rule type
             
         Returns:
-            Optional[BusinessRule]: Business rule if found, None otherwise
+            List[BusinessRule]: List of business rules of the specified type
         """
-        return self.db.query(BusinessRule).filter(BusinessRule.id == id).first()
+        return (
+            self.db.query(BusinessRule)
+            .filter(and_(BusinessRule.rule_type == rule_type, BusinessRule.is_active == True))
+            .order_by(desc(BusinessRule.created_at))
+            .all()
+        )
     
-    def get_by_type(self, rule_type: str) -> List[BusinessRule]:
+    def get_by_type_with_total(
+        self,
+        rule_type: str,
+        skip: int = 0,
+        limit: int = 100
+    ) -> Tuple[List[BusinessRule], int]:
         """
-        Get business rules by type.
+        Get a page of active business rules of a type with the total count.
         
         Args:
             rule_type: Rule type
+            skip: Number of records to skip
+            limit: Maximum number of records to return
             
         Returns:
-            List[BusinessRule]: List of business rules of the specified type
+            Tuple[List[BusinessRule], int]: Page of business rules and total count
         """
-        return (
+        query = (
             self.db.query(BusinessRule)
             .filter(and_(BusinessRule.rule_type == rule_type, BusinessRule.is_active == True))
             .order_by(desc(BusinessRule.created_at))
-            .all()
         )
+        return self.paginate(query, skip, limit)
     
-    def get_active_rules(self) -> List[BusinessRule]:
+    def get_active_rules_with_total(self, skip: int = 0, limit: int = 100) -> Tuple[List[BusinessRule], int]:
         """
-        Get all active business rules.
+        Get a page of active business rules with the total count.
         
+        Args:
+            skip: Number of records to skip
+            limit: Maximum number of records to return
+            
         Returns:
-            List[BusinessRule]: List of active business rules
+            Tuple[List[BusinessRule], int]: Page of business rules and total count
         """
-        return (
+        query = (
             self.db.query(BusinessRule)
             .filter(BusinessRule.is_active == True)
             .order_by(desc(BusinessRule.created_at))
-            .all()
         )
+        return self.paginate(query, skip, limit)
+    
+    def get_active_rules(self) -> List[BusinessRule]:
+        """
+        Get all active business rules.
+        
+        Returns:
+            List[BusinessRule]: List of active business rules
+        """
+        return self.db.scalars(
+            select(BusinessRule)
+            .where(BusinessRule.is_active == True)
+            .order_by(desc(BusinessRule.created_at))
+        ).all()
     
     def create_business_rule(self, rule_data: BusinessRuleCreate) -> BusinessRule:
         """
@@ -384,12 +646,24 @@ class BusinessRuleRepository(BaseRepository[BusinessRule]):
         Returns:
             BusinessRule: Created business rule
         """
-        rule_dict = rule_data.dict()
-        db_rule = BusinessRule(**rule_dict)
-        self.db.add(db_rule)
-        self.db.commit()
-        self.db.refresh(db_rule)
-        return db_rule
+        rule = self.insert_returning(schema_values(rule_data))
+        _compiled_rules_cache.clear()
+        return rule
+    
+    def bulk_create(self, rules_data: List[BusinessRuleCreate], batch_size: int = 500) -> List[int]:
+        """
+        Create many business rules with batched INSERT ... RETURNING statements.
+        
+        Args:
+            rules_data: Business rule creation data for each rule
+            batch_size: Maximum number of rows per INSERT statement
+            
+        Returns:
+            List[int]: IDs of the created business rules, in input order
+        """
+        ids = self.bulk_insert([schema_values(rule_data) for rule_data in rules_data], batch_size)
+        _compiled_rules_cache.clear()
+        return ids
     
     def update_business_rule(self, rule: BusinessRule, rule_update: BusinessRuleUpdate) -> BusinessRule:
         """
@@ -402,54 +676,121 @@ class BusinessRuleRepository(BaseRepository[BusinessRule]):
         Returns:
             BusinessRule: Updated business rule
         """
-        update_dict = rule_update.dict(exclude_unset=True)
-        
-        for field, value in update_dict.items():
-            setattr(rule, field, value)
-        
-        self.db.commit()
-        self.db.refresh(rule)
+        rule = self.update_returning(rule, schema_values(rule_update, exclude_unset=True))
+        _compiled_rules_cache.clear()
         return rule
     
     def evaluate_rules(self, context: Dict[str, Any]) -> List[Dict[str, Any]]:
         """
         Evaluate business rules against a context.
         
+        A rule can only match when its indexed condition holds, so only
+        rules indexed under a (key, value) pair present in the context, plus
+        rules without conditions, are tested; matching is a hash lookup per
+        context key rather than a scan over the rule set.
+        
         Args:
             context: Context data for rule evaluation
             
         Returns:
             List[Dict[str, Any]]: List of triggered rules and their actions
         """
-        active_rules = self.get_active_rules()
-        triggered_rules = []
+        compiled = self._get_compiled_rules()
+        rules_by_key = compiled["by_key"]
+        
+        candidates = list(compiled["unconditional"])
+        for key, value in context.items():
+            index = rules_by_key.get(key)
+            if index is None:
+                continue
+            by_value, unhashable = index
+            try:
+                positions = by_value.get(value)
+            except TypeError:
+                # Unhashable context values cannot equal a hashable expected value
+                positions = None
+            if positions:
+                candidates.extend(positions)
+            candidates.extend(unhashable)
+        # Keep the newest-first order of the active rule set
+        candidates.sort()
+        
+        rules = compiled["rules"]
+        return [
+            dict(rules[position]["result"])
+            for position in candidates
+            if rules[position]["matches"](context)
+        ]
+    
+    def _get_compiled_rules(self) -> Dict[str, Any]:
+        """
+        Get the active rules in evaluation-ready form.
+        
+        Each rule is indexed by the key and expected value of its first
+        condition, which any matching context must share. Rules whose
+        expected value is unhashable are kept in a per-key list instead.
         
-        for rule in active_rules:
-            if self._evaluate_conditions(rule.conditions, context):
-                triggered_rules.append({
+        The compiled set is cached in-process for business_rules_cache_ttl
+        seconds, so evaluations within that window issue no queries. Rule
+        writes in this process clear it immediately; other workers pick up
+        changes once the TTL lapses.
+        
+        Returns:
+            Dict[str, Any]: Compiled predicate and result payload per rule,
+            rule positions by indexed key and value, and positions of rules
+            without conditions
+        """
+        compiled = _compiled_rules_cache.get(_COMPILED_RULES_KEY)
+        if compiled is not None:
+            return compiled
+        
+        rules = []
+        rules_by_key: Dict[str, Tuple[Dict[Any, List[int]], List[int]]] = {}
+        unconditional = []
+        for position, rule in enumerate(self.get_active_rules()):
+            rules.append({
+                "matches": self._compile_conditions(rule.conditions),
+                "result": {
                     "rule_id": rule.id,
                     "rule_name": rule.name,
                     "rule_type": rule.rule_type,
                     "actions": rule.actions
-                })
-        
-        return triggered_rules
+                }
+            })
+            if rule.conditions:
+                key, expected_value = next(iter(rule.conditions.items()))
+                by_value, unhashable = rules_by_key.setdefault(key, ({}, []))
+                try:
+                    by_value.setdefault(expected_value, []).append(position)
+                except TypeError:
+                    unhashable.append(position)
+            else:
+                unconditional.append(position)
+        
+        compiled = {"rules": rules, "by_key": rules_by_key, "unconditional": unconditional}
+        _compiled_rules_cache.set(_COMPILED_RULES_KEY, compiled)
+        return compiled
     
-    def _evaluate_conditions(self, conditions: Dict[str, Any], context: Dict[str, Any]) -> bool:
+    @staticmethod
+    def _compile_conditions(conditions: Optional[Dict[str, Any]]) -> Callable[[Dict[str, Any]], bool]:
         """
-        Evaluate rule conditions against context.
+        Compile rule conditions into a predicate over a context.
+        
+        Done once per rule when the active set is compiled, so evaluation
+        does not re-walk the conditions mapping for every context.
         
         Args:
-            conditions: Rule conditions
-            context: Context data
+            conditions: Rule conditions mapping keys to expected values
             
         Returns:
-            bool: True if conditions are met, False otherwise
-        """
-        # Simple condition evaluation - can be extended with more complex logic
-        for key, expected_value in conditions.items():
-            if key not in context:
-                return False
-            if context[key] != expected_value:
-                return False
-        return True 
\ No newline at end of file
+            Callable[[Dict[str, Any]], bool]: True if every key is present
+            in the context with the expected value
+        """
+        # Simple equality conditions - can be extended with more complex logic
+        items = tuple((conditions or {}).items())
+        if not items:
+            return lambda context: True
+        if len(items) == 1:
+            (key, expected_value), = items
+            return lambda context: context.get(key, _MISSING) == expected_value
+        return lambda context: all(context.get(key, _MISSING) == expected_value for key, expected_value in items)
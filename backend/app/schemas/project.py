@@ -79,6 +79,36 @@ class ProjectResponse(ProjectBase):
     
     class Config:
         from_attributes = True
+    
+    @classmethod
+    def from_orm_trusted(cls, obj) -> "ProjectResponse":
+        """
+        Build a response from a row the server itself loaded, skipping validation.
+        
+        Args:
+            obj: Project entity or column row
+            
+        Returns:
+            ProjectResponse: Response model
+        """
+        return cls.model_construct(
+            id=obj.id,
+            name=obj.name,
+            description=obj.description,
+            owner_id=obj.owner_id,
+            owner_name=getattr(obj, "owner_name", None),
+            workflow_id=obj.workflow_id,
+            workflow_name=getattr(obj, "workflow_name", None),
+            status=obj.status,
+            start_date=obj.start_date,
+            end_date=obj.end_date,
+            created_at=obj.created_at,
+            updated_at=obj.updated_at,
+            task_count=obj.task_count,
+            completed_task_count=obj.completed_task_count,
+            progress_percentage=obj.progress_percentage,
+            is_active=obj.is_active
+        )
 
 
 class ProjectList(BaseModel):
@@ -88,6 +118,7 @@ class ProjectList(BaseModel):
     page: int
     size: int
     pages: int
+    next_cursor: Optional[str] = None
 
 
 class ProjectWithTasks(ProjectResponse):
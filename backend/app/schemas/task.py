@@ -9,6 +9,7 @@ from enum import Enum
 
 from .user import UserResponse
 from .project import ProjectResponse
+from ..utils.dates import parse_flexible_date
 
 
 class TaskStatus(str, Enum):
@@ -98,11 +99,7 @@ class TaskResponse(TaskBase):
     def parse_due_date(cls, v):
         """Parse due_date from string to datetime if needed."""
         if isinstance(v, str):
-            try:
-                from datetime import datetime
-                return datetime.fromisoformat(v.replace('Z', '+00:00'))
-            except ValueError:
-                return None
+            return parse_flexible_date(v)
         return v
 
 
@@ -113,6 +110,7 @@ class TaskList(BaseModel):
     page: int
     size: int
     pages: int
+    next_cursor: Optional[str] = None
 
 
 
@@ -6,6 +6,8 @@ from pydantic import BaseModel, EmailStr, validator
 from typing import Optional
 from datetime import datetime
 
+from ..utils.validators import validate_email, validate_password, validate_username
+
 
 
 class UserBase(BaseModel):
@@ -20,20 +22,30 @@ class UserCreate(UserBase):
     """Schema for user creation."""
     password: str
     
+    @validator('email')
+    def check_email(cls, v):
+        """Validate email format."""
+        is_valid, error = validate_email(v)
+        if not is_valid:
+            raise ValueError(error)
+        return v
+    
     @validator('password')
-    def validate_password(cls, v):
+    def check_password(cls, v):
         """Validate password strength."""
-        if len(v) < 8:
-            raise ValueError('Password must be at least 8 characters long')
+        is_valid, error = validate_password(v)
+        if not is_valid:
+            raise ValueError(error)
         return v
     
     @validator('username')
-    def validate_username(cls, v):
+    def check_username(cls, v):
         """Validate username format."""
         if not v.isalnum():
             raise ValueError('Username must contain only alphanumeric characters')
-        if len(v) < 3:
-            raise ValueError('Username must be at least 3 characters long')
+        is_valid, error = validate_username(v)
+        if not is_valid:
+            raise ValueError(error)
         return v
 
 
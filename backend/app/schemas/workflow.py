@@ -3,7 +3,7 @@ Pydantic schemas for workflow-related operations.
 """
 
 from pydantic import BaseModel, validator, Field
-from typing import Optional, List, Dict, Any, Union
+from typing import Optional, List, Dict, Any, Union, Callable
 from datetime import datetime
 from enum import Enum
 
@@ -11,6 +11,33 @@ from .user import UserResponse
 from .project import ProjectResponse
 
 
+def _text_validator(label: str, required: bool, max_length: Optional[int] = 255) -> Callable:
+    """
+    Build a validator that strips a text field and rejects blank values.
+    
+    Args:
+        label: Field label used in error messages
+        required: Whether the field is required (otherwise None passes through)
+        max_length: Maximum length, or None for no limit
+        
+    Returns:
+        Callable: Validator function for use with @validator
+    """
+    blank_message = f'{label} is required' if required else f'{label} cannot be empty'
+    
+    def _validate(cls, v):
+        if v is None:
+            return v
+        stripped = v.strip()
+        if not stripped:
+            raise ValueError(blank_message)
+        if max_length is not None and len(v) > max_length:
+            raise ValueError(f'{label} is too long (max {max_length} characters)')
+        return stripped
+    
+    return _validate
+
+
 class WorkflowType(str, Enum):
     """Workflow type enumeration."""
     SALES = "sales"
@@ -54,20 +81,11 @@ class WorkflowBase(BaseModel):
 class WorkflowCreate(WorkflowBase):
     """Schema for workflow creation."""
     
-    @validator('name')
-    def validate_name(cls, v):
-        """Validate workflow name."""
-        if not v or not v.strip():
-            raise ValueError('Workflow name is required')
-        if len(v) > 255:
-            raise ValueError('Workflow name is too long (max 255 characters)')
-        return v.strip()
+    validate_name = validator('name')(_text_validator('Workflow name', required=True))
     
     @validator('stages')
     def validate_stages(cls, v):
         """Validate stages configuration."""
-        if not isinstance(v, dict):
-            raise ValueError('Stages must be a JSON object')
         if not v:
             raise ValueError('At least one stage must be defined')
         return v
@@ -82,16 +100,7 @@ class WorkflowUpdate(BaseModel):
     rules: Optional[Dict[str, Any]] = None
     is_active: Optional[bool] = None
     
-    @validator('name')
-    def validate_name(cls, v):
-        """Validate workflow name if provided."""
-        if v is not None:
-            if not v.strip():
-                raise ValueError('Workflow name cannot be empty')
-            if len(v) > 255:
-                raise ValueError('Workflow name is too long (max 255 characters)')
-            return v.strip()
-        return v
+    validate_name = validator('name')(_text_validator('Workflow name', required=False))
 
 
 class WorkflowResponse(WorkflowBase):
@@ -102,6 +111,30 @@ class WorkflowResponse(WorkflowBase):
     
     class Config:
         from_attributes = True
+        defer_build = True
+    
+    @classmethod
+    def from_orm_trusted(cls, obj) -> "WorkflowResponse":
+        """
+        Build a response from a row the server itself loaded, skipping validation.
+        
+        Args:
+            obj: Workflow entity or column row
+            
+        Returns:
+            WorkflowResponse: Response model
+        """
+        return cls.model_construct(
+            id=obj.id,
+            name=obj.name,
+            description=obj.description,
+            type=obj.type,
+            stages=obj.stages,
+            rules=obj.rules,
+            is_active=obj.is_active,
+            created_at=obj.created_at,
+            updated_at=obj.updated_at
+        )
 
 
 class WorkflowList(BaseModel):
@@ -111,6 +144,9 @@ class WorkflowList(BaseModel):
     page: int
     size: int
     pages: int
+    
+    class Config:
+        defer_build = True
 
 
 class WorkflowInstanceBase(BaseModel):
@@ -126,12 +162,9 @@ class WorkflowInstanceBase(BaseModel):
 class WorkflowInstanceCreate(WorkflowInstanceBase):
     """Schema for workflow instance creation."""
     
-    @validator('current_stage')
-    def validate_current_stage(cls, v):
-        """Validate current stage."""
-        if not v or not v.strip():
-            raise ValueError('Current stage is required')
-        return v.strip()
+    validate_current_stage = validator('current_stage')(
+        _text_validator('Current stage', required=True, max_length=None)
+    )
 
 
 class WorkflowInstanceUpdate(BaseModel):
@@ -141,14 +174,9 @@ class WorkflowInstanceUpdate(BaseModel):
     history: Optional[List[Dict[str, Any]]] = None
     is_completed: Optional[bool] = None
     
-    @validator('current_stage')
-    def validate_current_stage(cls, v):
-        """Validate current stage if provided."""
-        if v is not None:
-            if not v.strip():
-                raise ValueError('Current stage cannot be empty')
-            return v.strip()
-        return v
+    validate_current_stage = validator('current_stage')(
+        _text_validator('Current stage', required=False, max_length=None)
+    )
 
 
 class WorkflowInstanceResponse(WorkflowInstanceBase):
@@ -161,6 +189,36 @@ class WorkflowInstanceResponse(WorkflowInstanceBase):
     
     class Config:
         from_attributes = True
+        defer_build = True
+    
+    @classmethod
+    def from_orm_trusted(cls, obj) -> "WorkflowInstanceResponse":
+        """
+        Build a response from a row the server itself loaded, skipping validation.
+        
+        The workflow and project relationships must already be loaded.
+        
+        Args:
+            obj: Workflow instance entity
+            
+        Returns:
+            WorkflowInstanceResponse: Response model
+        """
+        workflow = obj.workflow
+        project = obj.project
+        return cls.model_construct(
+            id=obj.id,
+            workflow_id=obj.workflow_id,
+            project_id=obj.project_id,
+            current_stage=obj.current_stage,
+            stage_data=obj.stage_data,
+            history=obj.history,
+            is_completed=obj.is_completed,
+            workflow=WorkflowResponse.from_orm_trusted(workflow) if workflow is not None else None,
+            project=ProjectResponse.from_orm_trusted(project) if project is not None else None,
+            created_at=obj.created_at,
+            updated_at=obj.updated_at
+        )
 
 
 class WorkflowInstanceList(BaseModel):
@@ -170,6 +228,9 @@ class WorkflowInstanceList(BaseModel):
     page: int
     size: int
     pages: int
+    
+    class Config:
+        defer_build = True
 
 
 class BusinessRuleBase(BaseModel):
@@ -185,28 +246,7 @@ class BusinessRuleBase(BaseModel):
 class BusinessRuleCreate(BusinessRuleBase):
     """Schema for business rule creation."""
     
-    @validator('name')
-    def validate_name(cls, v):
-        """Validate rule name."""
-        if not v or not v.strip():
-            raise ValueError('Rule name is required')
-        if len(v) > 255:
-            raise ValueError('Rule name is too long (max 255 characters)')
-        return v.strip()
-    
-    @validator('conditions')
-    def validate_conditions(cls, v):
-        """Validate conditions configuration."""
-        if not isinstance(v, dict):
-            raise ValueError('Conditions must be a JSON object')
-        return v
-    
-    @validator('actions')
-    def validate_actions(cls, v):
-        """Validate actions configuration."""
-        if not isinstance(v, dict):
-            raise ValueError('Actions must be a JSON object')
-        return v
+    validate_name = validator('name')(_text_validator('Rule name', required=True))
 
 
 class BusinessRuleUpdate(BaseModel):
@@ -218,16 +258,7 @@ class BusinessRuleUpdate(BaseModel):
     actions: Optional[Dict[str, Any]] = None
     is_active: Optional[bool] = None
     
-    @validator('name')
-    def validate_name(cls, v):
-        """Validate rule name if provided."""
-        if v is not None:
-            if not v.strip():
-                raise ValueError('Rule name cannot be empty')
-            if len(v) > 255:
-                raise ValueError('Rule name is too long (max 255 characters)')
-            return v.strip()
-        return v
+    validate_name = validator('name')(_text_validator('Rule name', required=False))
 
 
 class BusinessRuleResponse(BusinessRuleBase):
@@ -238,6 +269,30 @@ class BusinessRuleResponse(BusinessRuleBase):
     
     class Config:
         from_attributes = True
+        defer_build = True
+    
+    @classmethod
+    def from_orm_trusted(cls, obj) -> "BusinessRuleResponse":
+        """
+        Build a response from a row the server itself loaded, skipping validation.
+        
+        Args:
+            obj: Business rule entity
+            
+        Returns:
+            BusinessRuleResponse: Response model
+        """
+        return cls.model_construct(
+            id=obj.id,
+            name=obj.name,
+            description=obj.description,
+            rule_type=obj.rule_type,
+            conditions=obj.conditions,
+            actions=obj.actions,
+            is_active=obj.is_active,
+            created_at=obj.created_at,
+            updated_at=obj.updated_at
+        )
 
 
 class BusinessRuleList(BaseModel):
@@ -247,6 +302,9 @@ class BusinessRuleList(BaseModel):
     page: int
     size: int
     pages: int
+    
+    class Config:
+        defer_build = True
 
 
 class WorkflowStatistics(BaseModel):
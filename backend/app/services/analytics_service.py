@@ -2,116 +2,174 @@
 Analytics service for dashboard data and reporting.
 """
 
-from typing import Dict, List, Any, Optional
-from datetime import datetime, timedelta
+from typing import Dict, List, Any, Optional, Callable, Iterator
+from datetime import datetime, timedelta, timezone
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from sqlalchemy import func, and_, desc
+from collections import Counter
+import asyncio
 import json
 
-from ..models.project import Project
-from ..models.task import Task
-from ..models.user import User
+from ..database import SessionLocal
+from ..models.project import Project, ProjectStatus
+from ..models.task import Task, TaskStatus
 from ..models.workflow import WorkflowInstance
 from ..repositories.project_repository import ProjectRepository
 from ..repositories.task_repository import TaskRepository
-from ..repositories.user_repository import UserRepository
 from ..repositories.workflow_repository import WorkflowInstanceRepository
+from ..utils.cache import register_local_cache, ANALYTICS_NAMESPACE
+
+# Status sets for membership tests in per-row loops
+_ACTIVE_TASK_STATUSES = frozenset({TaskStatus.TODO, TaskStatus.IN_PROGRESS, TaskStatus.REVIEW})
+_ACTIVE_PROJECT_STATUSES = frozenset({ProjectStatus.IN_PROGRESS, ProjectStatus.PLANNING})
+
+# Overviews currently being computed, so concurrent callers share the work.
+# Dropped on analytics invalidation so callers after a write start afresh;
+# finished overviews are cached by the routes' Redis cache only.
+_dashboard_pending: Dict[int, asyncio.Future] = register_local_cache(ANALYTICS_NAMESPACE, {})
 
 
 class AnalyticsService:
     """
     Service for generating analytics and dashboard data.
-    """
     
-    def __init__(self, db: Session):
-        self.db = db
-        self.project_repo = ProjectRepository(db)
-        self.task_repo = TaskRepository(db)
-        self.user_repo = UserRepository(db)
-        self.workflow_repo = WorkflowInstanceRepository(db)
+    The service holds no per-request state; every method takes the
+    database session to work with, so a single instance is shared.
+    """
     
-    def get_dashboard_overview(self, user_id: int) -> Dict[str, Any]:
+    async def get_dashboard_overview(self, user_id: int) -> Dict[str, Any]:
         """
         Get dashboard overview statistics.
         
+        Concurrent requests for the same user wait on a single computation.
+        
         Args:
             user_id: User ID for personalized data
             
         Returns:
             Dict containing dashboard overview data
         """
-        # Get user's projects
-        user_projects = self.project_repo.get_user_projects(user_id)
-        
-        # Get user's tasks
-        user_tasks = self.task_repo.get_user_tasks(user_id)
+        pending = _dashboard_pending.get(user_id)
+        if pending is None:
+            pending = asyncio.ensure_future(self._build_dashboard_overview(user_id))
+            _dashboard_pending[user_id] = pending
+            pending.add_done_callback(lambda done: self._forget_pending(user_id, done))
         
-        # Calculate project statistics
-        total_projects = len(user_projects)
-        active_projects = len([p for p in user_projects if p.status in ['in_progress', 'planning']])
-        completed_projects = len([p for p in user_projects if p.status == 'completed'])
+        return await asyncio.shield(pending)
+    
+    @staticmethod
+    def _forget_pending(user_id: int, done: asyncio.Future) -> None:
+        """Drop a finished computation unless invalidation already replaced it."""
+        if _dashboard_pending.get(user_id) is done:
+            del _dashboard_pending[user_id]
+    
+    async def _build_dashboard_overview(self, user_id: int) -> Dict[str, Any]:
+        """
+        Compute the dashboard overview.
         
-        # Calculate task statistics
-        total_tasks = len(user_tasks)
-        active_tasks = len([t for t in user_tasks if t.status in ['todo', 'in_progress', 'review']])
-        completed_tasks = len([t for t in user_tasks if t.status == 'completed'])
-        overdue_tasks = len([t for t in user_tasks if self._is_task_overdue(t)])
+        The independent sub-aggregates run concurrently in the threadpool,
+        each with its own database session.
+        """
+        (
+            projects,
+            tasks,
+            recent_activity,
+            upcoming_deadlines,
+            performance_metrics
+        ) = await asyncio.gather(
+            self._run_isolated(self._get_project_overview, user_id),
+            self._run_isolated(self._get_task_overview, user_id),
+            self._run_isolated(self._get_recent_activity, user_id),
+            self._run_isolated(self._get_upcoming_deadlines, user_id),
+            self._run_isolated(self._get_performance_metrics, user_id)
+        )
         
-        # Calculate completion rates
+        return {
+            "projects": projects,
+            "tasks": tasks,
+            "recent_activity": recent_activity,
+            "upcoming_deadlines": upcoming_deadlines,
+            "performance_metrics": performance_metrics
+        }
+    
+    @staticmethod
+    async def _run_isolated(method: Callable[..., Any], *args: Any) -> Any:
+        """Run a service method in the threadpool with a dedicated session."""
+        def run():
+            db = SessionLocal()
+            try:
+                return method(db, *args)
+            finally:
+                db.close()
+        
+        return await run_in_threadpool(run)
+    
+    def _get_project_overview(self, db: Session, user_id: int) -> Dict[str, Any]:
+        """Get project counts for the dashboard overview."""
+        status_counts = ProjectRepository(db).count_by_status(user_id)
+        
+        total_projects = sum(status_counts.values())
+        active_projects = (
+            status_counts.get(ProjectStatus.IN_PROGRESS, 0)
+            + status_counts.get(ProjectStatus.PLANNING, 0)
+        )
+        completed_projects = status_counts.get(ProjectStatus.COMPLETED, 0)
         project_completion_rate = (completed_projects / total_projects * 100) if total_projects > 0 else 0
+        
+        return {
+            "total": total_projects,
+            "active": active_projects,
+            "completed": completed_projects,
+            "completion_rate": round(project_completion_rate, 1)
+        }
+    
+    def _get_task_overview(self, db: Session, user_id: int) -> Dict[str, Any]:
+        """Get task counts for the dashboard overview."""
+        counts = TaskRepository(db).get_task_counts(user_id)
+        
+        total_tasks = counts["total_tasks"]
+        active_tasks = sum(
+            counts["tasks_by_status"].get(status, 0)
+            for status in _ACTIVE_TASK_STATUSES
+        )
+        completed_tasks = counts["completed_tasks"]
+        overdue_tasks = counts["overdue_tasks"]
         task_completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
         
         return {
-            "projects": {
-                "total": total_projects,
-                "active": active_projects,
-                "completed": completed_projects,
-                "completion_rate": round(project_completion_rate, 1)
-            },
-            "tasks": {
-                "total": total_tasks,
-                "active": active_tasks,
-                "completed": completed_tasks,
-                "overdue": overdue_tasks,
-                "completion_rate": round(task_completion_rate, 1)
-            },
-            "recent_activity": self._get_recent_activity(user_id),
-            "upcoming_deadlines": self._get_upcoming_deadlines(user_id),
-            "performance_metrics": self._get_performance_metrics(user_id)
+            "total": total_tasks,
+            "active": active_tasks,
+            "completed": completed_tasks,
+            "overdue": overdue_tasks,
+            "completion_rate": round(task_completion_rate, 1)
         }
     
-    def get_project_analytics(self, project_id: int) -> Dict[str, Any]:
+    def get_project_analytics(self, db: Session, project_id: int) -> Dict[str, Any]:
         """
         Get detailed analytics for a specific project.
         
         Args:
+            db: Database session
             project_id: Project ID
             
         Returns:
             Dict containing project analytics
         """
-        project = self.project_repo.get(project_id)
+        project = ProjectRepository(db).get(project_id)
         if not project:
             return {}
         
         # Get project tasks
-        project_tasks = self.task_repo.get_project_tasks(project_id)
-        
-        # Task status distribution
-        task_status_distribution = {}
-        for task in project_tasks:
-            status = task.status
-            task_status_distribution[status] = task_status_distribution.get(status, 0) + 1
+        project_tasks = TaskRepository(db).get_project_tasks(project_id)
         
-        # Task priority distribution
-        task_priority_distribution = {}
-        for task in project_tasks:
-            priority = task.priority
-            task_priority_distribution[priority] = task_priority_distribution.get(priority, 0) + 1
+        # Task status and priority distributions
+        task_status_distribution = Counter(task.status for task in project_tasks)
+        task_priority_distribution = Counter(task.priority for task in project_tasks)
         
         # Calculate progress
         total_tasks = len(project_tasks)
-        completed_tasks = len([t for t in project_tasks if t.status == 'completed'])
+        completed_tasks = sum(1 for t in project_tasks if t.status == TaskStatus.COMPLETED)
         progress_percentage = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
         
         # Get assignee performance
@@ -138,46 +196,45 @@ class AnalyticsService:
             "timeline": timeline_data
         }
     
-    def get_user_performance_analytics(self, user_id: int, date_range: Optional[str] = None) -> Dict[str, Any]:
+    def get_user_performance_analytics(self, db: Session, user_id: int, date_range: Optional[str] = None) -> Dict[str, Any]:
         """
         Get user performance analytics.
         
         Args:
+            db: Database session
             user_id: User ID
             date_range: Optional date range filter (e.g., "30d", "7d")
             
         Returns:
             Dict containing user performance analytics
         """
-        # Get user's tasks
-        user_tasks = self.task_repo.get_user_tasks(user_id)
+        # Get user's tasks, date filtered in the query if specified
+        user_tasks = TaskRepository(db).get_user_tasks(
+            user_id,
+            created_since=self._date_range_start(date_range)
+        )
         
-        # Apply date filter if specified
-        if date_range:
-            user_tasks = self._filter_tasks_by_date_range(user_tasks, date_range)
-        
-        # Calculate performance metrics
+        # Calculate performance metrics and task distribution by project in one pass
         total_tasks = len(user_tasks)
-        completed_tasks = len([t for t in user_tasks if t.status == 'completed'])
-        overdue_tasks = len([t for t in user_tasks if self._is_task_overdue(t)])
-        
-        # Calculate average completion time
+        completed_tasks = 0
+        overdue_tasks = 0
         completion_times = []
+        task_distribution = Counter()
+        now = datetime.now(timezone.utc)
         for task in user_tasks:
-            if task.status == 'completed' and task.updated_at:
-                # This is a simplified calculation - in a real system you'd track actual completion time
-                completion_times.append(1)  # Placeholder
+            if task.status == TaskStatus.COMPLETED:
+                completed_tasks += 1
+                if task.updated_at:
+                    # This is a simplified calculation - in a real system you'd track actual completion time
+                    completion_times.append(1)  # Placeholder
+            elif self._is_task_overdue(task, now):
+                overdue_tasks += 1
+            task_distribution[task.project.name if task.project else "Unknown"] += 1
         
         avg_completion_time = sum(completion_times) / len(completion_times) if completion_times else 0
         
         # Get productivity trends
-        productivity_trends = self._get_productivity_trends(user_id, date_range)
-        
-        # Get task distribution by project
-        task_distribution = {}
-        for task in user_tasks:
-            project_name = task.project.name if task.project else "Unknown"
-            task_distribution[project_name] = task_distribution.get(project_name, 0) + 1
+        productivity_trends = self._get_productivity_trends(db, user_id, date_range)
         
         return {
             "overview": {
@@ -189,31 +246,47 @@ class AnalyticsService:
             },
             "productivity_trends": productivity_trends,
             "task_distribution": task_distribution,
-            "recent_activity": self._get_user_recent_activity(user_id, date_range)
+            "recent_activity": self._get_user_recent_activity(db, user_id, date_range)
         }
     
-    def get_team_analytics(self, team_members: List[int]) -> Dict[str, Any]:
+    def get_team_analytics(self, db: Session, team_members: List[int]) -> Dict[str, Any]:
         """
         Get team analytics.
         
         Args:
+            db: Database session
             team_members: List of user IDs in the team
             
         Returns:
             Dict containing team analytics
         """
+        if not team_members:
+            return {
+                "team_overview": {
+                    "total_members": 0,
+                    "total_tasks": 0,
+                    "total_completed": 0,
+                    "avg_completion_rate": 0
+                },
+                "member_performance": []
+            }
+        
+        # Members' names and task counts in a single grouped query
+        members = {
+            user_id: (full_name, total, completed)
+            for user_id, full_name, total, completed in TaskRepository(db).count_by_owner(team_members)
+        }
+        
         team_data = []
         
         for user_id in team_members:
-            user = self.user_repo.get(user_id)
-            if user:
-                user_tasks = self.task_repo.get_user_tasks(user_id)
-                completed_tasks = len([t for t in user_tasks if t.status == 'completed'])
-                total_tasks = len(user_tasks)
+            member = members.get(user_id)
+            if member:
+                full_name, total_tasks, completed_tasks = member
                 
                 team_data.append({
                     "user_id": user_id,
-                    "user_name": user.full_name,
+                    "user_name": full_name,
                     "total_tasks": total_tasks,
                     "completed_tasks": completed_tasks,
                     "completion_rate": (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
@@ -239,11 +312,12 @@ class AnalyticsService:
             "member_performance": team_data
         }
     
-    def generate_report(self, report_type: str, filters: Dict[str, Any] = None) -> Dict[str, Any]:
+    def generate_report(self, db: Session, report_type: str, filters: Dict[str, Any] = None) -> Dict[str, Any]:
         """
         Generate various types of reports.
         
         Args:
+            db: Database session
             report_type: Type of report to generate
             filters: Optional filters for the report
             
@@ -251,88 +325,76 @@ class AnalyticsService:
             Dict containing report data
         """
         if report_type == "project_summary":
-            return self._generate_project_summary_report(filters)
+            return self._generate_project_summary_report(db, filters)
         elif report_type == "task_performance":
-            return self._generate_task_performance_report(filters)
+            return self._generate_task_performance_report(db, filters)
         elif report_type == "user_productivity":
-            return self._generate_user_productivity_report(filters)
+            return self._generate_user_productivity_report(db, filters)
         elif report_type == "workflow_analytics":
-            return self._generate_workflow_analytics_report(filters)
+            return self._generate_workflow_analytics_report(db, filters)
         else:
             return {"error": "Unknown report type"}
     
-    def _is_task_overdue(self, task: Task) -> bool:
-        """Check if a task is overdue."""
-        if not task.due_date or task.status == 'completed':
+    def _is_task_overdue(self, task: Task, now: Optional[datetime] = None) -> bool:
+        """
+        Check if a task is overdue.
+        
+        Args:
+            task: Task to check
+            now: Reference time; callers checking many tasks pass one shared value
+            
+        Returns:
+            True if the task is open and past its due date
+        """
+        if not task.due_date or task.status == TaskStatus.COMPLETED:
             return False
-        return datetime.now() > task.due_date
+        return (now or datetime.now(timezone.utc)) > task.due_date
     
-    def _get_recent_activity(self, user_id: int) -> List[Dict[str, Any]]:
+    def _get_recent_activity(self, db: Session, user_id: int) -> List[Dict[str, Any]]:
         """Get recent activity for a user."""
         # This would typically query an activity log table
-        # For now, return recent tasks and projects
-        recent_tasks = self.task_repo.get_user_tasks(user_id, limit=5)
-        recent_projects = self.project_repo.get_user_projects(user_id, limit=5)
-        
-        activities = []
-        
-        for task in recent_tasks:
-            activities.append({
-                "type": "task",
-                "id": task.id,
-                "title": task.title,
-                "status": task.status,
-                "timestamp": task.updated_at.isoformat() if task.updated_at else None
-            })
-        
-        for project in recent_projects:
-            activities.append({
-                "type": "project",
-                "id": project.id,
-                "title": project.name,
-                "status": project.status,
-                "timestamp": project.updated_at.isoformat() if project.updated_at else None
-            })
-        
-        # Sort by timestamp
-        activities.sort(key=lambda x: x["timestamp"] or "", reverse=True)
-        return activities[:10]
+        # For now, return the most recently updated tasks and projects
+        return [
+            {
+                "type": entry["type"],
+                "id": entry["id"],
+                "title": entry["title"],
+                "status": entry["status"],
+                "timestamp": entry["updated_at"]
+            }
+            for entry in ProjectRepository(db).get_recent_activity(user_id)
+        ]
     
-    def _get_upcoming_deadlines(self, user_id: int) -> List[Dict[str, Any]]:
+    def _get_upcoming_deadlines(self, db: Session, user_id: int) -> List[Dict[str, Any]]:
         """Get upcoming deadlines for a user."""
-        user_tasks = self.task_repo.get_user_tasks(user_id)
-        upcoming_deadlines = []
+        # Only the five soonest tasks due within a week (0-7 whole days) are
+        # read, rather than loading every task and filtering here
+        now = datetime.now(timezone.utc)
+        tasks = TaskRepository(db).get_upcoming_deadlines(user_id, now, now + timedelta(days=8))
         
-        for task in user_tasks:
-            if task.due_date and task.status != 'completed':
-                days_until_due = (task.due_date - datetime.now()).days
-                if 0 <= days_until_due <= 7:  # Due within a week
-                    upcoming_deadlines.append({
-                        "task_id": task.id,
-                        "task_title": task.title,
-                        "project_name": task.project.name if task.project else "Unknown",
-                        "due_date": task.due_date.isoformat(),
-                        "days_until_due": days_until_due
-                    })
-        
-        # Sort by due date
-        upcoming_deadlines.sort(key=lambda x: x["days_until_due"])
-        return upcoming_deadlines[:5]
+        return [
+            {
+                "task_id": task.id,
+                "task_title": task.title,
+                "project_name": task.project_name,
+                "due_date": task.due_date,
+                "days_until_due": (task.due_date - now).days
+            }
+            for task in tasks
+        ]
     
-    def _get_performance_metrics(self, user_id: int) -> Dict[str, Any]:
+    def _get_performance_metrics(self, db: Session, user_id: int) -> Dict[str, Any]:
         """Get performance metrics for a user."""
-        user_tasks = self.task_repo.get_user_tasks(user_id)
+        counts = TaskRepository(db).get_task_counts(user_id)
         
         # Calculate metrics
-        total_tasks = len(user_tasks)
-        completed_tasks = len([t for t in user_tasks if t.status == 'completed'])
-        overdue_tasks = len([t for t in user_tasks if self._is_task_overdue(t)])
+        total_tasks = counts["total_tasks"]
+        completed_tasks = counts["completed_tasks"]
+        overdue_tasks = counts["overdue_tasks"]
         
-        # Calculate efficiency (tasks completed on time)
-        on_time_completions = 0
-        for task in user_tasks:
-            if task.status == 'completed' and not self._is_task_overdue(task):
-                on_time_completions += 1
+        # Calculate efficiency (tasks completed on time); completed tasks
+        # are never counted as overdue, so every completion is on time
+        on_time_completions = completed_tasks
         
         efficiency_rate = (on_time_completions / total_tasks * 100) if total_tasks > 0 else 0
         
@@ -345,22 +407,24 @@ class AnalyticsService:
     def _get_assignee_performance(self, tasks: List[Task]) -> Dict[str, Any]:
         """Get performance data by assignee."""
         assignee_stats = {}
+        now = datetime.now(timezone.utc)
         
         for task in tasks:
             if task.assignee_id:
                 assignee_name = task.assignee.full_name if task.assignee else "Unknown"
-                if assignee_name not in assignee_stats:
-                    assignee_stats[assignee_name] = {
+                stats = assignee_stats.get(assignee_name)
+                if stats is None:
+                    stats = assignee_stats[assignee_name] = {
                         "total_tasks": 0,
                         "completed_tasks": 0,
                         "overdue_tasks": 0
                     }
                 
-                assignee_stats[assignee_name]["total_tasks"] += 1
-                if task.status == 'completed':
-                    assignee_stats[assignee_name]["completed_tasks"] += 1
-                if self._is_task_overdue(task):
-                    assignee_stats[assignee_name]["overdue_tasks"] += 1
+                stats["total_tasks"] += 1
+                if task.status == TaskStatus.COMPLETED:
+                    stats["completed_tasks"] += 1
+                elif self._is_task_overdue(task, now):
+                    stats["overdue_tasks"] += 1
         
         # Calculate completion rates
         for assignee in assignee_stats:
@@ -376,7 +440,7 @@ class AnalyticsService:
         # For now, return basic project timeline
         timeline = [
             {
-                "date": project.created_at.isoformat() if project.created_at else None,
+                "date": project.created_at,
                 "event": "Project Created",
                 "description": f"Project '{project.name}' was created"
             }
@@ -384,124 +448,100 @@ class AnalyticsService:
         
         if project.updated_at and project.updated_at != project.created_at:
             timeline.append({
-                "date": project.updated_at.isoformat(),
+                "date": project.updated_at,
                 "event": "Project Updated",
                 "description": f"Project '{project.name}' was last updated"
             })
         
         return timeline
     
-    def _get_productivity_trends(self, user_id: int, date_range: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Get productivity trends for a user."""
-        # This would typically calculate trends over time
-        # For now, return placeholder data
-        return [
-            {"date": "2024-01-01", "tasks_completed": 5},
-            {"date": "2024-01-02", "tasks_completed": 8},
-            {"date": "2024-01-03", "tasks_completed": 3},
-            {"date": "2024-01-04", "tasks_completed": 7},
-            {"date": "2024-01-05", "tasks_completed": 6}
-        ]
+    def _get_productivity_trends(self, db: Session, user_id: int, date_range: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get daily completed task counts for a user, bucketed in the database."""
+        days = {"7d": 7, "30d": 30, "90d": 90}.get(date_range, 30)
+        start = datetime.now(timezone.utc).date() - timedelta(days=days - 1)
+        since = datetime.combine(start, datetime.min.time(), tzinfo=timezone.utc)
+        
+        counts = {
+            str(day): count
+            for day, count in TaskRepository(db).count_completed_by_day(user_id, since)
+        }
+        
+        trends = []
+        for offset in range(days):
+            date = (start + timedelta(days=offset)).isoformat()
+            trends.append({"date": date, "tasks_completed": counts.get(date, 0)})
+        return trends
     
-    def _get_user_recent_activity(self, user_id: int, date_range: Optional[str] = None) -> List[Dict[str, Any]]:
+    def _get_user_recent_activity(self, db: Session, user_id: int, date_range: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get recent activity for a user."""
-        return self._get_recent_activity(user_id)
+        return self._get_recent_activity(db, user_id)
     
-    def _filter_tasks_by_date_range(self, tasks: List[Task], date_range: str) -> List[Task]:
-        """Filter tasks by date range."""
-        now = datetime.now()
-        
-        if date_range == "7d":
-            cutoff_date = now - timedelta(days=7)
-        elif date_range == "30d":
-            cutoff_date = now - timedelta(days=30)
-        elif date_range == "90d":
-            cutoff_date = now - timedelta(days=90)
-        else:
-            return tasks
-        
-        return [task for task in tasks if task.created_at and task.created_at >= cutoff_date]
+    def _date_range_start(self, date_range: Optional[str]) -> Optional[datetime]:
+        """Get the start of a date range, or None if the range is not recognised."""
+        days = {"7d": 7, "30d": 30, "90d": 90}.get(date_range)
+        if days is None:
+            return None
+        return datetime.now(timezone.utc) - timedelta(days=days)
     
-    def _generate_project_summary_report(self, filters: Dict[str, Any] = None) -> Dict[str, Any]:
+    def _generate_project_summary_report(self, db: Session, filters: Dict[str, Any] = None) -> Dict[str, Any]:
         """Generate project summary report."""
-        projects = self.project_repo.get_all()
+        projects = ProjectRepository(db).get_all()
         
         report_data = {
             "total_projects": len(projects),
-            "active_projects": len([p for p in projects if p.status in ['in_progress', 'planning']]),
-            "completed_projects": len([p for p in projects if p.status == 'completed']),
-            "projects_by_status": {},
+            "active_projects": sum(1 for p in projects if p.status in _ACTIVE_PROJECT_STATUSES),
+            "completed_projects": sum(1 for p in projects if p.status == ProjectStatus.COMPLETED),
+            "projects_by_status": Counter(project.status for project in projects),
             "projects_by_priority": {}
         }
         
-        for project in projects:
-            # Status distribution
-            status = project.status
-            report_data["projects_by_status"][status] = report_data["projects_by_status"].get(status, 0) + 1
-        
         return report_data
     
-    def _generate_task_performance_report(self, filters: Dict[str, Any] = None) -> Dict[str, Any]:
+    def _generate_task_performance_report(self, db: Session, filters: Dict[str, Any] = None) -> Dict[str, Any]:
         """Generate task performance report."""
-        tasks = self.task_repo.get_all()
-        
-        report_data = {
-            "total_tasks": len(tasks),
-            "completed_tasks": len([t for t in tasks if t.status == 'completed']),
-            "overdue_tasks": len([t for t in tasks if self._is_task_overdue(t)]),
-            "tasks_by_status": {},
-            "tasks_by_priority": {}
-        }
-        
-        for task in tasks:
-            # Status distribution
-            status = task.status
-            report_data["tasks_by_status"][status] = report_data["tasks_by_status"].get(status, 0) + 1
-            
-            # Priority distribution
-            priority = task.priority
-            report_data["tasks_by_priority"][priority] = report_data["tasks_by_priority"].get(priority, 0) + 1
-        
-        return report_data
+        # Counted in one aggregate query over all tasks rather than by loading them
+        return TaskRepository(db).get_task_counts()
     
-    def _generate_user_productivity_report(self, filters: Dict[str, Any] = None) -> Dict[str, Any]:
+    def _generate_user_productivity_report(self, db: Session, filters: Dict[str, Any] = None) -> Dict[str, Any]:
         """Generate user productivity report."""
-        users = self.user_repo.get_all()
+        user_performance = list(self.iter_user_productivity(db))
         
-        report_data = {
-            "total_users": len(users),
-            "user_performance": []
+        return {
+            "total_users": len(user_performance),
+            "user_performance": user_performance
         }
+    
+    def iter_user_productivity(self, db: Session, batch_size: int = 500) -> Iterator[Dict[str, Any]]:
+        """
+        Yield user productivity rows from one grouped query, fetched in batches.
         
-        for user in users:
-            user_tasks = self.task_repo.get_user_tasks(user.id)
-            completed_tasks = len([t for t in user_tasks if t.status == 'completed'])
-            total_tasks = len(user_tasks)
+        Args:
+            db: Database session
+            batch_size: Number of rows fetched per round-trip
             
-            report_data["user_performance"].append({
-                "user_id": user.id,
-                "user_name": user.full_name,
+        Yields:
+            Dict containing one user's productivity data
+        """
+        for user_id, user_name, total_tasks, completed_tasks in TaskRepository(db).iter_counts_per_owner(batch_size):
+            yield {
+                "user_id": user_id,
+                "user_name": user_name,
                 "total_tasks": total_tasks,
                 "completed_tasks": completed_tasks,
                 "completion_rate": (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
-            })
-        
-        return report_data
+            }
     
-    def _generate_workflow_analytics_report(self, filters: Dict[str, Any] = None) -> Dict[str, Any]:
+    def _generate_workflow_analytics_report(self, db: Session, filters: Dict[str, Any] = None) -> Dict[str, Any]:
         """Generate workflow analytics report."""
-        workflow_instances = self.workflow_repo.get_all()
+        rows = WorkflowInstanceRepository(db).count_by_stage()
         
-        report_data = {
-            "total_instances": len(workflow_instances),
-            "completed_instances": len([w for w in workflow_instances if w.is_completed]),
-            "instances_by_stage": {},
+        return {
+            "total_instances": sum(total for _, total, _ in rows),
+            "completed_instances": sum(completed for _, _, completed in rows),
+            "instances_by_stage": {stage: total for stage, total, _ in rows},
             "workflow_performance": {}
         }
-        
-        for instance in workflow_instances:
-            # Stage distribution
-            stage = instance.current_stage
-            report_data["instances_by_stage"][stage] = report_data["instances_by_stage"].get(stage, 0) + 1
-        
-        return report_data 
\ No newline at end of file
+
+
+# Global analytics service instance
+analytics_service = AnalyticsService()
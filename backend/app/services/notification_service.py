@@ -4,10 +4,12 @@ Notification service for automated processes and alerts.
 
 import smtplib
 import json
-from email.mime.text import MimeText
-from email.mime.multipart import MimeMultipart
+import threading
+import time
+from email.message import EmailMessage
 from typing import List, Dict, Any, Optional
 from datetime import datetime
+from fastapi.concurrency import run_in_threadpool
 import logging
 
 from ..config import settings
@@ -17,6 +19,9 @@ from ..models.task import Task
 
 logger = logging.getLogger(__name__)
 
+# A pooled connection idle for longer than this is probed with NOOP before reuse
+SMTP_IDLE_CHECK_SECONDS = 60
+
 
 class NotificationService:
     """
@@ -29,6 +34,60 @@ class NotificationService:
         self.smtp_username = settings.smtp_username
         self.smtp_password = settings.smtp_password
         self.from_email = settings.from_email
+        # One SMTP connection is kept open and reused across sends
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._smtp_last_used = 0.0
+        self._smtp_lock = threading.Lock()
+    
+    def _connect(self) -> smtplib.SMTP:
+        """Open and authenticate a new SMTP connection."""
+        server = smtplib.SMTP(self.smtp_server, self.smtp_port)
+        try:
+            server.starttls()
+            server.login(self.smtp_username, self.smtp_password)
+        except Exception:
+            server.close()
+            raise
+        return server
+    
+    def _reset_connection(self) -> None:
+        """Drop the pooled SMTP connection."""
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                self._smtp.close()
+            self._smtp = None
+    
+    def _send_message(self, msg: EmailMessage) -> None:
+        """
+        Send a message over the pooled SMTP connection.
+        
+        The connection is opened on first use and reopened once if the
+        server has dropped it.
+        
+        Args:
+            msg: Message to send
+        """
+        with self._smtp_lock:
+            for attempt in range(2):
+                try:
+                    if self._smtp is None:
+                        self._smtp = self._connect()
+                    elif time.monotonic() - self._smtp_last_used > SMTP_IDLE_CHECK_SECONDS:
+                        self._smtp.noop()
+                    self._smtp.send_message(msg)
+                    self._smtp_last_used = time.monotonic()
+                    return
+                except (smtplib.SMTPServerDisconnected, OSError):
+                    self._reset_connection()
+                    if attempt:
+                        raise
+    
+    def close(self) -> None:
+        """Close the pooled SMTP connection, if any."""
+        with self._smtp_lock:
+            self._reset_connection()
     
     async def send_email_notification(
         self,
@@ -54,25 +113,18 @@ class NotificationService:
                 logger.warning("SMTP configuration not set up")
                 return False
             
-            msg = MimeMultipart('alternative')
+            msg = EmailMessage()
             msg['Subject'] = subject
             msg['From'] = self.from_email
             msg['To'] = ', '.join(to_emails)
             
-            # Add plain text part
-            text_part = MimeText(body, 'plain')
-            msg.attach(text_part)
-            
-            # Add HTML part if provided
+            # Plain text body, with the HTML version as an alternative if provided
+            msg.set_content(body)
             if html_body:
-                html_part = MimeText(html_body, 'html')
-                msg.attach(html_part)
+                msg.add_alternative(html_body, subtype='html')
             
-            # Send email
-            with smtplib.SMTP(self.smtp_server, self.smtp_port) as server:
-                server.starttls()
-                server.login(self.smtp_username, self.smtp_password)
-                server.send_message(msg)
+            # Send email without blocking the event loop
+            await run_in_threadpool(self._send_message, msg)
             
             logger.info(f"Email notification sent to {to_emails}")
             return True
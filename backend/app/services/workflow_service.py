@@ -0,0 +1,69 @@
+"""
+Workflow service for side effects of workflow stage transitions.
+"""
+
+from typing import Dict, Any, List, Optional
+import logging
+
+from ..database import SessionLocal
+from ..repositories.workflow_repository import BusinessRuleRepository
+
+logger = logging.getLogger(__name__)
+
+
+class WorkflowService:
+    """
+    Service for work triggered by workflow stage transitions.
+    
+    Transition effects run after the response has been sent, so each call
+    opens its own database session instead of borrowing the request's.
+    """
+    
+    def apply_transition_effects(
+        self,
+        instance_id: int,
+        project_id: int,
+        from_stage: str,
+        to_stage: str,
+        triggered_by: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Evaluate business rules for a completed stage transition.
+        
+        Args:
+            instance_id: Workflow instance ID
+            project_id: Project ID of the instance
+            from_stage: Previous stage
+            to_stage: New stage
+            triggered_by: User ID who triggered the transition
+            
+        Returns:
+            List[Dict[str, Any]]: Triggered rules and their actions
+        """
+        context = {
+            "instance_id": instance_id,
+            "project_id": project_id,
+            "from_stage": from_stage,
+            "stage": to_stage,
+            "triggered_by": triggered_by
+        }
+        
+        db = SessionLocal()
+        try:
+            triggered_rules = BusinessRuleRepository(db).evaluate_rules(context)
+        except Exception as e:
+            logger.error(f"Failed to apply transition effects for instance {instance_id}: {e}")
+            return []
+        finally:
+            db.close()
+        
+        for rule in triggered_rules:
+            logger.info(
+                f"Rule '{rule['rule_name']}' triggered by instance {instance_id} "
+                f"({from_stage} -> {to_stage}): {rule['actions']}"
+            )
+        return triggered_rules
+
+
+# Global workflow service instance
+workflow_service = WorkflowService()
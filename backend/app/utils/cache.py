@@ -0,0 +1,291 @@
+"""
+Redis-backed response caching for read-heavy API routes.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar, Union
+
+import orjson
+from fastapi import Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+
+try:
+    import redis
+except ImportError:  # Optional dependency; without it caching is disabled
+    redis = None
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = "pm-cache"
+ANALYTICS_NAMESPACE = "analytics"
+WORKFLOWS_NAMESPACE = "workflows"
+
+# Arguments injected by FastAPI dependencies that must never end up in a key
+_EXCLUDED_ARGS = {"db", "current_user"}
+
+# Seconds to wait before retrying Redis after a connection failure
+_RETRY_AFTER = 30
+
+# In-process caches registered with a namespace: TTLCache or plain dict
+CacheT = TypeVar("CacheT", "TTLCache", dict)
+
+_client: Optional["redis.Redis"] = None
+_unavailable_until: float = 0.0
+
+# In-process caches cleared together with their Redis namespace
+_local_caches: Dict[str, List[Union["TTLCache", dict]]] = {}
+
+
+class TTLCache:
+    """
+    Small thread-safe in-process cache with per-entry expiry.
+    
+    Used for hot lookups that must not depend on Redis being available.
+    The oldest entries are evicted once max_size is reached.
+    """
+    
+    def __init__(self, ttl: float, max_size: int = 10000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._data: "OrderedDict[Any, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Any) -> Any:
+        """
+        Get a cached value.
+        
+        Args:
+            key: Cache key
+            
+        Returns:
+            Any: Cached value, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            return value
+    
+    def set(self, key: Any, value: Any) -> None:
+        """
+        Store a value for the cache TTL.
+        
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+    
+    def delete(self, key: Any) -> None:
+        """
+        Remove a cached value if present.
+        
+        Args:
+            key: Cache key
+        """
+        with self._lock:
+            self._data.pop(key, None)
+    
+    def clear(self) -> None:
+        """Remove all cached values."""
+        with self._lock:
+            self._data.clear()
+
+
+def register_local_cache(namespace: str, cache: CacheT) -> CacheT:
+    """
+    Tie an in-process cache to a namespace so invalidate_cache clears it.
+    
+    Args:
+        namespace: Cache namespace
+        cache: In-process cache to register, a TTLCache or a plain dict
+        
+    Returns:
+        The registered cache
+    """
+    _local_caches.setdefault(namespace, []).append(cache)
+    return cache
+
+
+def get_redis() -> Optional["redis.Redis"]:
+    """
+    Get the shared Redis client.
+
+    Returns:
+        Optional[redis.Redis]: Redis client, or None if caching is disabled,
+        the redis package is not installed or Redis recently failed
+    """
+    global _client
+    if redis is None or not settings.cache_enabled or time.monotonic() < _unavailable_until:
+        return None
+    if _client is None:
+        _client = redis.Redis.from_url(
+            settings.redis_url,
+            socket_connect_timeout=0.5,
+            socket_timeout=0.5
+        )
+    return _client
+
+
+def _mark_unavailable(error: Exception) -> None:
+    """Back off from Redis for a while after a failure."""
+    global _unavailable_until
+    _unavailable_until = time.monotonic() + _RETRY_AFTER
+    logger.warning(f"Redis cache unavailable: {error}")
+
+
+def build_cache_key(namespace: str, func: Callable, kwargs: dict, per_user: bool = True) -> str:
+    """
+    Build a cache key from the route, the caller and its parameters.
+
+    Args:
+        namespace: Cache namespace
+        func: Route function
+        kwargs: Route keyword arguments
+        per_user: Whether to scope the key to the current user
+
+    Returns:
+        str: Cache key
+    """
+    params = {k: v for k, v in kwargs.items() if k not in _EXCLUDED_ARGS}
+    digest = hashlib.sha1(
+        json.dumps(jsonable_encoder(params), sort_keys=True).encode()
+    ).hexdigest()
+
+    user = kwargs.get("current_user") if per_user else None
+    scope = f"user:{user.id}" if user is not None else "shared"
+    return f"{CACHE_PREFIX}:{namespace}:{func.__name__}:{scope}:{digest}"
+
+
+def _version_key(namespace: str) -> str:
+    """Key of the counter that invalidate_cache bumps for a namespace."""
+    return f"{CACHE_PREFIX}:{namespace}:version"
+
+
+def _get(namespace: str, key: str) -> Tuple[Optional[str], Optional[bytes]]:
+    """
+    Read a cached JSON body, treating Redis errors as a miss.
+    
+    Entries are stored under the namespace's current version, so bumping
+    the version invalidates them all at once; old entries simply expire.
+    
+    Returns:
+        Tuple[Optional[str], Optional[bytes]]: Versioned key to store a
+        fresh result under (None if Redis is unavailable) and the cached body
+    """
+    client = get_redis()
+    if client is None:
+        return None, None
+    try:
+        version = int(client.get(_version_key(namespace)) or 0)
+        versioned_key = f"{key}:v{version}"
+        return versioned_key, client.get(versioned_key)
+    except redis.RedisError as e:
+        _mark_unavailable(e)
+        return None, None
+
+
+def _set(key: Optional[str], value: Any, expire: int) -> bytes:
+    """
+    Serialize a route result to JSON and store it if a key is given.
+    
+    orjson encodes datetimes, enums and enum-keyed dicts natively; anything
+    else (such as pydantic models) falls back to jsonable_encoder.
+    """
+    data = orjson.dumps(value, default=jsonable_encoder, option=orjson.OPT_NON_STR_KEYS)
+    client = get_redis() if key is not None else None
+    if client is not None:
+        try:
+            client.set(key, data, ex=expire)
+        except redis.RedisError as e:
+            _mark_unavailable(e)
+    return data
+
+
+def _json_response(data: bytes) -> Response:
+    """Wrap an already serialized JSON body, skipping FastAPI's re-encoding."""
+    return Response(content=data, media_type="application/json")
+
+
+def cached(namespace: str, expire: Optional[int] = None, per_user: bool = True) -> Callable:
+    """
+    Cache a route's JSON-serializable result in Redis.
+
+    Works for both sync and async routes; for async routes the Redis calls
+    run in the threadpool so a slow Redis never blocks the event loop.
+    Caching fails open: if Redis is unreachable the route is simply
+    executed. Results are serialized once and returned as a ready JSON
+    response, on hits and misses alike.
+
+    Args:
+        namespace: Cache namespace used for invalidation
+        expire: Time to live in seconds (defaults to settings.cache_ttl)
+        per_user: Whether to scope entries to the current user
+
+    Returns:
+        Callable: Route decorator
+    """
+    ttl = expire if expire is not None else settings.cache_ttl
+
+    def decorator(func: Callable) -> Callable:
+        if asyncio.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                key, hit = await run_in_threadpool(
+                    _get, namespace, build_cache_key(namespace, func, kwargs, per_user)
+                )
+                if hit is not None:
+                    return _json_response(hit)
+                result = await func(*args, **kwargs)
+                return _json_response(await run_in_threadpool(_set, key, result, ttl))
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key, hit = _get(namespace, build_cache_key(namespace, func, kwargs, per_user))
+            if hit is not None:
+                return _json_response(hit)
+            return _json_response(_set(key, func(*args, **kwargs), ttl))
+        return wrapper
+
+    return decorator
+
+
+def invalidate_cache(namespace: str) -> None:
+    """
+    Drop every cached entry in a namespace.
+
+    Redis entries are invalidated by bumping the namespace version, a single
+    O(1) INCR, rather than scanning for and deleting their keys.
+
+    Args:
+        namespace: Cache namespace to clear
+    """
+    for cache in _local_caches.get(namespace, []):
+        cache.clear()
+    
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        client.incr(_version_key(namespace))
+    except redis.RedisError as e:
+        _mark_unavailable(e)
@@ -0,0 +1,51 @@
+"""
+Date parsing utilities.
+"""
+
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional
+
+
+@lru_cache(maxsize=4096)
+def parse_flexible_date(value: Optional[str]) -> Optional[datetime]:
+    """
+    Parse a YYYY-MM-DD or ISO 8601 date string.
+    
+    Both forms go through the C-implemented datetime.fromisoformat. A
+    trailing 'Z' is rewritten to '+00:00' first, since fromisoformat only
+    accepts it from Python 3.11 on and the deploy runtime is 3.10. Results
+    are memoized since bulk payloads tend to repeat the same dates.
+    
+    Args:
+        value: Date string
+        
+    Returns:
+        Optional[datetime]: Parsed datetime, None if empty or invalid
+    """
+    if not value:
+        return None
+    
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def format_datetime(value: Optional[datetime]) -> Optional[str]:
+    """
+    Format a datetime as ISO 8601.
+    
+    Not memoized: aware datetimes in different zones compare and hash
+    equal, so a value-keyed cache would return the wrong offset.
+    
+    Args:
+        value: Datetime to format
+        
+    Returns:
+        Optional[str]: ISO 8601 string, None if value is None
+    """
+    return value.isoformat() if value else None
@@ -0,0 +1,28 @@
+"""
+Response helpers for API routes.
+"""
+
+from fastapi import Response, status
+from pydantic import BaseModel
+
+
+def model_json_response(model: BaseModel, status_code: int = status.HTTP_200_OK) -> Response:
+    """
+    Serialize a response model straight to JSON.
+    
+    pydantic-core writes the JSON without building an intermediate dict, and
+    returning a Response skips FastAPI's second validation against the
+    route's response_model, which is kept for the OpenAPI schema.
+    
+    Args:
+        model: Already validated response model
+        status_code: HTTP status code
+        
+    Returns:
+        Response: JSON response
+    """
+    return Response(
+        content=model.model_dump_json(),
+        media_type="application/json",
+        status_code=status_code
+    )
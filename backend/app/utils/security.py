@@ -4,13 +4,23 @@ Security utilities for password hashing and JWT token generation.
 
 from datetime import datetime, timedelta
 from typing import Optional
+import hashlib
+import hmac
 from passlib.context import CryptContext
 from jose import jwt
 
 from ..config import settings
+from .cache import TTLCache
 
 # Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.bcrypt_rounds
+)
+
+# Recently failed login attempts, so repeated guesses skip the bcrypt check
+failed_login_cache = TTLCache(ttl=settings.failed_login_cache_ttl)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -27,6 +37,24 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def login_attempt_key(email: str, password: str) -> str:
+    """
+    Build a cache key for a login attempt without storing the password.
+    
+    Args:
+        email: Login email
+        password: Plain text password
+        
+    Returns:
+        str: Keyed digest of the credentials
+    """
+    return hmac.new(
+        settings.secret_key.encode(),
+        f"{email}:{password}".encode(),
+        hashlib.sha256
+    ).hexdigest()
+
+
 def get_password_hash(password: str) -> str:
     """
     Hash a password using bcrypt.
@@ -3,8 +3,18 @@ Validation utilities for data validation.
 """
 
 import re
+import string
 from typing import Tuple
 
+# Patterns are compiled once at import time
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_USERNAME_RE = re.compile(r'^[a-zA-Z0-9_]+$')
+
+_UPPERCASE = frozenset(string.ascii_uppercase)
+_LOWERCASE = frozenset(string.ascii_lowercase)
+_DIGITS = frozenset(string.digits)
+_SPECIAL = frozenset('!@#$%^&*(),.?":{}|<>')
+
 
 def validate_email(email: str) -> Tuple[bool, str]:
     """
@@ -19,15 +29,13 @@ def validate_email(email: str) -> Tuple[bool, str]:
     if not email:
         return False, "Email is required"
     
-    # Basic email regex pattern
-    pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    
-    if not re.match(pattern, email):
-        return False, "Invalid email format"
-    
+    # Check the length first so the regex never runs on oversized input
     if len(email) > 255:
         return False, "Email is too long (max 255 characters)"
     
+    if not _EMAIL_RE.match(email):
+        return False, "Invalid email format"
+    
     return True, ""
 
 
@@ -50,20 +58,22 @@ def validate_password(password: str) -> Tuple[bool, str]:
     if len(password) > 128:
         return False, "Password is too long (max 128 characters)"
     
+    characters = set(password)
+    
     # Check for at least one uppercase letter
-    if not re.search(r'[A-Z]', password):
+    if characters.isdisjoint(_UPPERCASE):
         return False, "Password must contain at least one uppercase letter"
     
     # Check for at least one lowercase letter
-    if not re.search(r'[a-z]', password):
+    if characters.isdisjoint(_LOWERCASE):
         return False, "Password must contain at least one lowercase letter"
     
     # Check for at least one digit
-    if not re.search(r'\d', password):
+    if characters.isdisjoint(_DIGITS):
         return False, "Password must contain at least one digit"
     
     # Check for at least one special character
-    if not re.search(r'[!@#$%^&*(),.?":{}|<>]', password):
+    if characters.isdisjoint(_SPECIAL):
         return False, "Password must contain at least one special character"
     
     return True, ""
@@ -89,7 +99,7 @@ def validate_username(username: str) -> Tuple[bool, str]:
         return False, "Username is too long (max 50 characters)"
     
     # Check for alphanumeric characters and underscores only
-    if not re.match(r'^[a-zA-Z0-9_]+$', username):
+    if not _USERNAME_RE.match(username):
         return False, "Username can only contain letters, numbers, and underscores"
     
     # Check for consecutive underscores
@@ -0,0 +1,109 @@
+"""
+Shared pytest fixtures for the backend tests.
+
+Tests run against an in-memory SQLite database with caching disabled. The
+settings are read when the app modules are imported, so they are set here
+before any app import.
+"""
+
+import os
+
+os.environ["database_url"] = "sqlite://"
+os.environ["environment"] = "test"
+os.environ["cache_enabled"] = "false"
+
+from typing import List
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.orm import Session, raiseload
+
+from app.api import auth, projects, tasks, workflows
+from app.api.deps import get_current_active_user
+from app.database import Base, SessionLocal, engine, get_db
+from app.models.user import User
+from app.utils.cache import ANALYTICS_NAMESPACE, WORKFLOWS_NAMESPACE, invalidate_cache
+
+
+@pytest.fixture
+def db() -> Session:
+    """Database session on a freshly created schema."""
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
+        # In-process caches outlive the schema; drop what this test filled
+        invalidate_cache(ANALYTICS_NAMESPACE)
+        invalidate_cache(WORKFLOWS_NAMESPACE)
+
+
+@pytest.fixture
+def user(db: Session) -> User:
+    """A persisted active user."""
+    user = User(
+        email="alice@example.com",
+        username="alice",
+        full_name="Alice",
+        password_hash="not-a-real-hash"
+    )
+    db.add(user)
+    db.commit()
+    return user
+
+
+@pytest.fixture
+def strict_loading(db: Session) -> None:
+    """
+    Add raiseload('*') to every ORM query of the session.
+
+    Relationships a query does not eager-load explicitly then raise on
+    access instead of lazy loading.
+    """
+    def add_raiseload(state):
+        if state.is_select:
+            state.statement = state.statement.options(raiseload("*"))
+
+    event.listen(db, "do_orm_execute", add_raiseload)
+    yield
+    event.remove(db, "do_orm_execute", add_raiseload)
+
+
+@pytest.fixture
+def query_counter() -> List[str]:
+    """
+    Record every SQL statement sent to the database during the test.
+    
+    Clear the returned list before the code under test to count only its
+    statements.
+    """
+    statements: List[str] = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def client(db: Session, user: User) -> TestClient:
+    """
+    API client authenticated as the test user, sharing the test session.
+    
+    app.main mounts every router on the same prefix, where their "/" routes
+    shadow each other, so each router gets its own prefix here.
+    """
+    app = FastAPI(default_response_class=ORJSONResponse)
+    routers = (("/auth", auth), ("/projects", projects), ("/tasks", tasks), ("/workflows", workflows))
+    for prefix, module in routers:
+        app.include_router(module.router, prefix=prefix)
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_active_user] = lambda: user
+    return TestClient(app)
@@ -1 +1,459 @@
- 
\ No newline at end of file
+"""
+Backend tests for data access and API behaviour.
+"""
+
+import asyncio
+import re
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select, text, update
+from sqlalchemy.orm import Session
+
+from app.config import Settings
+from app.database import engine
+from app.models.project import Project, ProjectStatus
+from app.models.task import Task, TaskPriority, TaskStatus, ensure_project_counters
+from app.models.user import User
+from app.models.workflow import BusinessRule, Workflow, WorkflowInstance, WorkflowType
+from app.repositories.project_repository import ProjectRepository
+from app.repositories.task_repository import TaskRepository
+from app.repositories.user_repository import UserRepository
+from app.repositories.workflow_repository import BusinessRuleRepository, WorkflowInstanceRepository
+from app.schemas.project import ProjectResponse
+from app.schemas.task import TaskResponse, TaskUpdate
+from app.schemas.workflow import BusinessRuleCreate
+from app.services.analytics_service import AnalyticsService, analytics_service
+from app.utils.cache import ANALYTICS_NAMESPACE, invalidate_cache
+from app.utils.dates import format_datetime, parse_flexible_date
+
+
+def _create_project_with_tasks(db: Session, owner: User, name: str = "Project", tasks: int = 3) -> Project:
+    """Persist a project owned by a user with a number of assigned tasks."""
+    project = Project(name=name, owner_id=owner.id)
+    db.add(project)
+    db.flush()
+    db.add_all(
+        Task(
+            title=f"{name} task {i}",
+            project_id=project.id,
+            assignee_id=owner.id,
+            status=TaskStatus.TODO,
+            priority=TaskPriority.MEDIUM
+        )
+        for i in range(tasks)
+    )
+    db.commit()
+    db.expunge_all()
+    return project
+
+
+def test_user_projects_serialize_without_lazy_loads(db, user, strict_loading):
+    """Projects listed for a user serialize without touching unloaded relationships."""
+    _create_project_with_tasks(db, user, "First")
+    _create_project_with_tasks(db, user, "Second")
+
+    projects = ProjectRepository(db).get_user_projects(user.id)
+
+    responses = [ProjectResponse.model_validate(project).model_dump() for project in projects]
+    assert sorted(response["name"] for response in responses) == ["First", "Second"]
+
+
+def test_user_tasks_serialize_without_lazy_loads(db, user, strict_loading):
+    """Tasks listed for a user serialize, including project and assignee names, without lazy loads."""
+    _create_project_with_tasks(db, user, "First", tasks=2)
+
+    tasks = TaskRepository(db).get_user_tasks(user.id)
+
+    responses = [TaskResponse.model_validate(task).model_dump() for task in tasks]
+    assert len(responses) == 2
+    assert {response["project_name"] for response in responses} == {"First"}
+    assert {response["assignee_name"] for response in responses} == {"Alice"}
+
+
+def test_parse_flexible_date_accepts_trailing_z():
+    """A trailing 'Z' parses as UTC rather than being dropped."""
+    parsed = parse_flexible_date("2024-03-01T12:30:00Z")
+
+    assert parsed == datetime(2024, 3, 1, 12, 30, tzinfo=timezone.utc)
+    assert parse_flexible_date("2024-03-01") == datetime(2024, 3, 1)
+    assert parse_flexible_date("not a date") is None
+
+
+def test_format_datetime_keeps_offset_of_equal_instants():
+    """Equal instants in different zones keep their own offsets."""
+    utc = datetime(2024, 3, 1, 12, 0, tzinfo=timezone.utc)
+    ist = utc.astimezone(timezone(timedelta(hours=5, minutes=30)))
+
+    assert format_datetime(utc) == "2024-03-01T12:00:00+00:00"
+    assert format_datetime(ist) == "2024-03-01T17:30:00+05:30"
+
+
+def test_update_task_by_id_parses_due_date(db, user):
+    """String due dates in a task update are stored as datetimes."""
+    _create_project_with_tasks(db, user, tasks=1)
+    task_repo = TaskRepository(db)
+    task_id = task_repo.get_user_tasks(user.id)[0].id
+
+    updated = task_repo.update_by_id(task_id, TaskUpdate(due_date="2024-03-01T12:30:00Z"))
+    assert updated.due_date.replace(tzinfo=None) == datetime(2024, 3, 1, 12, 30)
+
+    cleared = task_repo.update_by_id(task_id, TaskUpdate(due_date=""))
+    assert cleared.due_date is None
+
+
+def _counters(db: Session, project_id: int) -> tuple:
+    """Read a project's task counters straight from the database."""
+    return db.execute(
+        text("SELECT tasks_total, tasks_completed, tasks_active FROM projects WHERE id = :id"),
+        {"id": project_id}
+    ).one()
+
+
+def _task_ids(db: Session, project_id: int) -> list:
+    """IDs of a project's tasks in creation order."""
+    return db.scalars(select(Task.id).where(Task.project_id == project_id).order_by(Task.id)).all()
+
+
+def test_project_counters_follow_task_changes(db, user):
+    """The counter trigger tracks inserts, status changes, moves and deletes."""
+    first = _create_project_with_tasks(db, user, "First", tasks=3)
+    second = _create_project_with_tasks(db, user, "Second", tasks=0)
+    assert _counters(db, first.id) == (3, 0, 3)
+
+    task_repo = TaskRepository(db)
+    task_ids = _task_ids(db, first.id)
+    task_repo.update_by_id(task_ids[0], TaskUpdate(status=TaskStatus.COMPLETED))
+    task_repo.update_by_id(task_ids[1], TaskUpdate(status=TaskStatus.CANCELLED))
+    task_repo.update_by_id(task_ids[2], TaskUpdate(project_id=second.id))
+    assert _counters(db, first.id) == (2, 1, 0)
+    assert _counters(db, second.id) == (1, 0, 1)
+
+    task_repo.delete(task_ids[0])
+    assert _counters(db, first.id) == (1, 0, 0)
+
+    project = ProjectRepository(db).get(first.id)
+    db.refresh(project)
+    assert (project.task_count, project.progress_percentage) == (1, 0.0)
+
+
+def test_ensure_project_counters_upgrades_existing_database(db, user):
+    """Databases without the counters get the columns, trigger and a backfill."""
+    project = _create_project_with_tasks(db, user, tasks=2)
+    task_repo = TaskRepository(db)
+    task_repo.update_by_id(_task_ids(db, project.id)[0], TaskUpdate(status=TaskStatus.COMPLETED))
+
+    for event_name in ("insert", "delete", "update"):
+        db.execute(text(f"DROP TRIGGER tasks_project_counters_{event_name}"))
+    for column in ("tasks_total", "tasks_completed", "tasks_active"):
+        db.execute(text(f"ALTER TABLE projects DROP COLUMN {column}"))
+    db.commit()
+
+    with engine.begin() as connection:
+        ensure_project_counters(connection)
+        ensure_project_counters(connection)
+    assert _counters(db, project.id) == (2, 1, 1)
+
+    _create_project_with_tasks(db, user, "Other", tasks=0)
+    task_repo.update_by_id(_task_ids(db, project.id)[1], TaskUpdate(status=TaskStatus.COMPLETED))
+    assert _counters(db, project.id) == (2, 2, 0)
+
+
+def _create_workflow_data(db: Session, owner: User) -> dict:
+    """Persist a project with tasks, a workflow, an instance and a rule; return their IDs."""
+    project = _create_project_with_tasks(db, owner)
+    workflow = Workflow(name="Delivery", type=WorkflowType.DEVELOPMENT, stages={"build": {}})
+    rule = BusinessRule(name="Escalate", rule_type="automation", conditions={"priority": "high"}, actions={})
+    db.add_all([workflow, rule])
+    db.flush()
+    instance = WorkflowInstance(workflow_id=workflow.id, project_id=project.id, current_stage="build")
+    db.add(instance)
+    db.commit()
+    ids = {
+        "project_id": project.id,
+        "task_id": _task_ids(db, project.id)[0],
+        "workflow_id": workflow.id,
+        "instance_id": instance.id,
+        "rule_id": rule.id
+    }
+    db.expunge_all()
+    return ids
+
+
+@pytest.mark.parametrize("path", [
+    "/projects/",
+    "/projects/{project_id}",
+    "/tasks/",
+    "/tasks/my-tasks",
+    "/tasks/{task_id}",
+    "/workflows/",
+    "/workflows/{workflow_id}",
+    "/workflows/statistics/overview",
+    "/workflows/instances/",
+    "/workflows/instances/{instance_id}",
+    "/workflows/rules/",
+    "/workflows/rules/{rule_id}",
+])
+def test_read_endpoints_issue_at_most_two_queries(db, user, client, query_counter, path):
+    """Read endpoints load what their response needs in at most two queries."""
+    url = path.format(**_create_workflow_data(db, user))
+    query_counter.clear()
+
+    response = client.get(url)
+
+    assert response.status_code == 200, response.text
+    assert len(query_counter) <= 2, query_counter
+
+
+def _create_rules(db: Session) -> None:
+    """Persist business rules covering each way a rule is indexed."""
+    db.add_all([
+        BusinessRule(name="done", rule_type="automation", conditions={"status": "done"}, actions={"notify": True}),
+        BusinessRule(
+            name="done and high",
+            rule_type="automation",
+            conditions={"status": "done", "priority": "high"},
+            actions={}
+        ),
+        BusinessRule(name="always", rule_type="validation", conditions={}, actions={}),
+        BusinessRule(name="tagged", rule_type="validation", conditions={"tags": ["urgent"]}, actions={}),
+        BusinessRule(name="inactive", rule_type="automation", conditions={"status": "done"}, actions={}, is_active=False),
+    ])
+    db.commit()
+
+
+@pytest.mark.parametrize("context, expected", [
+    ({}, ["always"]),
+    ({"status": "done"}, ["always", "done"]),
+    ({"status": "done", "priority": "high"}, ["always", "done", "done and high"]),
+    ({"status": "open", "priority": "high"}, ["always"]),
+    ({"tags": ["urgent"]}, ["always", "tagged"]),
+    ({"tags": ["other"], "status": ["done"]}, ["always"]),
+])
+def test_evaluate_rules_matches_active_rules(db, context, expected):
+    """Only active rules whose every condition holds in the context are triggered."""
+    _create_rules(db)
+
+    triggered = BusinessRuleRepository(db).evaluate_rules(context)
+
+    assert sorted(rule["rule_name"] for rule in triggered) == expected
+    done = next((rule for rule in triggered if rule["rule_name"] == "done"), None)
+    if done is not None:
+        assert done["rule_type"] == "automation"
+        assert done["actions"] == {"notify": True}
+
+
+def test_evaluate_rules_reuses_compiled_rules_until_a_rule_changes(db, query_counter):
+    """Compiled rules are served from the cache and rebuilt after a rule write."""
+    _create_rules(db)
+    rule_repo = BusinessRuleRepository(db)
+    rule_repo.evaluate_rules({"status": "done"})
+
+    query_counter.clear()
+    assert len(rule_repo.evaluate_rules({"status": "done"})) == 2
+    assert query_counter == []
+
+    rule_repo.create_business_rule(
+        BusinessRuleCreate(name="late", rule_type="notification", conditions={"status": "done"}, actions={})
+    )
+    assert sorted(rule["rule_name"] for rule in rule_repo.evaluate_rules({"status": "done"})) == [
+        "always", "done", "late"
+    ]
+
+
+def test_recent_activity_merges_tasks_and_projects_newest_first(db, user, query_counter):
+    """Recent tasks and projects come back merged, newest first and limited, in one query."""
+    project = _create_project_with_tasks(db, user, "Mine", tasks=2)
+    first_task, second_task = _task_ids(db, project.id)
+    other = User(email="bob@example.com", username="bob", full_name="Bob", password_hash="not-a-real-hash")
+    db.add(other)
+    db.commit()
+    _create_project_with_tasks(db, other, "Theirs", tasks=1)
+
+    base = datetime(2024, 3, 1, tzinfo=timezone.utc)
+    db.execute(update(Task).where(Task.id == second_task).values(updated_at=base + timedelta(hours=3)))
+    db.execute(update(Project).where(Project.id == project.id).values(updated_at=base + timedelta(hours=2)))
+    db.execute(update(Task).where(Task.id == first_task).values(updated_at=base + timedelta(hours=1)))
+    db.execute(update(Task).where(Task.project_id != project.id).values(updated_at=base + timedelta(hours=4)))
+    db.commit()
+    query_counter.clear()
+
+    activity = ProjectRepository(db).get_recent_activity(user.id, limit=2)
+
+    assert len(query_counter) == 1
+    assert [(entry["type"], entry["id"], entry["status"]) for entry in activity] == [
+        ("task", second_task, TaskStatus.TODO.value),
+        ("project", project.id, ProjectStatus.PLANNING.value),
+    ]
+
+
+def test_user_productivity_report_counts_tasks_per_owner(db, user, query_counter):
+    """The productivity report counts each active user's project tasks in one query."""
+    project = _create_project_with_tasks(db, user, tasks=4)
+    task_repo = TaskRepository(db)
+    task_repo.update_by_id(_task_ids(db, project.id)[0], TaskUpdate(status=TaskStatus.COMPLETED))
+    bob = User(email="bob@example.com", username="bob", full_name="Bob", password_hash="not-a-real-hash")
+    db.add_all([
+        bob,
+        User(
+            email="carol@example.com",
+            username="carol",
+            full_name="Carol",
+            password_hash="not-a-real-hash",
+            is_active=False
+        ),
+    ])
+    db.commit()
+    query_counter.clear()
+
+    report = analytics_service.generate_report(db, "user_productivity")
+
+    assert len(query_counter) == 1
+    assert report["total_users"] == 2
+    assert {row["user_name"]: row for row in report["user_performance"]} == {
+        "Alice": {
+            "user_id": user.id,
+            "user_name": "Alice",
+            "total_tasks": 4,
+            "completed_tasks": 1,
+            "completion_rate": 25.0
+        },
+        "Bob": {
+            "user_id": bob.id,
+            "user_name": "Bob",
+            "total_tasks": 0,
+            "completed_tasks": 0,
+            "completion_rate": 0
+        },
+    }
+
+
+def test_workflow_analytics_report_counts_instances_per_stage(db, user, query_counter):
+    """The workflow report counts total and completed instances per stage in one query."""
+    project = _create_project_with_tasks(db, user, tasks=0)
+    workflow = Workflow(name="Delivery", type=WorkflowType.DEVELOPMENT, stages={"build": {}, "ship": {}})
+    db.add(workflow)
+    db.flush()
+    db.add_all(
+        WorkflowInstance(workflow_id=workflow.id, project_id=project.id, current_stage=stage, is_completed=completed)
+        for stage, completed in (("build", False), ("build", False), ("ship", True), ("ship", False))
+    )
+    db.commit()
+    query_counter.clear()
+
+    report = analytics_service.generate_report(db, "workflow_analytics")
+
+    assert len(query_counter) == 1
+    assert report["total_instances"] == 4
+    assert report["completed_instances"] == 1
+    assert report["instances_by_stage"] == {"build": 2, "ship": 2}
+
+
+def test_transition_appends_history_and_merges_stage_data(db, user, client):
+    """A stage transition records its history entry and merges the transition data."""
+    ids = _create_workflow_data(db, user)
+    db.execute(
+        update(WorkflowInstance)
+        .where(WorkflowInstance.id == ids["instance_id"])
+        .values(stage_data={"owner": "alice", "step": 1})
+    )
+    db.commit()
+
+    response = client.post(
+        f"/workflows/instances/{ids['instance_id']}/transition",
+        json={"from_stage": "build", "to_stage": "ship", "transition_data": {"step": 2}}
+    )
+    assert response.status_code == 200, response.text
+
+    instance = WorkflowInstanceRepository(db).transition_stage(ids["instance_id"], "done", triggered_by=user.id)
+    assert instance.current_stage == "done"
+    assert instance.stage_data == {"owner": "alice", "step": 2}
+    assert [(entry["from_stage"], entry["to_stage"], entry["data"]) for entry in instance.history] == [
+        ("build", "ship", {"step": 2}),
+        ("ship", "done", {}),
+    ]
+    assert instance.history[0]["triggered_by"] == user.id
+
+
+def test_dashboard_overview_shares_computation_until_invalidated(monkeypatch):
+    """Concurrent callers share one computation; invalidation starts a fresh one."""
+    builds = []
+
+    async def build(self, user_id):
+        builds.append(user_id)
+        number = len(builds)
+        await asyncio.sleep(0)
+        return {"build": number}
+
+    monkeypatch.setattr(AnalyticsService, "_build_dashboard_overview", build)
+
+    async def scenario():
+        first, second = await asyncio.gather(
+            analytics_service.get_dashboard_overview(1),
+            analytics_service.get_dashboard_overview(1)
+        )
+        assert first is second
+
+        before_write = asyncio.ensure_future(analytics_service.get_dashboard_overview(1))
+        await asyncio.sleep(0)
+        invalidate_cache(ANALYTICS_NAMESPACE)
+        after_write = await analytics_service.get_dashboard_overview(1)
+        return first, await before_write, after_write
+
+    assert asyncio.run(scenario()) == ({"build": 1}, {"build": 2}, {"build": 3})
+    # Finished overviews are not kept in process
+    assert asyncio.run(analytics_service.get_dashboard_overview(1)) == {"build": 4}
+
+
+def test_reset_password_then_login(db, user, client):
+    """After a password reset the user logs in with the new password only."""
+    UserRepository(db).update_user_password(user, "0ld-passw0rd!")
+    credentials = {"email": user.email, "password": "N3w-passw0rd!"}
+    assert client.post("/auth/login", json=credentials).status_code == 401
+
+    response = client.post("/auth/reset-password", params={"email": user.email, "new_password": "N3w-passw0rd!"})
+    assert response.status_code == 200, response.text
+
+    response = client.post("/auth/login", json=credentials)
+    assert response.status_code == 200, response.text
+    assert response.json()["user"]["id"] == user.id
+    assert client.post("/auth/login", json={**credentials, "password": "0ld-passw0rd!"}).status_code == 401
+
+
+@pytest.mark.parametrize("origins, allowed, regex_matches, regex_rejects", [
+    (["https://app.example.com"], ["https://app.example.com"], [], []),
+    (
+        ["https://app.example.com", "https://*.example.com"],
+        ["https://app.example.com"],
+        ["https://preview-1.example.com"],
+        ["https://example.org", "https://evil.com/.example.com"]
+    ),
+    (["*"], ["*"], [], []),
+])
+def test_cors_origins_split_into_exact_and_wildcard(origins, allowed, regex_matches, regex_rejects):
+    """Literal origins and a bare "*" are allowed as-is; wildcard subdomains become a regex."""
+    settings = Settings(backend_cors_origins=origins)
+
+    assert settings.cors_allow_origins == allowed
+    regex = settings.cors_origin_regex
+    if not regex_matches:
+        assert regex is None
+    for origin in regex_matches:
+        assert re.fullmatch(regex, origin)
+    for origin in regex_rejects:
+        assert not re.fullmatch(regex, origin)
+
+
+def test_signup_rejects_invalid_fields_with_messages(db, client):
+    """Signup field errors come back as 422 with the validator messages."""
+    response = client.post("/auth/signup", json={
+        "email": "dana@example.com",
+        "username": "dana_1",
+        "full_name": "Dana",
+        "password": "N3w-passw0rd!"
+    })
+
+    assert response.status_code == 422
+    assert [error["msg"] for error in response.json()["detail"]] == [
+        "Value error, Username must contain only alphanumeric characters"
+    ]
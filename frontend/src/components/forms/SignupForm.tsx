@@ -3,6 +3,7 @@ import { useForm } from 'react-hook-form'
 import { Link, useNavigate } from 'react-router-dom'
 import { Eye, EyeOff, Mail, Lock, User } from 'lucide-react'
 import { authService } from '@/services/auth'
+import { handleApiError } from '@/utils/errorHandler'
 import { UserSignup } from '@/types'
 
 const SignupForm: React.FC = () => {
@@ -32,7 +33,7 @@ const SignupForm: React.FC = () => {
       if (error.response?.data?.detail) {
         setError('root', {
           type: 'manual',
-          message: error.response.data.detail
+          message: handleApiError(error, 'Signup failed. Please try again.')
         })
       }
     } finally {
@@ -1,9 +1,15 @@
 import toast from 'react-hot-toast'
 
+export interface ValidationErrorItem {
+  loc?: (string | number)[]
+  msg: string
+  type?: string
+}
+
 export interface ApiError {
   response?: {
     data?: {
-      detail?: string
+      detail?: string | ValidationErrorItem[]
       message?: string
     }
     status?: number
@@ -12,11 +18,20 @@ export interface ApiError {
   code?: string
 }
 
+// 422 responses carry a list of validation errors; show the first one
+const detailMessage = (detail: string | ValidationErrorItem[]): string | undefined => {
+  if (typeof detail === 'string') {
+    return detail
+  }
+  return detail[0]?.msg?.replace(/^Value error, /, '')
+}
+
 export const handleApiError = (error: ApiError, defaultMessage: string = 'An unexpected error occurred'): string => {
   let message = defaultMessage
+  const detail = error.response?.data?.detail ? detailMessage(error.response.data.detail) : undefined
 
-  if (error.response?.data?.detail) {
-    message = error.response.data.detail
+  if (detail) {
+    message = detail
   } else if (error.response?.data?.message) {
     message = error.response.data.message
   } else if (error.response?.status === 404) {